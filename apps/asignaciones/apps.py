@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class AsignacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.asignaciones'
-    verbose_name = 'Asignaciones'
\ No newline at end of file
+    verbose_name = 'Asignaciones'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,469 @@
+"""
+Detección de choques de horario por conjuntos
+Una proyección values() de los horarios activos se barre por (recurso, día)
+con el detector de solapamientos: se reportan también los solapamientos
+parciales y la cantidad de consultas no depende del tamaño de la planificación
+
+Mantenimiento incremental: cada escritura de HorarioClase reevalúa solo las
+claves (planificación, recurso, id, día) que toca y concilia los
+ConflictoHorario pendientes de esas claves por su ``clave`` estable
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import threading
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+from apps.planificacion.models import FranjaHoraria
+from apps.planificacion.response_cache import bump_planificacion_version
+from .models import AsignacionDocente, HorarioClase, ConflictoHorario
+from .overlaps import Interval, find_overlaps, format_minutes, horario_intervals
+
+logger = logging.getLogger(__name__)
+
+DIAS = dict(FranjaHoraria.DIAS_SEMANA)
+TIPOS_SOLAPAMIENTO = ('conflicto_docente', 'conflicto_aula')
+TIPOS_DETECTADOS = TIPOS_SOLAPAMIENTO + ('estudiante_conflicto', 'capacidad_excedida', 'docente_sobrecarga')
+MAX_HORAS_SEMANALES = 40
+
+# Tipo de conflicto y prefijo de la descripción por tipo de recurso solapado
+RECURSOS = {
+    'docente': ('conflicto_docente', 'Docente'),
+    'aula': ('conflicto_aula', 'Aula'),
+    'cohorte': ('estudiante_conflicto', 'Semestre'),
+}
+
+# (planificacion_id, 'docente' | 'aula', recurso_id, dia_semana)
+ConflictKey = Tuple[int, str, int, str]
+
+
+def _overlap_conflict(a: Interval, b: Interval) -> Dict[str, Any]:
+    tipo_recurso, recurso_id = a.resource
+    tipo, prefijo = RECURSOS[tipo_recurso]
+    ids = sorted({a.ref, b.ref})
+    return {
+        'tipo': tipo,
+        'descripcion': (
+            f'{prefijo} {a.label} tiene clases solapadas el {DIAS.get(a.day, a.day)}: '
+            f'{format_minutes(a.start)}-{format_minutes(a.end)} y '
+            f'{format_minutes(b.start)}-{format_minutes(b.end)}'
+        ),
+        'horarios_involucrados': ids,
+        'clave': f'{tipo_recurso}:{recurso_id}:{a.day}:{ids[0]}-{ids[-1]}',
+    }
+
+
+def _clashes(horarios) -> List[Dict[str, Any]]:
+    return [_overlap_conflict(a, b) for a, b in find_overlaps(horario_intervals(horarios))]
+
+
+def _scope(clave: str) -> Tuple[str, int, str]:
+    """(recurso, id, día) de una clave de conflicto de docente o aula"""
+    recurso, recurso_id, dia, _ = clave.split(':')
+    return recurso, int(recurso_id), dia
+
+
+def detect_horario_clashes(planificacion) -> List[Dict[str, Any]]:
+    """
+    Choques de docente y de aula entre los horarios activos de una planificación.
+
+    Cada par de horarios que comparte recurso y se solapa en el tiempo
+    (aunque sea parcialmente) produce un conflicto.
+    """
+    horarios = HorarioClase.objects.filter(
+        asignacion_docente__planificacion=planificacion,
+        is_activa=True
+    ).order_by('id')
+    return _clashes(horarios)
+
+
+def detect_planificacion_conflicts(planificacion_id: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Todas las categorías de conflicto de una planificación, indexadas por clave.
+
+    - docente y aula: horarios solapados del mismo recurso
+    - cohorte: materias distintas de la misma carrera y semestre solapadas
+    - capacidad: más estudiantes que la capacidad del aula
+    - sobrecarga: docentes con más de MAX_HORAS_SEMANALES horas asignadas
+
+    Dos consultas en total: una proyección de los horarios activos y un
+    agregado de la carga horaria por docente.
+    """
+    rows = HorarioClase.objects.filter(
+        asignacion_docente__planificacion_id=planificacion_id,
+        is_activa=True
+    ).order_by('id').values_list(
+        'id',
+        'aula_id',
+        'aula__codigo',
+        'aula__capacidad',
+        'capacidad_estudiantes',
+        'franja_horaria__dia_semana',
+        'franja_horaria__hora_inicio',
+        'franja_horaria__hora_fin',
+        'docente_id',
+        'docente__first_name',
+        'docente__last_name',
+        'asignacion_docente__materia_id',
+        'asignacion_docente__materia__semestre',
+        'asignacion_docente__materia__carrera_id',
+        'asignacion_docente__materia__carrera__codigo',
+    )
+
+    actuales: Dict[str, Dict[str, Any]] = {}
+    intervals: List[Interval] = []
+    materia_de: Dict[int, int] = {}
+    horarios_docente: Dict[int, List[int]] = {}
+
+    for (horario_id, aula_id, aula_codigo, aula_capacidad, capacidad, dia, inicio, fin,
+         docente_id, nombre, apellido, materia_id, semestre, carrera_id, carrera_codigo) in rows:
+        start = inicio.hour * 60 + inicio.minute
+        end = fin.hour * 60 + fin.minute
+        materia_de[horario_id] = materia_id
+        horarios_docente.setdefault(docente_id, []).append(horario_id)
+
+        intervals.append(Interval(('docente', docente_id), dia, start, end, 'horario_clase', horario_id,
+                                  f"{nombre} {apellido}".strip()))
+        intervals.append(Interval(('cohorte', f'{carrera_id}-{semestre}'), dia, start, end, 'horario_clase',
+                                  horario_id, f'{semestre} de {carrera_codigo}'))
+
+        # Las clases virtuales no ocupan aula
+        if aula_id is None:
+            continue
+        intervals.append(Interval(('aula', aula_id), dia, start, end, 'horario_clase', horario_id, aula_codigo))
+
+        if capacidad and capacidad > aula_capacidad:
+            clave = f'capacidad:{horario_id}'
+            actuales[clave] = {
+                'tipo': 'capacidad_excedida',
+                'descripcion': (
+                    f'Capacidad de estudiantes ({capacidad}) excede capacidad del aula '
+                    f'{aula_codigo} ({aula_capacidad})'
+                ),
+                'horarios_involucrados': [horario_id],
+                'clave': clave,
+            }
+
+    for a, b in find_overlaps(intervals):
+        # Secciones paralelas de la misma materia no chocan para los estudiantes
+        if a.resource[0] == 'cohorte' and materia_de[a.ref] == materia_de[b.ref]:
+            continue
+        conflicto = _overlap_conflict(a, b)
+        actuales[conflicto['clave']] = conflicto
+
+    sobrecargas = AsignacionDocente.objects.filter(
+        planificacion_id=planificacion_id,
+        is_activa=True
+    ).values('docente_id', 'docente__first_name', 'docente__last_name').annotate(
+        total_horas=Sum('carga_horaria_semanal')
+    ).filter(total_horas__gt=MAX_HORAS_SEMANALES)
+
+    for sobrecarga in sobrecargas:
+        clave = f"sobrecarga:{sobrecarga['docente_id']}"
+        nombre = f"{sobrecarga['docente__first_name']} {sobrecarga['docente__last_name']}".strip()
+        actuales[clave] = {
+            'tipo': 'docente_sobrecarga',
+            'descripcion': (
+                f"Docente {nombre} con {sobrecarga['total_horas']} horas semanales "
+                f"(máximo recomendado: {MAX_HORAS_SEMANALES})"
+            ),
+            'horarios_involucrados': horarios_docente.get(sobrecarga['docente_id'], []),
+            'clave': clave,
+        }
+
+    return actuales
+
+
+def _conflict_row(planificacion_id: int, conflicto: Dict[str, Any], **kwargs) -> ConflictoHorario:
+    involucrados = conflicto['horarios_involucrados']
+    return ConflictoHorario(
+        planificacion_id=planificacion_id,
+        tipo=conflicto['tipo'],
+        descripcion=conflicto['descripcion'],
+        clave=conflicto.get('clave', ''),
+        horarios_involucrados=involucrados,
+        horario_clase_id=involucrados[-1] if involucrados else None,
+        **kwargs
+    )
+
+
+def persist_conflicts(planificacion, conflictos: List[Dict[str, Any]]) -> List[ConflictoHorario]:
+    """
+    Guarda los conflictos que aún no están registrados como pendientes.
+
+    Los pendientes existentes se leen en una consulta y los nuevos se
+    insertan con un solo bulk_create.
+    """
+    if not conflictos:
+        return []
+
+    existentes = ConflictoHorario.objects.filter(
+        planificacion=planificacion,
+        resuelto=False,
+        tipo__in={c['tipo'] for c in conflictos}
+    ).values_list('tipo', 'descripcion', 'clave')
+
+    registrados = set()
+    for tipo, descripcion, clave in existentes:
+        registrados.add((tipo, descripcion))
+        if clave:
+            registrados.add(clave)
+
+    nuevos = []
+    for conflicto in conflictos:
+        clave = (conflicto['tipo'], conflicto['descripcion'])
+        if clave in registrados or conflicto.get('clave') in registrados:
+            continue
+        registrados.add(clave)
+        nuevos.append(_conflict_row(planificacion.id, conflicto))
+
+    return ConflictoHorario.objects.bulk_create(nuevos)
+
+
+def _reconcile(planificacion_id: int, actuales: Dict[str, Dict[str, Any]], in_scope: Callable[[str], bool],
+               tipos: Tuple[str, ...] = TIPOS_SOLAPAMIENTO) -> Tuple[Dict[str, int], List[ConflictoHorario]]:
+    """
+    Concilia los conflictos pendientes de ``tipos`` con los detectados.
+
+    Los pendientes dentro del alcance que ya no se detectan se marcan como
+    resueltos, los que cambiaron se actualizan y los nuevos se insertan: a lo
+    sumo tres escrituras en bloque. Retorna el resumen y los conflictos
+    vigentes (los ya registrados como instancias parciales con su id).
+    """
+    existentes = ConflictoHorario.objects.filter(
+        planificacion_id=planificacion_id,
+        resuelto=False,
+        tipo__in=tipos
+    ).exclude(clave='').order_by('id').values_list('id', 'clave', 'descripcion', 'horarios_involucrados')
+
+    resueltos: List[int] = []
+    modificados: List[ConflictoHorario] = []
+    vigentes: Dict[str, ConflictoHorario] = {}
+    for conflicto_id, clave, descripcion, involucrados in existentes:
+        if clave in vigentes:
+            # Registro duplicado de una detección anterior
+            resueltos.append(conflicto_id)
+        elif clave in actuales:
+            vigente = vigentes[clave] = _conflict_row(planificacion_id, actuales[clave], id=conflicto_id)
+            if descripcion != vigente.descripcion or involucrados != vigente.horarios_involucrados:
+                modificados.append(vigente)
+        elif in_scope(clave):
+            resueltos.append(conflicto_id)
+
+    if resueltos:
+        ConflictoHorario.objects.filter(id__in=resueltos).update(resuelto=True, fecha_resolucion=timezone.now())
+    if modificados:
+        ConflictoHorario.objects.bulk_update(
+            modificados, ['descripcion', 'horarios_involucrados', 'horario_clase'], batch_size=1000
+        )
+
+    nuevos = ConflictoHorario.objects.bulk_create([
+        _conflict_row(planificacion_id, conflicto)
+        for clave, conflicto in actuales.items() if clave not in vigentes
+    ], batch_size=1000)
+
+    if resueltos or modificados or nuevos:
+        # Escrituras en bloque: no emiten las señales que versionan la planificación
+        bump_planificacion_version([planificacion_id])
+
+    resumen = {'creados': len(nuevos), 'actualizados': len(modificados), 'resueltos': len(resueltos)}
+    return resumen, list(vigentes.values()) + nuevos
+
+
+def refresh_conflicts(keys: Iterable[ConflictKey]) -> Dict[str, int]:
+    """
+    Reevalúa solo los recursos y días indicados.
+
+    Por planificación se lee una proyección con los horarios activos de esos
+    docentes y aulas en esos días y se concilian sus conflictos pendientes.
+    """
+    por_planificacion: Dict[int, Set[Tuple[str, int, str]]] = {}
+    for planificacion_id, recurso, recurso_id, dia in keys:
+        por_planificacion.setdefault(planificacion_id, set()).add((recurso, recurso_id, dia))
+
+    totales = {'creados': 0, 'actualizados': 0, 'resueltos': 0}
+    for planificacion_id, alcance in por_planificacion.items():
+        docentes = {recurso_id for recurso, recurso_id, _ in alcance if recurso == 'docente'}
+        aulas = {recurso_id for recurso, recurso_id, _ in alcance if recurso == 'aula'}
+        horarios = HorarioClase.objects.filter(
+            asignacion_docente__planificacion_id=planificacion_id,
+            franja_horaria__dia_semana__in={dia for _, _, dia in alcance},
+            is_activa=True
+        ).filter(
+            Q(docente_id__in=docentes) | Q(aula_id__in=aulas)
+        ).order_by('id')
+
+        actuales = {c['clave']: c for c in _clashes(horarios) if _scope(c['clave']) in alcance}
+        with transaction.atomic():
+            resumen, _ = _reconcile(planificacion_id, actuales, lambda clave: _scope(clave) in alcance)
+        for campo, cantidad in resumen.items():
+            totales[campo] += cantidad
+
+    return totales
+
+
+def sync_planificacion_conflicts(planificacion_id: int) -> List[ConflictoHorario]:
+    """
+    Detección completa y conciliación de una planificación.
+
+    Número fijo de consultas sin importar la cantidad de horarios: la
+    detección, la lectura de pendientes y a lo sumo cuatro escrituras en
+    bloque. Retorna los conflictos vigentes.
+    """
+    actuales = detect_planificacion_conflicts(planificacion_id)
+    with transaction.atomic():
+        # Registros del detector anterior, sin clave: se reemplazan como antes
+        ConflictoHorario.objects.filter(
+            planificacion_id=planificacion_id,
+            resuelto=False,
+            clave='',
+            tipo__in=('aula_ocupada', 'docente_sobrecarga')
+        ).delete()
+        _, vigentes = _reconcile(planificacion_id, actuales, lambda clave: True, TIPOS_DETECTADOS)
+    return vigentes
+
+
+# Seguimiento de escrituras
+
+class _ConflictTracking(threading.local):
+    def __init__(self):
+        self.suspended = 0
+        self.pending: Set[ConflictKey] = set()
+        # Memo asignación -> (planificación, docente) y franja -> día hasta el próximo commit
+        self.asignaciones: Dict[int, Tuple[int, int]] = {}
+        self.dias: Dict[int, str] = {}
+
+
+_tracking = _ConflictTracking()
+
+
+def conflict_tracking_active() -> bool:
+    return not _tracking.suspended
+
+
+@contextmanager
+def suspend_conflict_tracking():
+    """
+    Desactiva el mantenimiento por señales dentro del bloque.
+
+    Para escrituras masivas: el llamador concilia al final con
+    ``sync_planificacion_conflicts`` o ``schedule_conflict_refresh`` e
+    incrementa la versión con ``bump_planificacion_version``.
+    """
+    _tracking.suspended += 1
+    try:
+        yield
+    finally:
+        _tracking.suspended -= 1
+
+
+def _horario_keys(planificacion_id: int, docente_id: int, aula_id: Optional[int], dia: str) -> Set[ConflictKey]:
+    keys = {(planificacion_id, 'docente', docente_id, dia)}
+    # Las clases virtuales no ocupan aula
+    if aula_id is not None:
+        keys.add((planificacion_id, 'aula', aula_id, dia))
+    return keys
+
+
+def horario_conflict_keys(horarios) -> Set[ConflictKey]:
+    """Claves afectadas por un queryset de HorarioClase (una consulta)"""
+    keys: Set[ConflictKey] = set()
+    rows = horarios.values_list(
+        'asignacion_docente__planificacion_id',
+        'docente_id',
+        'aula_id',
+        'franja_horaria__dia_semana',
+    )
+    for planificacion_id, docente_id, aula_id, dia in rows:
+        keys |= _horario_keys(planificacion_id, docente_id, aula_id, dia)
+    return keys
+
+
+def horario_instance_keys(horario: HorarioClase) -> Set[ConflictKey]:
+    """Claves afectadas por una instancia, con memo de asignaciones y franjas"""
+    asignacion = _tracking.asignaciones.get(horario.asignacion_docente_id)
+    if asignacion is None:
+        asignacion_docente = horario.asignacion_docente
+        asignacion = (asignacion_docente.planificacion_id, asignacion_docente.docente_id)
+        _tracking.asignaciones[horario.asignacion_docente_id] = asignacion
+
+    dia = _tracking.dias.get(horario.franja_horaria_id)
+    if dia is None:
+        dia = _tracking.dias[horario.franja_horaria_id] = horario.franja_horaria.dia_semana
+
+    return _horario_keys(asignacion[0], asignacion[1], horario.aula_id, dia)
+
+
+def _flush_pending():
+    keys, _tracking.pending = _tracking.pending, set()
+    _tracking.asignaciones.clear()
+    _tracking.dias.clear()
+    if not keys:
+        return
+    try:
+        refresh_conflicts(keys)
+    except Exception as e:
+        # El horario ya está confirmado; una detección completa posterior lo corrige
+        logger.error(f"Error actualizando conflictos de horario: {e}")
+
+
+def schedule_conflict_refresh(keys: Iterable[ConflictKey]) -> None:
+    """
+    Reevalúa las claves cuando se confirme la transacción en curso.
+
+    Las claves de toda la transacción se acumulan y se procesan juntas; si
+    la transacción se revierte quedan para el siguiente commit, lo que es
+    inocuo porque la conciliación es idempotente.
+    """
+    if _tracking.suspended:
+        return
+    keys = set(keys)
+    if not keys:
+        return
+    _tracking.pending |= keys
+    transaction.on_commit(_flush_pending)
+
+
+# Rutas masivas: bulk_create, update y delete de QuerySet no emiten señales por objeto
+
+def bulk_create_horarios(horarios: List[HorarioClase], **kwargs) -> List[HorarioClase]:
+    """bulk_create de HorarioClase reevaluando las claves afectadas"""
+    for horario in horarios:
+        # bulk_create no pasa por save(): se copia aquí el docente de la asignación
+        horario.docente_id = horario.asignacion_docente.docente_id
+    with transaction.atomic():
+        creados = HorarioClase.objects.bulk_create(horarios, **kwargs)
+        keys: Set[ConflictKey] = set()
+        for horario in creados:
+            keys |= horario_instance_keys(horario)
+        bump_planificacion_version(key[0] for key in keys)
+        schedule_conflict_refresh(keys)
+    return creados
+
+
+def update_horarios(horarios, **values) -> int:
+    """QuerySet.update de HorarioClase reevaluando las claves previas y las nuevas"""
+    with transaction.atomic():
+        ids = list(horarios.values_list('pk', flat=True))
+        if not ids:
+            return 0
+        afectados = HorarioClase.objects.filter(pk__in=ids)
+        keys = horario_conflict_keys(afectados)
+        actualizados = afectados.update(**values)
+        keys |= horario_conflict_keys(afectados)
+        bump_planificacion_version(key[0] for key in keys)
+        schedule_conflict_refresh(keys)
+    return actualizados
+
+
+def delete_horarios(horarios) -> int:
+    """Elimina un queryset de HorarioClase calculando las claves con una sola consulta"""
+    with transaction.atomic():
+        keys = horario_conflict_keys(horarios)
+        with suspend_conflict_tracking():
+            _, por_modelo = horarios.delete()
+        bump_planificacion_version(key[0] for key in keys)
+        schedule_conflict_refresh(keys)
+    return por_modelo.get(HorarioClase._meta.label, 0)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("asignaciones", "0001_initial"),
+        ("aulas", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="horarioclase",
+            name="aula",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Vacío para clases en modalidad virtual",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="clases",
+                to="aulas.aula",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("asignaciones", "0002_alter_horarioclase_aula"),
+        ("planificacion", "0003_disponibilidaddocente"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conflictohorario",
+            name="clave",
+            field=models.CharField(
+                blank=True,
+                help_text="Identidad estable de los conflictos detectados automáticamente (recurso:id:día:horarios)",
+                max_length=100,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="conflictohorario",
+            name="tipo",
+            field=models.CharField(
+                choices=[
+                    ("docente_sobrecarga", "Docente con sobrecarga horaria"),
+                    ("aula_ocupada", "Aula ocupada en mismo horario"),
+                    ("estudiante_conflicto", "Conflicto de horario para estudiantes"),
+                    ("prereq_no_cumplido", "Prerequisito no cumplido"),
+                    ("capacidad_excedida", "Capacidad del aula excedida"),
+                    ("conflicto_docente", "Docente con clases solapadas"),
+                    ("conflicto_aula", "Aula con clases solapadas"),
+                ],
+                max_length=25,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="conflictohorario",
+            index=models.Index(
+                fields=["planificacion", "resuelto", "clave"],
+                name="asignacione_planifi_f48e6f_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:40
+
+import logging
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+logger = logging.getLogger(__name__)
+
+# Marca de los conflictos abiertos por esta migración; la reversión los ubica por ella
+DESCRIPCION_DESACTIVADO = "Desactivado al migrar: el docente ya tenía el horario {conservado} en la misma franja"
+
+
+def copiar_docente(apps, schema_editor):
+    HorarioClase = apps.get_model("asignaciones", "HorarioClase")
+    AsignacionDocente = apps.get_model("asignaciones", "AsignacionDocente")
+    ConflictoHorario = apps.get_model("asignaciones", "ConflictoHorario")
+
+    HorarioClase.objects.update(
+        docente_id=Subquery(
+            AsignacionDocente.objects.filter(
+                pk=OuterRef("asignacion_docente_id")
+            ).values("docente_id")[:1]
+        )
+    )
+
+    # Los duplicados activos impedirían crear la restricción: se conserva el más antiguo
+    # y cada horario desactivado queda registrado como conflicto pendiente de revisión
+    duplicados = (
+        HorarioClase.objects.filter(is_activa=True)
+        .values("docente_id", "franja_horaria_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    conflictos = []
+    for duplicado in duplicados:
+        horarios = list(
+            HorarioClase.objects.filter(
+                is_activa=True,
+                docente_id=duplicado["docente_id"],
+                franja_horaria_id=duplicado["franja_horaria_id"],
+            )
+            .order_by("id")
+            .values_list("id", "asignacion_docente__planificacion_id")
+        )
+        conservado = horarios[0][0]
+        desactivados = [horario_id for horario_id, _ in horarios[1:]]
+        HorarioClase.objects.filter(id__in=desactivados).update(is_activa=False)
+        logger.warning(
+            f"Docente {duplicado['docente_id']}, franja {duplicado['franja_horaria_id']}: "
+            f"se conserva el horario {conservado} y se desactivan {desactivados}"
+        )
+        conflictos.extend(
+            ConflictoHorario(
+                planificacion_id=planificacion_id,
+                tipo="conflicto_docente",
+                descripcion=DESCRIPCION_DESACTIVADO.format(conservado=conservado),
+                horario_clase_id=horario_id,
+            )
+            for horario_id, planificacion_id in horarios[1:]
+        )
+    ConflictoHorario.objects.bulk_create(conflictos)
+
+
+def restaurar_duplicados(apps, schema_editor):
+    """Reactiva los horarios desactivados por copiar_docente y borra sus conflictos"""
+    ConflictoHorario = apps.get_model("asignaciones", "ConflictoHorario")
+    HorarioClase = apps.get_model("asignaciones", "HorarioClase")
+
+    conflictos = ConflictoHorario.objects.filter(
+        tipo="conflicto_docente",
+        clave="",
+        descripcion__startswith=DESCRIPCION_DESACTIVADO.split("{")[0],
+    )
+    HorarioClase.objects.filter(
+        id__in=conflictos.exclude(horario_clase=None).values("horario_clase_id")
+    ).update(is_activa=True)
+    conflictos.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("asignaciones", "0003_conflictohorario_clave"),
+        ("planificacion", "0003_disponibilidaddocente"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="horarioclase",
+            name="docente",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Copia de asignacion_docente.docente para la unicidad docente/franja",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="horarios_clase",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(copiar_docente, restaurar_duplicados),
+        migrations.AlterField(
+            model_name="horarioclase",
+            name="docente",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Copia de asignacion_docente.docente para la unicidad docente/franja",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="horarios_clase",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="horarioclase",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_activa", True)),
+                fields=("docente", "franja_horaria"),
+                name="horarioclase_docente_franja_activa",
+                violation_error_message="El docente ya tiene una clase asignada en este horario",
+            ),
+        ),
+    ]
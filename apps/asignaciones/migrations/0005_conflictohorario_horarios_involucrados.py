@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("asignaciones", "0004_horarioclase_docente"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conflictohorario",
+            name="horarios_involucrados",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Ids de todos los horarios del conflicto",
+            ),
+        ),
+    ]
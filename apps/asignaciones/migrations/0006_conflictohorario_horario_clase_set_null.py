@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("asignaciones", "0005_conflictohorario_horarios_involucrados"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="conflictohorario",
+            name="horario_clase",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="asignaciones.horarioclase",
+            ),
+        ),
+    ]
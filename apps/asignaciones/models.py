@@ -31,8 +31,22 @@ class AsignacionDocente(models.Model):
 
 class HorarioClase(models.Model):
     asignacion_docente = models.ForeignKey(AsignacionDocente, on_delete=models.CASCADE, related_name='horarios')
+    docente = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name='horarios_clase',
+        help_text="Copia de asignacion_docente.docente para la unicidad docente/franja"
+    )
     franja_horaria = models.ForeignKey(FranjaHoraria, on_delete=models.CASCADE, related_name='clases')
-    aula = models.ForeignKey(Aula, on_delete=models.CASCADE, related_name='clases')
+    aula = models.ForeignKey(
+        Aula,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='clases',
+        help_text="Vacío para clases en modalidad virtual"
+    )
     capacidad_estudiantes = models.PositiveIntegerField(default=30)
     modalidad = models.CharField(
         max_length=20,
@@ -51,25 +65,46 @@ class HorarioClase(models.Model):
         verbose_name = 'Horario de Clase'
         verbose_name_plural = 'Horarios de Clases'
         unique_together = ['franja_horaria', 'aula']  # Un aula solo puede estar ocupada una vez por franja
+        constraints = [
+            # Un docente solo puede tener una clase activa por franja
+            models.UniqueConstraint(
+                fields=['docente', 'franja_horaria'],
+                condition=models.Q(is_activa=True),
+                name='horarioclase_docente_franja_activa',
+                violation_error_message='El docente ya tiene una clase asignada en este horario'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Copia desnormalizada; los cambios de docente de la asignación los propaga una señal
+        self.docente_id = self.asignacion_docente.docente_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'asignacion_docente' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'docente'}
+        super().save(*args, **kwargs)
+
+    def validate_constraints(self, exclude=None):
+        # docente no es editable pero se deriva de asignacion_docente, por lo que se valida igual
+        if exclude:
+            exclude = set(exclude) - {'docente'}
+        super().validate_constraints(exclude)
 
     def clean(self):
+        # Las clases presenciales e híbridas necesitan un aula física
+        if not self.aula and self.modalidad != 'virtual':
+            raise ValidationError('Las clases presenciales o híbridas requieren un aula')
+
         # Validar que la capacidad no exceda la del aula
         if self.capacidad_estudiantes and self.aula and self.capacidad_estudiantes > self.aula.capacidad:
             raise ValidationError(f'La capacidad de estudiantes ({self.capacidad_estudiantes}) excede la capacidad del aula ({self.aula.capacidad})')
 
-        # Validar que el docente no tenga conflictos de horario
-        if self.asignacion_docente and self.franja_horaria:
-            conflictos = HorarioClase.objects.filter(
-                asignacion_docente__docente=self.asignacion_docente.docente,
-                franja_horaria=self.franja_horaria,
-                is_activa=True
-            ).exclude(pk=self.pk)
-
-            if conflictos.exists():
-                raise ValidationError(f'El docente {self.asignacion_docente.docente.get_full_name()} ya tiene una clase asignada en este horario')
+        # Los conflictos del docente los valida la restricción horarioclase_docente_franja_activa
+        if self.asignacion_docente_id:
+            self.docente_id = self.asignacion_docente.docente_id
 
     def __str__(self):
-        return f"{self.asignacion_docente.materia.nombre} - {self.franja_horaria} - {self.aula.codigo}"
+        aula = self.aula.codigo if self.aula else 'Virtual'
+        return f"{self.asignacion_docente.materia.nombre} - {self.franja_horaria} - {aula}"
 
 
 class RegistroAsistencia(models.Model):
@@ -109,12 +144,21 @@ class ConflictoHorario(models.Model):
         ('estudiante_conflicto', 'Conflicto de horario para estudiantes'),
         ('prereq_no_cumplido', 'Prerequisito no cumplido'),
         ('capacidad_excedida', 'Capacidad del aula excedida'),
+        ('conflicto_docente', 'Docente con clases solapadas'),
+        ('conflicto_aula', 'Aula con clases solapadas'),
     ]
 
     planificacion = models.ForeignKey(PlanificacionAcademica, on_delete=models.CASCADE, related_name='conflictos')
     tipo = models.CharField(max_length=25, choices=TIPOS_CONFLICTO)
     descripcion = models.TextField()
-    horario_clase = models.ForeignKey(HorarioClase, on_delete=models.CASCADE, null=True, blank=True)
+    # Al borrar el horario el conflicto se conserva para que la conciliación lo resuelva
+    horario_clase = models.ForeignKey(HorarioClase, on_delete=models.SET_NULL, null=True, blank=True)
+    horarios_involucrados = models.JSONField(default=list, blank=True, help_text="Ids de todos los horarios del conflicto")
+    clave = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Identidad estable de los conflictos detectados automáticamente (recurso:id:día:horarios)"
+    )
     resuelto = models.BooleanField(default=False)
     fecha_deteccion = models.DateTimeField(auto_now_add=True)
     fecha_resolucion = models.DateTimeField(null=True, blank=True)
@@ -124,6 +168,9 @@ class ConflictoHorario(models.Model):
         verbose_name = 'Conflicto de Horario'
         verbose_name_plural = 'Conflictos de Horario'
         ordering = ['-fecha_deteccion']
+        indexes = [
+            models.Index(fields=['planificacion', 'resuelto', 'clave']),
+        ]
 
     def __str__(self):
         estado = "✓" if self.resuelto else "⚠️"
@@ -131,46 +178,14 @@ class ConflictoHorario(models.Model):
 
     @classmethod
     def detectar_conflictos_planificacion(cls, planificacion):
-        """Detecta y crea registros de conflictos para una planificación"""
-        conflictos_detectados = []
-
-        # Limpiar conflictos anteriores no resueltos
-        cls.objects.filter(planificacion=planificacion, resuelto=False).delete()
-
-        # 1. Detectar aulas ocupadas en mismo horario
-        from django.db.models import Count
-        duplicados_aula = HorarioClase.objects.filter(
-            asignacion_docente__planificacion=planificacion,
-            is_activa=True
-        ).values('franja_horaria', 'aula').annotate(
-            count=Count('id')
-        ).filter(count__gt=1)
-
-        for duplicado in duplicados_aula:
-            conflicto = cls.objects.create(
-                planificacion=planificacion,
-                tipo='aula_ocupada',
-                descripcion=f"Aula ocupada múltiples veces en la misma franja horaria"
-            )
-            conflictos_detectados.append(conflicto)
-
-        # 2. Detectar docentes con sobrecarga
-        docentes_sobrecarga = AsignacionDocente.objects.filter(
-            planificacion=planificacion,
-            is_activa=True
-        ).values('docente').annotate(
-            total_horas=models.Sum('carga_horaria_semanal')
-        ).filter(total_horas__gt=40)  # Más de 40 horas semanales
-
-        for sobrecarga in docentes_sobrecarga:
-            conflicto = cls.objects.create(
-                planificacion=planificacion,
-                tipo='docente_sobrecarga',
-                descripcion=f"Docente con {sobrecarga['total_horas']} horas semanales (máximo recomendado: 40)"
-            )
-            conflictos_detectados.append(conflicto)
-
-        return conflictos_detectados
+        """
+        Detecta los conflictos de una planificación y concilia los registros pendientes.
+
+        Retorna los conflictos vigentes (nuevos y ya registrados); ver
+        apps.asignaciones.conflicts.sync_planificacion_conflicts.
+        """
+        from .conflicts import sync_planificacion_conflicts
+        return sync_planificacion_conflicts(planificacion.id)
 
 
 # Métodos adicionales para HorarioClase
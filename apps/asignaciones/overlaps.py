@@ -0,0 +1,140 @@
+"""
+Detección de solapamientos de intervalos de tiempo (barrido por línea)
+Los intervalos se agrupan por (recurso, día), se ordenan por inicio y se
+barren con un montículo de los activos: todos los pares solapados se
+reportan en O(n log n + k), incluidos los solapamientos parciales
+
+Los adaptadores reciben querysets o iterables ya filtrados por el llamador,
+por lo que este módulo no importa modelos (sirve también para la app
+heredada ``core``, que no siempre está instalada)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Tuple
+import heapq
+
+# Códigos de día de HorarioClase/FranjaHoraria por date.weekday()
+DIAS_SEMANA = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo']
+# Códigos de día de core.Asignacion
+DIAS_LEGACY = ['Lun', 'Mar', 'Mie', 'Jue', 'Vie', 'Sab', 'Dom']
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    Ocupación de un recurso en [start, end) minutos del día.
+
+    ``resource`` incluye el tipo de recurso, p. ej. ('aula', 3) o
+    ('docente', 7); ``source`` y ``ref`` identifican la fila de origen.
+    """
+    resource: Hashable
+    day: Any
+    start: int
+    end: int
+    source: str
+    ref: Any
+    label: str = ''
+
+
+def _minutes(value) -> int:
+    return value.hour * 60 + value.minute
+
+
+def find_overlaps(intervals: Iterable[Interval]) -> List[Tuple[Interval, Interval]]:
+    """
+    Todos los pares de intervalos del mismo recurso y día que se solapan.
+
+    Los intervalos que solo se tocan (uno termina cuando el otro empieza) no
+    se consideran solapados.
+    """
+    groups: Dict[Tuple, List[Interval]] = {}
+    for interval in intervals:
+        groups.setdefault((interval.resource, interval.day), []).append(interval)
+
+    pairs: List[Tuple[Interval, Interval]] = []
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+
+        group.sort(key=lambda i: (i.start, i.end))
+        # Montículo de (fin, orden, intervalo) de los intervalos aún abiertos
+        active: List[Tuple[int, int, Interval]] = []
+        for order, interval in enumerate(group):
+            while active and active[0][0] <= interval.start:
+                heapq.heappop(active)
+            for _, _, other in active:
+                pairs.append((other, interval))
+            heapq.heappush(active, (interval.end, order, interval))
+
+    return pairs
+
+
+def horario_intervals(horarios) -> Iterator[Interval]:
+    """Intervalos de docente y aula de un queryset de HorarioClase (una consulta)"""
+    rows = horarios.values_list(
+        'id',
+        'aula_id',
+        'aula__codigo',
+        'franja_horaria__dia_semana',
+        'franja_horaria__hora_inicio',
+        'franja_horaria__hora_fin',
+        'docente_id',
+        'docente__first_name',
+        'docente__last_name',
+    )
+    for horario_id, aula_id, aula_codigo, dia, inicio, fin, docente_id, nombre, apellido in rows:
+        start, end = _minutes(inicio), _minutes(fin)
+        yield Interval(('docente', docente_id), dia, start, end, 'horario_clase', horario_id,
+                       f"{nombre} {apellido}".strip())
+        # Las clases virtuales no ocupan aula
+        if aula_id is not None:
+            yield Interval(('aula', aula_id), dia, start, end, 'horario_clase', horario_id, aula_codigo)
+
+
+def solicitud_intervals(solicitudes, weekly: bool = False) -> Iterator[Interval]:
+    """
+    Intervalos de aula de un queryset de SolicitudReserva.
+
+    Con ``weekly`` la fecha se convierte al día de la semana para cruzar las
+    solicitudes con el horario semanal de HorarioClase (misma tabla de aulas).
+    """
+    rows = solicitudes.values_list('id', 'aula_id', 'aula__codigo', 'fecha_reserva', 'hora_inicio', 'hora_fin')
+    for solicitud_id, aula_id, aula_codigo, fecha, inicio, fin in rows:
+        day = DIAS_SEMANA[fecha.weekday()] if weekly else fecha
+        yield Interval(('aula', aula_id), day, _minutes(inicio), _minutes(fin), 'solicitud_reserva',
+                       solicitud_id, aula_codigo)
+
+
+def legacy_asignacion_intervals(asignaciones) -> Iterator[Interval]:
+    """
+    Intervalos de docente y aula de core.Asignacion.
+
+    Las filas heredadas pueden no tener docente vinculado; en ese caso se
+    usa el nombre libre del docente como recurso.
+    """
+    rows = asignaciones.values_list('id', 'docente_id', 'docente_nombre', 'aula_id', 'dia', 'hora_inicio', 'hora_fin')
+    for asignacion_id, docente_id, docente_nombre, aula_id, dia, inicio, fin in rows:
+        start, end = _minutes(inicio), _minutes(fin)
+        docente = docente_id or (docente_nombre or '').strip().lower()
+        if docente:
+            yield Interval(('legacy_docente', docente), dia, start, end, 'core_asignacion', asignacion_id,
+                           docente_nombre or str(docente_id))
+        if aula_id:
+            yield Interval(('legacy_aula', aula_id), dia, start, end, 'core_asignacion', asignacion_id, aula_id)
+
+
+def legacy_reserva_intervals(reservas, weekly: bool = False) -> Iterator[Interval]:
+    """
+    Intervalos de aula de core.Reserva (misma tabla de aulas que core.Asignacion).
+
+    Con ``weekly`` la fecha se convierte al código de día de core.Asignacion.
+    """
+    rows = reservas.values_list('id', 'aula_id', 'fecha', 'hora_inicio', 'hora_fin')
+    for reserva_id, aula_id, fecha, inicio, fin in rows:
+        day = DIAS_LEGACY[fecha.weekday()] if weekly else fecha
+        yield Interval(('legacy_aula', aula_id), day, _minutes(inicio), _minutes(fin), 'core_reserva',
+                       reserva_id, aula_id)
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from .models import AsignacionDocente, HorarioClase, ConflictoHorario, RegistroAsistencia
 from apps.planificacion.models import PlanificacionAcademica, Materia, FranjaHoraria
 from apps.aulas.models import Aula
@@ -62,22 +63,16 @@ class HorarioClaseCreateSerializer(serializers.ModelSerializer):
         """Validaciones personalizadas"""
         asignacion = data['asignacion_docente']
         franja = data['franja_horaria']
-        aula = data['aula']
+        aula = data.get('aula')
 
-        # 1. Validar que el docente no tenga otra clase en la misma franja
-        conflicto_docente = HorarioClase.objects.filter(
-            asignacion_docente__docente=asignacion.docente,
-            franja_horaria=franja,
-            is_activa=True
-        ).exclude(id=self.instance.id if self.instance else None).exists()
+        if not aula and data.get('modalidad') != 'virtual':
+            raise serializers.ValidationError("Las clases presenciales o híbridas requieren un aula")
 
-        if conflicto_docente:
-            raise serializers.ValidationError(
-                f"El docente {asignacion.docente.get_full_name()} ya tiene una clase en {franja.nombre}"
-            )
+        # 1. Que el docente no tenga otra clase en la misma franja lo garantiza la
+        # restricción horarioclase_docente_franja_activa al guardar (ver _save)
 
-        # 2. Validar que el aula no esté ocupada
-        conflicto_aula = HorarioClase.objects.filter(
+        # 2. Validar que el aula no esté ocupada (las clases virtuales no usan aula)
+        conflicto_aula = aula is not None and HorarioClase.objects.filter(
             aula=aula,
             franja_horaria=franja,
             is_activa=True
@@ -90,13 +85,47 @@ class HorarioClaseCreateSerializer(serializers.ModelSerializer):
 
         # 3. Validar capacidad
         capacidad_estudiantes = data.get('capacidad_estudiantes', 0)
-        if capacidad_estudiantes and capacidad_estudiantes > aula.capacidad:
+        if aula and capacidad_estudiantes and capacidad_estudiantes > aula.capacidad:
             raise serializers.ValidationError(
                 f"La capacidad de estudiantes ({capacidad_estudiantes}) excede la capacidad del aula ({aula.capacidad})"
             )
 
         return data
 
+    def _save(self, guardar, validated_data):
+        try:
+            # Punto de guardado: la transacción de la petición sigue usable tras el error
+            with transaction.atomic():
+                return guardar(validated_data)
+        except IntegrityError:
+            asignacion = validated_data.get('asignacion_docente') or self.instance.asignacion_docente
+            franja = validated_data.get('franja_horaria') or self.instance.franja_horaria
+            if not self._docente_ocupado(asignacion, franja):
+                raise
+            raise serializers.ValidationError(
+                f"El docente {asignacion.docente.get_full_name()} ya tiene una clase en {franja.nombre}"
+            )
+
+    def _docente_ocupado(self, asignacion, franja):
+        """
+        Si el error lo produjo horarioclase_docente_franja_activa: no todos los
+        motores incluyen el nombre de la restricción en el mensaje (SQLite solo
+        lista las columnas), así que se comprueba la condición en la base de datos
+        """
+        if self.instance is not None and not self.instance.is_activa:
+            return False
+        return HorarioClase.objects.filter(
+            docente_id=asignacion.docente_id,
+            franja_horaria=franja,
+            is_activa=True
+        ).exclude(id=self.instance.id if self.instance else None).exists()
+
+    def create(self, validated_data):
+        return self._save(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self._save(lambda data: super(HorarioClaseCreateSerializer, self).update(instance, data), validated_data)
+
 
 class ConflictoHorarioSerializer(serializers.ModelSerializer):
     planificacion_nombre = serializers.CharField(source='planificacion.nombre', read_only=True)
@@ -105,7 +134,7 @@ class ConflictoHorarioSerializer(serializers.ModelSerializer):
         model = ConflictoHorario
         fields = [
             'id', 'planificacion', 'planificacion_nombre', 'tipo', 'descripcion',
-            'estado', 'fecha_deteccion', 'fecha_resolucion'
+            'horario_clase', 'horarios_involucrados', 'resuelto', 'fecha_deteccion', 'fecha_resolucion'
         ]
 
 
@@ -123,7 +152,7 @@ class RegistroAsistenciaSerializer(serializers.ModelSerializer):
         return {
             'materia': obj.horario_clase.asignacion_docente.materia.nombre,
             'docente': obj.horario_clase.asignacion_docente.docente.get_full_name(),
-            'aula': obj.horario_clase.aula.codigo,
+            'aula': obj.horario_clase.aula.codigo if obj.horario_clase.aula else None,
             'franja': obj.horario_clase.franja_horaria.nombre
         }
 
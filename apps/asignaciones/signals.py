@@ -0,0 +1,75 @@
+"""
+Señales de la app de asignaciones
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from apps.planificacion.response_cache import bump_planificacion_version
+from apps.usuarios.models import CustomUser
+from .models import AsignacionDocente, ConflictoHorario, HorarioClase
+from .conflicts import (
+    conflict_tracking_active,
+    horario_conflict_keys,
+    horario_instance_keys,
+    schedule_conflict_refresh,
+    update_horarios,
+)
+
+
+@receiver(pre_save, sender=HorarioClase)
+def capturar_claves_previas(sender, instance, raw=False, **kwargs):
+    """Un cambio de docente, aula o franja también afecta a las claves anteriores"""
+    if raw or instance._state.adding or not conflict_tracking_active():
+        return
+    instance._claves_conflicto_previas = horario_conflict_keys(HorarioClase.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=HorarioClase)
+def actualizar_conflictos_horario(sender, instance, raw=False, **kwargs):
+    """Reevalúa los conflictos de las claves del horario guardado"""
+    if raw or not conflict_tracking_active():
+        return
+    keys = horario_instance_keys(instance)
+    keys |= getattr(instance, '_claves_conflicto_previas', set())
+    bump_planificacion_version(key[0] for key in keys)
+    schedule_conflict_refresh(keys)
+
+
+@receiver(pre_delete, sender=HorarioClase)
+def actualizar_conflictos_horario_eliminado(sender, instance, **kwargs):
+    """Las claves se calculan antes de borrar; la conciliación corre al confirmar"""
+    if not conflict_tracking_active():
+        return
+    keys = horario_instance_keys(instance)
+    bump_planificacion_version(key[0] for key in keys)
+    schedule_conflict_refresh(keys)
+
+
+@receiver(post_save, sender=AsignacionDocente)
+def sincronizar_docente_horarios(sender, instance, created=False, raw=False, **kwargs):
+    """Mantiene la copia de HorarioClase.docente si cambia el docente de la asignación"""
+    if created or raw:
+        return
+    horarios = HorarioClase.objects.filter(asignacion_docente=instance).exclude(docente_id=instance.docente_id)
+    update_horarios(horarios, docente_id=instance.docente_id)
+
+
+@receiver(post_save, sender=AsignacionDocente)
+@receiver(post_delete, sender=AsignacionDocente)
+@receiver(post_save, sender=ConflictoHorario)
+@receiver(post_delete, sender=ConflictoHorario)
+def versionar_planificacion(sender, instance, raw=False, **kwargs):
+    """Asignaciones y conflictos forman parte de las respuestas de la planificación"""
+    if raw:
+        return
+    bump_planificacion_version([instance.planificacion_id])
+
+
+@receiver(post_save, sender=CustomUser)
+def versionar_planificaciones_docente(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """El nombre del docente aparece en horarios y matrices de sus planificaciones"""
+    if created or raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    bump_planificacion_version(
+        AsignacionDocente.objects.filter(docente=instance).values('planificacion_id')
+    )
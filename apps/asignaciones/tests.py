@@ -0,0 +1,406 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework import serializers
+
+from apps.aulas.models import Aula, TipoAula
+from apps.bot_telegram.models import SolicitudReserva
+from apps.bot_telegram.serializers import SolicitudReservaSerializer
+from apps.planificacion.models import Carrera, FranjaHoraria, Materia, Periodo, PlanificacionAcademica
+from .conflicts import bulk_create_horarios, delete_horarios, update_horarios
+from .models import AsignacionDocente, ConflictoHorario, HorarioClase
+from .overlaps import Interval, find_overlaps, legacy_asignacion_intervals, legacy_reserva_intervals
+from .serializers import HorarioClaseCreateSerializer
+
+User = get_user_model()
+
+
+def intervalo(ref, start, end, resource=('aula', 1), day='lunes'):
+    return Interval(resource, day, start, end, 'prueba', ref)
+
+
+def pares(intervals):
+    return sorted(tuple(sorted((a.ref, b.ref))) for a, b in find_overlaps(intervals))
+
+
+class FindOverlapsTest(SimpleTestCase):
+    """Barrido por línea sobre intervalos [inicio, fin)"""
+
+    def test_extremos_que_se_tocan_no_se_solapan(self):
+        self.assertEqual(pares([intervalo(1, 480, 600), intervalo(2, 600, 720)]), [])
+
+    def test_solapamiento_parcial(self):
+        self.assertEqual(pares([intervalo(1, 480, 600), intervalo(2, 540, 660)]), [(1, 2)])
+
+    def test_contencion(self):
+        self.assertEqual(pares([intervalo(1, 480, 720), intervalo(2, 540, 600)]), [(1, 2)])
+
+    def test_intervalos_identicos(self):
+        self.assertEqual(pares([intervalo(1, 480, 600), intervalo(2, 480, 600)]), [(1, 2)])
+
+    def test_solapamiento_multiple(self):
+        intervals = [
+            intervalo(1, 480, 720),
+            intervalo(2, 500, 560),
+            intervalo(3, 540, 620),
+            # Solo se solapa con el primero: el segundo ya terminó y el tercero termina al empezar
+            intervalo(4, 620, 700),
+        ]
+
+        self.assertEqual(pares(intervals), [(1, 2), (1, 3), (1, 4), (2, 3)])
+
+    def test_recursos_y_dias_distintos_no_se_cruzan(self):
+        intervals = [
+            intervalo(1, 480, 600),
+            intervalo(2, 480, 600, resource=('aula', 2)),
+            intervalo(3, 480, 600, resource=('docente', 1)),
+            intervalo(4, 480, 600, day='martes'),
+        ]
+
+        self.assertEqual(pares(intervals), [])
+
+    def test_orden_de_entrada_irrelevante(self):
+        intervals = [intervalo(3, 540, 620), intervalo(1, 480, 720), intervalo(2, 500, 560)]
+
+        self.assertEqual(pares(intervals), pares(list(reversed(intervals))))
+
+
+class Filas:
+    """Queryset mínimo para los adaptadores, que solo usan values_list"""
+
+    def __init__(self, *rows):
+        self.rows = rows
+
+    def values_list(self, *fields):
+        return list(self.rows)
+
+
+class LegacyAdaptersTest(SimpleTestCase):
+    """Adaptadores de core.Asignacion y core.Reserva"""
+
+    def test_docente_sin_vincular_usa_nombre(self):
+        asignaciones = Filas(
+            (1, None, 'Ana Pérez', 'A1', 'Lun', datetime.time(8), datetime.time(10)),
+            (2, None, ' ana pérez ', 'A2', 'Lun', datetime.time(9), datetime.time(11)),
+            (3, 'D7', 'Luis', None, 'Lun', datetime.time(9), datetime.time(11)),
+        )
+
+        intervals = list(legacy_asignacion_intervals(asignaciones))
+
+        # La fila sin aula solo ocupa a su docente
+        self.assertEqual(len(intervals), 5)
+        self.assertEqual(pares(intervals), [(1, 2)])
+        [(a, _)] = find_overlaps(intervals)
+        self.assertEqual(a.resource, ('legacy_docente', 'ana pérez'))
+
+    def test_reserva_semanal_se_cruza_con_asignaciones(self):
+        asignaciones = Filas((1, 'D1', 'Ana', 'A1', 'Mie', datetime.time(8), datetime.time(10)))
+        # 2026-03-04 es miércoles
+        reservas = Filas((5, 'A1', datetime.date(2026, 3, 4), datetime.time(9), datetime.time(12)))
+
+        fechadas = list(legacy_reserva_intervals(reservas))
+        semanales = list(legacy_reserva_intervals(reservas, weekly=True))
+
+        self.assertEqual(fechadas[0].day, datetime.date(2026, 3, 4))
+        self.assertEqual(pares([*legacy_asignacion_intervals(asignaciones), *fechadas]), [])
+        self.assertEqual(pares([*legacy_asignacion_intervals(asignaciones), *semanales]), [(1, 5)])
+
+
+class HorariosTestCase(TestCase):
+    """Planificación con tres asignaciones (dos del mismo docente), tres franjas y un aula"""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        periodo = Periodo.objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        cls.planificacion = PlanificacionAcademica.objects.create(nombre='Plan', periodo=periodo, creado_por=admin)
+        carrera = Carrera.objects.create(codigo='ING', nombre='Ingeniería')
+        materias = [
+            Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=i + 1, carrera=carrera)
+            for i in range(3)
+        ]
+        docentes = [User.objects.create_user(f'docente{i}', password='x', rol='docente') for i in range(2)]
+        # Dos asignaciones del mismo docente y una de otro
+        cls.asignaciones = [
+            AsignacionDocente.objects.create(
+                docente=docente, materia=materia, planificacion=cls.planificacion, carga_horaria_semanal=4
+            )
+            for docente, materia in zip([docentes[0], docentes[0], docentes[1]], materias)
+        ]
+        # 8-10 y 9-11 se solapan; 11-13 solo toca a 9-11
+        cls.franjas = [
+            FranjaHoraria.objects.create(
+                nombre=f'Bloque {inicio}', dia_semana='lunes',
+                hora_inicio=datetime.time(inicio), hora_fin=datetime.time(inicio + 2)
+            )
+            for inicio in (8, 9, 11)
+        ]
+        tipo = TipoAula.objects.create(nombre='Magistral')
+        cls.aula = Aula.objects.create(codigo='A-101', nombre='Aula', tipo=tipo, capacidad=40, piso=1, edificio='A')
+
+    def horario(self, asignacion, franja, aula=None):
+        return HorarioClase(
+            asignacion_docente=self.asignaciones[asignacion],
+            franja_horaria=self.franjas[franja],
+            aula=aula,
+            modalidad='presencial' if aula else 'virtual'
+        )
+
+
+class BulkHorarioConflictsTest(HorariosTestCase):
+    """Las rutas masivas de HorarioClase abren y resuelven conflictos al confirmar"""
+
+    def crear(self, *horarios):
+        with self.captureOnCommitCallbacks(execute=True):
+            return bulk_create_horarios(list(horarios))
+
+    def pendientes(self):
+        return list(ConflictoHorario.objects.filter(planificacion=self.planificacion, resuelto=False))
+
+    def version(self):
+        self.planificacion.refresh_from_db(fields=['version'])
+        return self.planificacion.version
+
+    def test_crear_abre_conflicto_docente(self):
+        version = self.version()
+
+        primero, segundo = self.crear(self.horario(0, 0), self.horario(1, 1))
+
+        [conflicto] = self.pendientes()
+        self.assertEqual(conflicto.tipo, 'conflicto_docente')
+        self.assertEqual(conflicto.horarios_involucrados, [primero.id, segundo.id])
+        self.assertEqual(conflicto.horario_clase_id, segundo.id)
+        self.assertEqual(segundo.docente_id, self.asignaciones[1].docente_id)
+        self.assertGreater(self.version(), version)
+
+    def test_crear_abre_conflicto_aula(self):
+        self.crear(self.horario(0, 0, self.aula), self.horario(2, 1, self.aula))
+
+        self.assertEqual([c.tipo for c in self.pendientes()], ['conflicto_aula'])
+
+    def test_crear_sin_solapamiento(self):
+        # Franjas que solo se tocan en el extremo no chocan
+        self.crear(self.horario(0, 1, self.aula), self.horario(1, 2, self.aula))
+
+        self.assertEqual(self.pendientes(), [])
+
+    def test_actualizar_resuelve_conflicto(self):
+        _, segundo = self.crear(self.horario(0, 0), self.horario(1, 1))
+        version = self.version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            actualizados = update_horarios(HorarioClase.objects.filter(pk=segundo.pk), franja_horaria=self.franjas[2])
+
+        self.assertEqual(actualizados, 1)
+        self.assertEqual(self.pendientes(), [])
+        conflicto = ConflictoHorario.objects.get(planificacion=self.planificacion)
+        self.assertTrue(conflicto.resuelto)
+        self.assertIsNotNone(conflicto.fecha_resolucion)
+        self.assertGreater(self.version(), version)
+
+    def test_actualizar_abre_conflicto(self):
+        _, segundo = self.crear(self.horario(0, 0, self.aula), self.horario(2, 2, self.aula))
+        self.assertEqual(self.pendientes(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_horarios(HorarioClase.objects.filter(pk=segundo.pk), franja_horaria=self.franjas[1])
+
+        self.assertEqual([c.tipo for c in self.pendientes()], ['conflicto_aula'])
+
+    def test_eliminar_resuelve_y_conserva_conflicto(self):
+        _, segundo = self.crear(self.horario(0, 0), self.horario(1, 1))
+        version = self.version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            eliminados = delete_horarios(HorarioClase.objects.filter(pk=segundo.pk))
+
+        self.assertEqual(eliminados, 1)
+        self.assertEqual(self.pendientes(), [])
+        # SET_NULL: el historial de resolución sobrevive al horario
+        conflicto = ConflictoHorario.objects.get(planificacion=self.planificacion)
+        self.assertTrue(conflicto.resuelto)
+        self.assertIsNone(conflicto.horario_clase_id)
+        self.assertIn(segundo.id, conflicto.horarios_involucrados)
+        self.assertGreater(self.version(), version)
+
+
+class HorarioDocenteConstraintTest(HorariosTestCase):
+    """La base de datos impide dos clases activas del mismo docente en una franja"""
+
+    def setUp(self):
+        self.primero = self.horario(0, 0)
+        self.primero.save()
+
+    def test_restriccion_rechaza_duplicado_activo(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                self.horario(1, 0).save()
+
+        # Un duplicado inactivo sí se permite
+        inactivo = self.horario(1, 0)
+        inactivo.is_activa = False
+        inactivo.save()
+        self.assertEqual(inactivo.docente_id, self.asignaciones[1].docente_id)
+
+    def test_full_clean_reporta_restriccion(self):
+        with self.assertRaisesMessage(ValidationError, 'El docente ya tiene una clase asignada en este horario'):
+            self.horario(1, 0).full_clean()
+
+    def test_serializer_convierte_error_en_validacion(self):
+        serializer = HorarioClaseCreateSerializer(data={
+            'asignacion_docente': self.asignaciones[1].id,
+            'franja_horaria': self.franjas[0].id,
+            'modalidad': 'virtual',
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+        # El punto de guardado deja la transacción usable
+        self.assertEqual(HorarioClase.objects.count(), 1)
+
+    def test_serializer_no_oculta_otras_violaciones(self):
+        serializer = HorarioClaseCreateSerializer(data={
+            'asignacion_docente': self.asignaciones[2].id,
+            'franja_horaria': self.franjas[0].id,
+            'modalidad': 'virtual',
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        # El mensaje menciona docente_id pero el docente está libre en la franja
+        error = IntegrityError('FOREIGN KEY constraint failed: docente_id')
+
+        with mock.patch.object(HorarioClase, 'save', side_effect=error):
+            with self.assertRaises(IntegrityError):
+                serializer.save()
+
+    def test_cambio_de_docente_se_propaga(self):
+        asignacion = self.asignaciones[0]
+        asignacion.docente = self.asignaciones[2].docente
+        asignacion.save()
+
+        self.primero.refresh_from_db()
+        self.assertEqual(self.primero.docente_id, self.asignaciones[2].docente_id)
+        # La franja queda libre para el docente anterior
+        self.horario(1, 0).save()
+
+
+class SolicitudReservaOverlapTest(HorariosTestCase):
+    """Las solicitudes de reserva no pueden solaparse con clases ni con otras solicitudes del aula"""
+
+    def setUp(self):
+        PlanificacionAcademica.objects.filter(pk=self.planificacion.pk).update(estado='vigente')
+        # Clase de 8 a 10 los lunes
+        self.horario(0, 0, aula=self.aula).save()
+        self.estudiante = User.objects.create_user('estudiante', password='x', rol='estudiante')
+
+    def solicitud(self, inicio, fin, fecha=datetime.date(2026, 3, 2)):
+        return SolicitudReservaSerializer(data={
+            'estudiante': self.estudiante.id, 'aula': self.aula.id, 'fecha_reserva': fecha,
+            'hora_inicio': datetime.time(inicio), 'hora_fin': datetime.time(fin), 'proposito': 'Estudio',
+        })
+
+    def test_rechaza_solapamiento_con_clase(self):
+        serializer = self.solicitud(9, 11)
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('08:00 a 10:00 (clase)', str(serializer.errors))
+        # Termina cuando empieza la clase, otro día de la semana o fuera del periodo
+        self.assertTrue(self.solicitud(6, 8).is_valid())
+        self.assertTrue(self.solicitud(8, 10, fecha=datetime.date(2026, 3, 3)).is_valid())
+        self.assertTrue(self.solicitud(8, 10, fecha=datetime.date(2026, 8, 3)).is_valid())
+
+    def test_rechaza_solapamiento_con_otra_solicitud(self):
+        primera = self.solicitud(10, 12)
+        self.assertTrue(primera.is_valid(), primera.errors)
+        primera.save()
+
+        serializer = self.solicitud(11, 13)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('10:00 a 12:00 (otra solicitud)', str(serializer.errors))
+
+        # Una solicitud rechazada libera el aula y puede editarse sin chocar consigo misma
+        SolicitudReserva.objects.update(estado='rechazada')
+        self.assertTrue(self.solicitud(11, 13).is_valid())
+        SolicitudReserva.objects.update(estado='pendiente')
+        edicion = SolicitudReservaSerializer(SolicitudReserva.objects.get(), data={'hora_fin': datetime.time(13)},
+                                             partial=True)
+        self.assertTrue(edicion.is_valid(), edicion.errors)
+
+
+class HorarioDocenteMigrationTest(TransactionTestCase):
+    """La migración 0004 registra los duplicados que desactiva y los restaura al revertir"""
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        # Las demás apps quedan en su última migración
+        otras = [nodo for nodo in self.executor.loader.graph.leaf_nodes() if nodo[0] != 'asignaciones']
+        self.anterior = otras + [('asignaciones', '0003_conflictohorario_clave')]
+        self.posterior = otras + [('asignaciones', '0004_horarioclase_docente')]
+        self.addCleanup(call_command, 'migrate', verbosity=0)
+        self.migrar(self.anterior)
+
+    def migrar(self, destino):
+        self.executor.loader.build_graph()
+        self.executor.migrate(destino)
+        return self.executor.loader.project_state(destino).apps
+
+    def test_duplicados_desactivados_y_restaurados(self):
+        apps = self.executor.loader.project_state(self.anterior).apps
+        User = apps.get_model('usuarios', 'CustomUser')
+        docente = User.objects.create(username='docente', rol='docente')
+        admin = User.objects.create(username='admin', rol='administrador')
+        periodo = apps.get_model('planificacion', 'Periodo').objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        planificacion = apps.get_model('planificacion', 'PlanificacionAcademica').objects.create(
+            nombre='Plan', periodo=periodo, creado_por=admin
+        )
+        carrera = apps.get_model('planificacion', 'Carrera').objects.create(codigo='ING', nombre='Ingeniería')
+        franja = apps.get_model('planificacion', 'FranjaHoraria').objects.create(
+            nombre='Bloque', dia_semana='lunes', hora_inicio=datetime.time(8), hora_fin=datetime.time(10),
+            duracion_minutos=120
+        )
+        Materia = apps.get_model('planificacion', 'Materia')
+        AsignacionDocente = apps.get_model('asignaciones', 'AsignacionDocente')
+        Horario = apps.get_model('asignaciones', 'HorarioClase')
+        horarios = [
+            Horario.objects.create(
+                asignacion_docente=AsignacionDocente.objects.create(
+                    docente=docente, planificacion=planificacion, carga_horaria_semanal=4,
+                    materia=Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=1,
+                                                   carrera=carrera),
+                ),
+                franja_horaria=franja, modalidad='virtual'
+            )
+            for i in range(3)
+        ]
+        ids = [horario.id for horario in horarios]
+
+        with self.assertLogs('apps.asignaciones.migrations.0004_horarioclase_docente', 'WARNING'):
+            apps = self.migrar(self.posterior)
+
+        Horario = apps.get_model('asignaciones', 'HorarioClase')
+        self.assertEqual(list(Horario.objects.filter(is_activa=True).values_list('id', flat=True)), ids[:1])
+        conflictos = apps.get_model('asignaciones', 'ConflictoHorario').objects.order_by('horario_clase_id')
+        self.assertEqual(
+            list(conflictos.values_list('tipo', 'horario_clase_id', 'planificacion_id', 'resuelto')),
+            [('conflicto_docente', horario_id, planificacion.id, False) for horario_id in ids[1:]]
+        )
+
+        apps = self.migrar(self.anterior)
+
+        Horario = apps.get_model('asignaciones', 'HorarioClase')
+        self.assertEqual(Horario.objects.filter(id__in=ids, is_activa=True).count(), 3)
+        self.assertFalse(apps.get_model('asignaciones', 'ConflictoHorario').objects.exists())
+        # Sin duplicados para la migración final de limpieza
+        Horario.objects.all().delete()
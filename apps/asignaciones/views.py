@@ -17,6 +17,8 @@ from .serializers import (
     RegistroAsistenciaSerializer
 )
 from apps.planificacion.models import PlanificacionAcademica
+from apps.planificacion.response_cache import VersionedResponseMixin
+from .conflicts import detect_horario_clashes, persist_conflicts
 
 
 class HorarioClaseFilter(django_filters.FilterSet):
@@ -26,14 +28,14 @@ class HorarioClaseFilter(django_filters.FilterSet):
     materia = django_filters.NumberFilter(field_name='asignacion_docente__materia__id')
     aula = django_filters.NumberFilter(field_name='aula__id')
     dia_semana = django_filters.CharFilter(field_name='franja_horaria__dia_semana')
-    modalidad = django_filters.ChoiceFilter(choices=HorarioClase.MODALIDADES)
+    modalidad = django_filters.ChoiceFilter(choices=HorarioClase._meta.get_field('modalidad').choices)
 
     class Meta:
         model = HorarioClase
         fields = ['planificacion', 'docente', 'materia', 'aula', 'dia_semana', 'modalidad']
 
 
-class HorarioClaseViewSet(ModelViewSet):
+class HorarioClaseViewSet(VersionedResponseMixin, ModelViewSet):
     """
     ViewSet para gestión completa de horarios de clase
     """
@@ -109,6 +111,13 @@ class HorarioClaseViewSet(ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        return self.versioned_response(
+            'por_planificacion', planificacion,
+            lambda: self._por_planificacion(planificacion, planificacion_id)
+        )
+
+    def _por_planificacion(self, planificacion, planificacion_id):
+        """Datos de la acción por_planificacion, sin caché"""
         horarios = self.get_queryset().filter(
             asignacion_docente__planificacion=planificacion
         )
@@ -121,17 +130,21 @@ class HorarioClaseViewSet(ModelViewSet):
                 horarios_por_dia[dia] = []
             horarios_por_dia[dia].append(HorarioClaseSerializer(horario).data)
 
-        return Response({
+        return {
             'planificacion_id': planificacion_id,
             'planificacion_nombre': planificacion.nombre,
             'total_horarios': horarios.count(),
             'horarios_por_dia': horarios_por_dia
-        })
+        }
 
     @action(detail=False, methods=['get'])
     def matriz_horarios(self, request):
         """
         Genera una matriz de horarios (vista tabla) para una planificación
+
+        Se construye con una sola consulta values() agrupada en memoria. Con
+        ``formato=compacto`` las celdas son filas de enteros que referencian
+        tablas de materias, docentes, aulas y modalidades.
         """
         planificacion_id = request.query_params.get('planificacion_id')
         if not planificacion_id:
@@ -140,51 +153,96 @@ class HorarioClaseViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        horarios = self.get_queryset().filter(
-            asignacion_docente__planificacion=planificacion_id
+        compacto = request.query_params.get('formato') == 'compacto'
+        planificacion = PlanificacionAcademica.objects.only(
+            'id', 'version', 'estado', 'creado_por_id'
+        ).filter(id=planificacion_id).first()
+        if planificacion is None:
+            # Sin planificación la matriz queda vacía; no se cachea
+            return Response(self._matriz_horarios(planificacion_id, compacto))
+
+        endpoint = 'matriz_horarios_compacto' if compacto else 'matriz_horarios'
+        return self.versioned_response(
+            endpoint, planificacion, lambda: self._matriz_horarios(planificacion_id, compacto)
         )
 
-        # Obtener todas las franjas horarias únicas
-        franjas = set()
-        for horario in horarios:
-            franjas.add((
-                horario.franja_horaria.hora_inicio,
-                horario.franja_horaria.hora_fin
-            ))
-        franjas_ordenadas = sorted(list(franjas))
+    def _matriz_horarios(self, planificacion_id, compacto):
+        """Datos de la acción matriz_horarios, sin caché"""
+        filas = self.get_queryset().filter(
+            asignacion_docente__planificacion=planificacion_id
+        ).order_by(
+            'franja_horaria__hora_inicio', 'franja_horaria__hora_fin', 'id'
+        ).values_list(
+            'id',
+            'franja_horaria__dia_semana',
+            'franja_horaria__hora_inicio',
+            'franja_horaria__hora_fin',
+            'asignacion_docente__materia_id',
+            'asignacion_docente__materia__nombre',
+            'docente_id',
+            'docente__first_name',
+            'docente__last_name',
+            'aula_id',
+            'aula__codigo',
+            'modalidad',
+            'capacidad_estudiantes',
+        )
 
-        # Crear matriz
         dias_semana = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado']
-        matriz = {}
-
-        for dia in dias_semana:
-            matriz[dia] = {}
-            for hora_inicio, hora_fin in franjas_ordenadas:
-                franja_key = f"{hora_inicio}-{hora_fin}"
-                matriz[dia][franja_key] = []
-
-                # Buscar horarios para este día y franja
-                horarios_franja = horarios.filter(
-                    franja_horaria__dia_semana=dia,
-                    franja_horaria__hora_inicio=hora_inicio,
-                    franja_horaria__hora_fin=hora_fin
-                )
-
-                for horario in horarios_franja:
-                    matriz[dia][franja_key].append({
-                        'id': horario.id,
-                        'materia': horario.asignacion_docente.materia.nombre,
-                        'docente': horario.asignacion_docente.docente.get_full_name(),
-                        'aula': horario.aula.codigo,
-                        'modalidad': horario.modalidad,
-                        'estudiantes': horario.capacidad_estudiantes
-                    })
-
-        return Response({
+        dia_idx = {dia: i for i, dia in enumerate(dias_semana)}
+        franja_idx = {}
+        materias, docentes, aulas = {}, {}, {}
+        celdas = []
+
+        # Un solo recorrido: las filas llegan ordenadas por hora, de modo que
+        # los índices de franja quedan en orden cronológico
+        for (horario_id, dia, hora_inicio, hora_fin, materia_id, materia, docente_id,
+             nombre, apellido, aula_id, aula, modalidad, estudiantes) in filas:
+            franja = franja_idx.setdefault((hora_inicio, hora_fin), len(franja_idx))
+            materias[materia_id] = materia
+            docentes[docente_id] = f"{nombre} {apellido}".strip()
+            if aula_id is not None:
+                aulas[aula_id] = aula
+            if dia in dia_idx:
+                celdas.append((dia_idx[dia], franja, horario_id, materia_id, docente_id, aula_id, modalidad, estudiantes))
+
+        franjas_horarias = [f"{inicio}-{fin}" for inicio, fin in franja_idx]
+
+        if compacto:
+            modalidades = [codigo for codigo, _ in HorarioClase._meta.get_field('modalidad').choices]
+            modalidad_idx = {codigo: i for i, codigo in enumerate(modalidades)}
+            return {
+                'planificacion_id': planificacion_id,
+                'formato': 'compacto',
+                'dias': dias_semana,
+                'franjas_horarias': franjas_horarias,
+                'materias': materias,
+                'docentes': docentes,
+                'aulas': aulas,
+                'modalidades': modalidades,
+                'columnas': ['dia', 'franja', 'id', 'materia', 'docente', 'aula', 'modalidad', 'estudiantes'],
+                'celdas': [
+                    [d, f, horario_id, materia_id, docente_id, aula_id, modalidad_idx.get(modalidad), estudiantes]
+                    for d, f, horario_id, materia_id, docente_id, aula_id, modalidad, estudiantes in celdas
+                ]
+            }
+
+        matriz = {dia: {franja: [] for franja in franjas_horarias} for dia in dias_semana}
+        for d, f, horario_id, materia_id, docente_id, aula_id, modalidad, estudiantes in celdas:
+            matriz[dias_semana[d]][franjas_horarias[f]].append({
+                'id': horario_id,
+                'materia': materias[materia_id],
+                'docente': docentes[docente_id],
+                'aula': aulas[aula_id] if aula_id is not None else None,
+                'modalidad': modalidad,
+                'estudiantes': estudiantes
+            })
+
+        return {
             'planificacion_id': planificacion_id,
-            'franjas_horarias': [f"{inicio}-{fin}" for inicio, fin in franjas_ordenadas],
+            'franjas_horarias': franjas_horarias,
             'matriz': matriz
-        })
+        }
 
 
 class ConflictoHorarioViewSet(ModelViewSet):
@@ -251,61 +309,10 @@ class ConflictoHorarioViewSet(ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Lógica de detección de conflictos
-        conflictos_detectados = []
-        horarios = HorarioClase.objects.filter(
-            asignacion_docente__planificacion=planificacion,
-            is_activa=True
-        )
-
-        # 1. Conflictos de docente (mismo docente, misma franja)
-        docente_conflictos = {}
-        for horario in horarios:
-            key = (horario.asignacion_docente.docente.id,
-                   horario.franja_horaria.dia_semana,
-                   horario.franja_horaria.hora_inicio)
-
-            if key in docente_conflictos:
-                conflictos_detectados.append({
-                    'tipo': 'conflicto_docente',
-                    'descripcion': f'Docente {horario.asignacion_docente.docente.get_full_name()} tiene clases simultáneas',
-                    'horarios_involucrados': [docente_conflictos[key].id, horario.id]
-                })
-            else:
-                docente_conflictos[key] = horario
-
-        # 2. Conflictos de aula (misma aula, misma franja)
-        aula_conflictos = {}
-        for horario in horarios:
-            key = (horario.aula.id,
-                   horario.franja_horaria.dia_semana,
-                   horario.franja_horaria.hora_inicio)
-
-            if key in aula_conflictos:
-                conflictos_detectados.append({
-                    'tipo': 'conflicto_aula',
-                    'descripcion': f'Aula {horario.aula.codigo} tiene clases simultáneas',
-                    'horarios_involucrados': [aula_conflictos[key].id, horario.id]
-                })
-            else:
-                aula_conflictos[key] = horario
-
-        # Guardar conflictos nuevos en la base de datos
-        conflictos_guardados = 0
-        for conflicto_data in conflictos_detectados:
-            # Evitar duplicados
-            if not ConflictoHorario.objects.filter(
-                planificacion=planificacion,
-                tipo=conflicto_data['tipo'],
-                descripcion=conflicto_data['descripcion'],
-                estado='pendiente'
-            ).exists():
-                ConflictoHorario.objects.create(
-                    planificacion=planificacion,
-                    tipo=conflicto_data['tipo'],
-                    descripcion=conflicto_data['descripcion']
-                )
-                conflictos_guardados += 1
+        # Choques de docente y de aula en una pasada sobre una proyección
+        # values() y persistencia con bulk_create (número constante de consultas)
+        conflictos_detectados = detect_horario_clashes(planificacion)
+        conflictos_guardados = len(persist_conflicts(planificacion, conflictos_detectados))
 
         return Response({
             'planificacion_id': planificacion_id,
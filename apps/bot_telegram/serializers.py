@@ -1,6 +1,38 @@
 from rest_framework import serializers
+from apps.asignaciones.models import HorarioClase
+from apps.asignaciones.overlaps import (
+    DIAS_SEMANA, Interval, find_overlaps, format_minutes, horario_intervals, solicitud_intervals,
+)
 from .models import SolicitudReserva, ConsultaBot
 
+# Solicitudes que todavía ocupan el aula
+ESTADOS_ACTIVOS = ('pendiente', 'aprobada')
+
+
+def solapamientos_solicitud(aula, fecha, hora_inicio, hora_fin, exclude_id=None):
+    """
+    Intervalos que se solapan con una solicitud: otras solicitudes activas del
+    aula ese día y las clases de las planificaciones vigentes en esa fecha
+    """
+    dia = DIAS_SEMANA[fecha.weekday()]
+    candidata = Interval(('aula', aula.id), dia, hora_inicio.hour * 60 + hora_inicio.minute,
+                         hora_fin.hour * 60 + hora_fin.minute, 'solicitud_reserva', exclude_id, aula.codigo)
+
+    solicitudes = SolicitudReserva.objects.filter(
+        aula=aula, fecha_reserva=fecha, estado__in=ESTADOS_ACTIVOS
+    ).exclude(pk=exclude_id)
+    horarios = HorarioClase.objects.filter(
+        aula=aula,
+        is_activa=True,
+        franja_horaria__dia_semana=dia,
+        asignacion_docente__planificacion__estado='vigente',
+        asignacion_docente__planificacion__periodo__fecha_inicio__lte=fecha,
+        asignacion_docente__planificacion__periodo__fecha_fin__gte=fecha,
+    )
+    intervals = [candidata, *solicitud_intervals(solicitudes, weekly=True), *horario_intervals(horarios)]
+    return [b if a is candidata else a for a, b in find_overlaps(intervals) if candidata is a or candidata is b]
+
+
 class SolicitudReservaSerializer(serializers.ModelSerializer):
     estudiante_nombre = serializers.CharField(source='estudiante.get_full_name', read_only=True)
     aula_codigo = serializers.CharField(source='aula.codigo', read_only=True)
@@ -9,7 +41,25 @@ class SolicitudReservaSerializer(serializers.ModelSerializer):
         model = SolicitudReserva
         fields = '__all__'
 
+    def validate(self, attrs):
+        def valor(campo):
+            return attrs.get(campo, getattr(self.instance, campo, None))
+
+        aula, fecha, inicio, fin = valor('aula'), valor('fecha_reserva'), valor('hora_inicio'), valor('hora_fin')
+        if inicio >= fin:
+            raise serializers.ValidationError("La hora de inicio debe ser anterior a la hora de fin")
+
+        if valor('estado') in (None, *ESTADOS_ACTIVOS):
+            ocupados = solapamientos_solicitud(aula, fecha, inicio, fin, getattr(self.instance, 'pk', None))
+            if ocupados:
+                raise serializers.ValidationError([
+                    f"El aula {aula.codigo} está ocupada de {format_minutes(i.start)} a {format_minutes(i.end)} "
+                    f"({'clase' if i.source == 'horario_clase' else 'otra solicitud'})"
+                    for i in sorted(ocupados, key=lambda i: i.start)
+                ])
+        return attrs
+
 class ConsultaBotSerializer(serializers.ModelSerializer):
     class Meta:
         model = ConsultaBot
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
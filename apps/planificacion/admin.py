@@ -4,7 +4,7 @@ from django.urls import reverse
 from django.http import HttpResponseRedirect
 from django.contrib import messages
 from django.utils import timezone
-from .models import Carrera, Periodo, Materia, FranjaHoraria, PlanificacionAcademica
+from .models import Carrera, Periodo, Materia, FranjaHoraria, PlanificacionAcademica, SchedulingRun, DisponibilidadDocente
 
 
 @admin.register(Carrera)
@@ -268,4 +268,34 @@ class PlanificacionAcademicaAdmin(admin.ModelAdmin):
     detectar_conflictos.short_description = "Detectar conflictos de horario"
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('periodo', 'creado_por', 'aprobado_por').prefetch_related('carreras')
\ No newline at end of file
+        return super().get_queryset(request).select_related('periodo', 'creado_por', 'aprobado_por').prefetch_related('carreras')
+
+@admin.register(SchedulingRun)
+class SchedulingRunAdmin(admin.ModelAdmin):
+    list_display = ['planificacion', 'strategy', 'seed', 'success', 'score', 'execution_time',
+                    'total_assignments', 'total_conflicts', 'fecha_ejecucion']
+    list_filter = ['strategy', 'success', 'fecha_ejecucion']
+    search_fields = ['planificacion__nombre', 'input_fingerprint']
+    exclude = ['solution']
+    readonly_fields = [
+        'planificacion', 'strategy', 'parameters', 'seed', 'input_fingerprint', 'success', 'score',
+        'execution_time', 'phases', 'total_assignments', 'total_conflicts', 'total_unassigned',
+        'message', 'ejecutado_por', 'fecha_ejecucion'
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('planificacion', 'ejecutado_por')
+
+
+@admin.register(DisponibilidadDocente)
+class DisponibilidadDocenteAdmin(admin.ModelAdmin):
+    list_display = ['docente', 'periodo', 'franja_horaria', 'tipo', 'peso', 'fecha_actualizacion']
+    list_filter = ['periodo', 'tipo', 'franja_horaria__dia_semana']
+    search_fields = ['docente__first_name', 'docente__last_name', 'docente__username']
+    autocomplete_fields = ['docente']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('docente', 'periodo', 'franja_horaria')
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class PlanificacionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.planificacion'
-    verbose_name = 'Planificación'
\ No newline at end of file
+    verbose_name = 'Planificación'
+
+    def ready(self):
+        from . import signals  # noqa: F401
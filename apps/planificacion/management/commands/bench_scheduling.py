@@ -0,0 +1,89 @@
+"""
+Comando Django para medir el rendimiento de los motores de planificación
+Usage: python manage.py bench_scheduling --aulas 20 --docentes 40 --output bench.json
+"""
+
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Genera una institución sintética y mide cada estrategia de planificación'
+
+    def add_arguments(self, parser):
+        defaults = SyntheticScale()
+
+        parser.add_argument('--carreras', type=int, default=defaults.carreras)
+        parser.add_argument('--materias', type=int, default=defaults.materias_por_carrera,
+                            help='Materias por carrera')
+        parser.add_argument('--semestres', type=int, default=defaults.semestres)
+        parser.add_argument('--docentes', type=int, default=defaults.docentes)
+        parser.add_argument('--aulas', type=int, default=defaults.aulas)
+        parser.add_argument('--dias', type=int, default=defaults.dias)
+        parser.add_argument('--franjas-por-dia', type=int, default=defaults.franjas_por_dia)
+        parser.add_argument('--density', type=float, default=defaults.density,
+                            help='Fracción de la grilla aula x franja que ocupa la demanda')
+
+        parser.add_argument(
+            '--strategy',
+            action='append',
+            choices=[s.value for s in SchedulingStrategy],
+            help='Estrategia a medir (repetible); por defecto todas las disponibles'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--population-size', type=int, default=20)
+        parser.add_argument('--generations', type=int, default=20)
+
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Archivo JSON de salida (por defecto se imprime en consola)'
+        )
+        parser.add_argument(
+            '--keep-data',
+            action='store_true',
+            help='Conservar los datos sintéticos en lugar de revertir la transacción'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scale = SyntheticScale(
+                carreras=options['carreras'],
+                materias_por_carrera=options['materias'],
+                semestres=options['semestres'],
+                docentes=options['docentes'],
+                aulas=options['aulas'],
+                dias=options['dias'],
+                franjas_por_dia=options['franjas_por_dia'],
+                density=options['density'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        strategies = [SchedulingStrategy(s) for s in options['strategy']] if options['strategy'] else None
+
+        try:
+            with transaction.atomic():
+                report = run_benchmark(
+                    scale,
+                    strategies,
+                    seed=options['seed'],
+                    population_size=options['population_size'],
+                    generations=options['generations'],
+                )
+                if not options['keep_data']:
+                    transaction.set_rollback(True)
+        except Exception as e:
+            raise CommandError(f'Error ejecutando benchmark: {str(e)}')
+
+        # Claves ordenadas para que la salida sea comparable entre commits
+        output = json.dumps(report, indent=2, sort_keys=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Benchmark guardado en {options["output"]}'))
+        else:
+            self.stdout.write(output)
@@ -6,9 +6,15 @@ Usage: python manage.py generate_schedule --planificacion <id> --strategy <strat
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from apps.planificacion.models import PlanificacionAcademica
-from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.base import MAX_SEED, SchedulingStrategy
 from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+from apps.planificacion.scheduling.profiling import PROFILE_MODES
+from apps.planificacion.scheduling.history import record_run
+from apps.planificacion.scheduling.cancellation import CancellationToken
+from apps.planificacion.scheduling.checkpoint import load_checkpoint, new_run_id
+from apps.planificacion.scheduling.pareto import OBJECTIVES
 import logging
+import signal
 
 logger = logging.getLogger(__name__)
 
@@ -59,18 +65,73 @@ class Command(BaseCommand):
             help='Número de generaciones para algoritmo genético'
         )
 
+        parser.add_argument(
+            '--weights',
+            type=str,
+            default='',
+            help='Pesos del compromiso multiobjetivo, p. ej. "eficiencia_aulas=2,equilibrio=0.5"'
+        )
+
+        parser.add_argument(
+            '--checkpoint-interval',
+            type=float,
+            default=5.0,
+            help='Segundos entre checkpoints del algoritmo genético (0 para desactivar)'
+        )
+
+        parser.add_argument(
+            '--resume',
+            type=str,
+            default=None,
+            metavar='RUN_ID',
+            help='Reanudar un algoritmo genético desde su último checkpoint'
+        )
+
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Semilla para reproducir una ejecución (por defecto se genera una)'
+        )
+
         parser.add_argument(
             '--dry-run',
             action='store_true',
             help='Ejecutar simulación sin guardar cambios'
         )
 
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Ejecutar el motor aunque el análisis de factibilidad indique que el plan no cabe'
+        )
+
+        parser.add_argument(
+            '--profile',
+            type=str,
+            choices=PROFILE_MODES,
+            default=None,
+            help='Capturar un perfil de la ejecución con cProfile o pyinstrument'
+        )
+
+        parser.add_argument(
+            '--track-memory',
+            action='store_true',
+            help='Medir memoria pico por fase con tracemalloc (más lento)'
+        )
+
     def handle(self, *args, **options):
         planificacion_id = options['planificacion']
         strategy_name = options['strategy']
+        resume_id = options['resume']
         save_results = options['save']
         verbose = options['verbose']
         dry_run = options['dry_run']
+        force = options['force']
+
+        # La semilla se registra en el historial: validarla antes de ejecutar
+        if options['seed'] is not None and not 0 <= options['seed'] <= MAX_SEED:
+            raise CommandError(f"La semilla debe estar entre 0 y {MAX_SEED}: {options['seed']}")
 
         # Configurar logging
         if verbose:
@@ -90,19 +151,53 @@ class Command(BaseCommand):
                     f'actual: {planificacion.get_estado_display()}'
                 )
 
+            # Al reanudar, la configuración sale del checkpoint
+            if resume_id:
+                checkpoint = load_checkpoint(resume_id)
+                if checkpoint is None:
+                    raise CommandError(f'No existe el checkpoint {resume_id}')
+                if checkpoint.planificacion_id != planificacion.id:
+                    raise CommandError(
+                        f'El checkpoint {resume_id} pertenece a la planificación {checkpoint.planificacion_id}'
+                    )
+                strategy_name = SchedulingStrategy.GENETIC_ALGORITHM.value
+                options['seed'] = checkpoint.seed
+                options['population_size'] = checkpoint.population_size
+                options['generations'] = checkpoint.generations
+                self.stdout.write(
+                    f'Reanudando {resume_id} desde la generacion {checkpoint.generation}/{checkpoint.generations}'
+                )
+
             # Crear estrategia
             strategy = SchedulingStrategy(strategy_name)
             self.stdout.write(f'Estrategia: {strategy.value}')
 
             # Parámetros adicionales
-            engine_params = {}
+            engine_params = {'seed': options['seed']}
             if strategy == SchedulingStrategy.GENETIC_ALGORITHM:
                 engine_params['population_size'] = options['population_size']
                 engine_params['generations'] = options['generations']
+                if resume_id or options['checkpoint_interval'] > 0:
+                    engine_params['checkpoint_id'] = resume_id or new_run_id()
+                    # Con intervalo 0 solo se escribe el checkpoint al cancelar
+                    engine_params['checkpoint_interval'] = options['checkpoint_interval'] or float('inf')
+                    engine_params['resume'] = bool(resume_id)
+                    self.stdout.write(
+                        f'Checkpoint: {engine_params["checkpoint_id"]} '
+                        f'(reanudar con --resume {engine_params["checkpoint_id"]})'
+                    )
                 self.stdout.write(
                     f'Parametros GA: poblacion={engine_params["population_size"]}, '
                     f'generaciones={engine_params["generations"]}'
                 )
+            elif strategy == SchedulingStrategy.MULTI_OBJECTIVE:
+                engine_params['population_size'] = options['population_size']
+                engine_params['generations'] = options['generations']
+                engine_params['weights'] = self._parse_weights(options['weights'])
+                self.stdout.write(
+                    f'Parametros NSGA-II: poblacion={engine_params["population_size"]}, '
+                    f'generaciones={engine_params["generations"]}, pesos={engine_params["weights"] or "uniformes"}'
+                )
 
             # Crear motor de planificación
             engine = SchedulingEngineFactory.create_engine(strategy, **engine_params)
@@ -110,8 +205,27 @@ class Command(BaseCommand):
             self.stdout.write('Iniciando generacion de horarios...')
             start_time = timezone.now()
 
-            # Ejecutar planificación
-            result = engine.execute_scheduling(planificacion)
+            # Ctrl+C detiene el motor y conserva la mejor solución hasta el momento;
+            # un segundo Ctrl+C interrumpe el proceso
+            cancellation = CancellationToken(planificacion.id)
+
+            def cancel_handler(signum, frame):
+                self.stdout.write(self.style.WARNING('\nCancelando... (Ctrl+C de nuevo para abortar)'))
+                cancellation.request()
+                signal.signal(signal.SIGINT, previous_handler)
+
+            previous_handler = signal.signal(signal.SIGINT, cancel_handler)
+
+            # Ejecutar planificación (incluye el análisis de factibilidad previo)
+            try:
+                result = engine.execute_scheduling(planificacion, {
+                    'abort_if_infeasible': not force,
+                    'profile': options['profile'],
+                    'track_memory': options['track_memory'],
+                    'cancellation': cancellation,
+                })
+            finally:
+                signal.signal(signal.SIGINT, previous_handler)
 
             execution_time = (timezone.now() - start_time).total_seconds()
 
@@ -143,6 +257,18 @@ class Command(BaseCommand):
                     self.style.WARNING('Simulacion completada (no se guardaron cambios)')
                 )
 
+            # Registrar la ejecución en el historial
+            run = record_run(engine, planificacion, result, parameters={
+                **engine_params,
+                'force': force,
+                'save': bool(save_results and not dry_run),
+            })
+            self.stdout.write(f'Ejecucion registrada: #{run.id}')
+
+            # El desglose se muestra al final para incluir la fase de guardado
+            if verbose:
+                self._display_phases(result)
+
         except PlanificacionAcademica.DoesNotExist:
             raise CommandError(f'Planificación con ID {planificacion_id} no encontrada')
 
@@ -158,14 +284,21 @@ class Command(BaseCommand):
         self.stdout.write('='*50)
 
         # Estado general
-        if result.success:
+        if result.cancelled:
+            self.stdout.write(self.style.WARNING('Estado: CANCELADO (se conserva la mejor solución encontrada)'))
+        elif result.success:
             self.stdout.write(self.style.SUCCESS('Estado: EXITOSO'))
         else:
             self.stdout.write(self.style.ERROR('Estado: CON CONFLICTOS'))
 
+        # Análisis de factibilidad
+        if result.feasibility:
+            self._display_feasibility(result.feasibility)
+
         # Estadísticas básicas
         self.stdout.write(f'Tiempo de ejecucion: {execution_time:.2f} segundos')
         self.stdout.write(f'Estrategia utilizada: {result.strategy_used.value}')
+        self.stdout.write(f'Semilla: {result.seed}')
         self.stdout.write(f'Puntuacion total: {result.score:.2f}')
 
         # Asignaciones creadas
@@ -179,7 +312,7 @@ class Command(BaseCommand):
                 docente = assignment.asignacion_docente.docente.get_full_name()
                 materia = assignment.asignacion_docente.materia.nombre
                 franja = assignment.franja_horaria
-                aula = assignment.aula.codigo
+                aula = assignment.aula.codigo if assignment.aula else assignment.modalidad
                 score = assignment.score
 
                 self.stdout.write(
@@ -207,16 +340,73 @@ class Command(BaseCommand):
                 docente = unassigned.docente.get_full_name()
                 materia = unassigned.materia.nombre
                 self.stdout.write(f'   {i}. {materia} - {docente}')
+                for motivo in result.unassigned_reasons.get(unassigned.id, []):
+                    self.stdout.write(f'      - {motivo["detalle"]}')
 
             if len(result.unassigned) > 5:
                 self.stdout.write(f'   ... y {len(result.unassigned) - 5} más')
 
+        if result.pareto_front:
+            self._display_pareto_front(result.pareto_front)
+
         # Mensaje del resultado
         if result.message:
             self.stdout.write(f'\n{result.message}')
 
         self.stdout.write('='*50 + '\n')
 
+    def _display_feasibility(self, report):
+        """Muestra el resultado del análisis de factibilidad"""
+        self.stdout.write(f'Analisis de factibilidad: {report.elapsed_ms:.1f} ms')
+
+        for issue in report.issues:
+            style = self.style.ERROR if issue.blocking else self.style.WARNING
+            self.stdout.write(style(f'   [{issue.code}] {issue.message}'))
+
+        if not report.feasible:
+            self.stdout.write(self.style.ERROR('   El plan no puede completarse (use --force para ejecutar igualmente)'))
+
+    def _parse_weights(self, raw):
+        """Convierte "objetivo=peso,..." en un diccionario"""
+        weights = {}
+        for item in filter(None, (part.strip() for part in raw.split(','))):
+            name, _, value = item.partition('=')
+            if name not in OBJECTIVES:
+                raise CommandError(f'Objetivo desconocido: {name}. Disponibles: {", ".join(OBJECTIVES)}')
+            try:
+                weights[name] = float(value)
+            except ValueError:
+                raise CommandError(f'Peso inválido para {name}: {value}')
+        return weights
+
+    def _display_pareto_front(self, front):
+        """Muestra los objetivos de cada solución no dominada"""
+        self.stdout.write(f'\nFrente de Pareto: {len(front)} soluciones')
+        self.stdout.write('   ' + ' '.join(f'{name:>20}' for name in OBJECTIVES) + f' {"Violaciones":>12}')
+        for solution in front:
+            self.stdout.write(
+                '   ' + ' '.join(f'{value:20.4f}' for value in solution.objectives) + f' {solution.violations:12}'
+            )
+
+    def _display_phases(self, result):
+        """Muestra el desglose de tiempo, consultas y memoria por fase"""
+        self.stdout.write('\nDesglose por fase:')
+        self.stdout.write(
+            f'   {"Fase":28} {"Reloj (s)":>10} {"CPU (s)":>10} {"Consultas":>10} {"SQL (s)":>10} {"Pico (KB)":>10}'
+        )
+
+        for phase in result.phases:
+            peak = phase['peak_memory_kb']
+            self.stdout.write(
+                f'   {phase["name"]:28} {phase["wall_s"]:10.4f} {phase["cpu_s"]:10.4f} '
+                f'{phase["queries"]:10} {phase["query_time_s"]:10.4f} '
+                f'{peak if peak is not None else "-":>10}'
+            )
+
+        if result.profile_report:
+            self.stdout.write('\nPerfil de ejecución:')
+            self.stdout.write(result.profile_report)
+
     def _show_available_strategies(self):
         """Muestra las estrategias disponibles"""
         strategies = SchedulingEngineFactory.get_available_strategies()
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planificacion", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchedulingRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("strategy", models.CharField(max_length=30)),
+                ("parameters", models.JSONField(blank=True, default=dict)),
+                ("seed", models.PositiveBigIntegerField(blank=True, null=True)),
+                (
+                    "input_fingerprint",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Hash de asignaciones, franjas y aulas usadas como entrada",
+                        max_length=64,
+                    ),
+                ),
+                ("success", models.BooleanField(default=False)),
+                ("score", models.FloatField(default=0.0)),
+                ("execution_time", models.FloatField(default=0.0)),
+                ("phases", models.JSONField(blank=True, default=list)),
+                ("total_assignments", models.PositiveIntegerField(default=0)),
+                ("total_conflicts", models.PositiveIntegerField(default=0)),
+                ("total_unassigned", models.PositiveIntegerField(default=0)),
+                (
+                    "solution",
+                    models.BinaryField(
+                        help_text="Solución codificada con scheduling.encoding"
+                    ),
+                ),
+                ("message", models.TextField(blank=True)),
+                ("fecha_ejecucion", models.DateTimeField(auto_now_add=True)),
+                (
+                    "ejecutado_por",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ejecuciones_planificacion",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "planificacion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ejecuciones",
+                        to="planificacion.planificacionacademica",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ejecución de Planificación",
+                "verbose_name_plural": "Ejecuciones de Planificación",
+                "ordering": ["-fecha_ejecucion"],
+                "indexes": [
+                    models.Index(
+                        fields=["planificacion", "strategy", "-fecha_ejecucion"],
+                        name="planificaci_planifi_9c5b88_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planificacion", "0002_schedulingrun"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DisponibilidadDocente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[
+                            ("no_disponible", "No disponible"),
+                            ("preferida", "Preferida"),
+                        ],
+                        max_length=15,
+                    ),
+                ),
+                (
+                    "peso",
+                    models.FloatField(
+                        default=1.0,
+                        help_text="Intensidad de la preferencia (solo para franjas preferidas)",
+                    ),
+                ),
+                ("fecha_actualizacion", models.DateTimeField(auto_now=True)),
+                (
+                    "docente",
+                    models.ForeignKey(
+                        limit_choices_to={"rol": "docente"},
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="disponibilidades",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "franja_horaria",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="disponibilidades_docente",
+                        to="planificacion.franjahoraria",
+                    ),
+                ),
+                (
+                    "periodo",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="disponibilidades_docente",
+                        to="planificacion.periodo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Disponibilidad de Docente",
+                "verbose_name_plural": "Disponibilidades de Docentes",
+                "indexes": [
+                    models.Index(
+                        fields=["periodo", "docente"],
+                        name="planificaci_periodo_2824e3_idx",
+                    )
+                ],
+                "unique_together": {("docente", "periodo", "franja_horaria")},
+            },
+        ),
+    ]
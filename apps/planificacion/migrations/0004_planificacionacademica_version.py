@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planificacion", "0003_disponibilidaddocente"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planificacionacademica",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=1,
+                editable=False,
+                help_text="Aumenta con cada escritura de la planificación o de sus datos dependientes",
+            ),
+        ),
+    ]
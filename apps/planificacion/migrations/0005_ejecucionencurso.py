@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planificacion", "0004_planificacionacademica_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EjecucionEnCurso",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("iniciada", models.DateTimeField()),
+                ("cancelar", models.BooleanField(default=False)),
+                (
+                    "planificacion",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ejecucion_en_curso",
+                        to="planificacion.planificacionacademica",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ejecución en Curso",
+                "verbose_name_plural": "Ejecuciones en Curso",
+            },
+        ),
+    ]
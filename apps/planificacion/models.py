@@ -133,6 +133,11 @@ class PlanificacionAcademica(models.Model):
     creado_por = models.ForeignKey(CustomUser, on_delete=models.PROTECT, related_name='planificaciones_creadas')
     aprobado_por = models.ForeignKey(CustomUser, on_delete=models.PROTECT, null=True, blank=True, related_name='planificaciones_aprobadas')
     observaciones = models.TextField(blank=True)
+    version = models.PositiveBigIntegerField(
+        default=1,
+        editable=False,
+        help_text="Aumenta con cada escritura de la planificación o de sus datos dependientes"
+    )
 
     class Meta:
         verbose_name = 'Planificación Académica'
@@ -142,6 +147,18 @@ class PlanificacionAcademica(models.Model):
     def __str__(self):
         return f"{self.nombre} - {self.periodo}"
 
+    def save(self, *args, **kwargs):
+        # La versión se incrementa en la base de datos: una instancia desactualizada
+        # nunca la hace retroceder
+        incrementar = self.pk is not None and not self._state.adding
+        if incrementar:
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+        if incrementar:
+            self.refresh_from_db(fields=['version'])
+
     def get_total_materias(self):
         """Retorna el total de materias en la planificación"""
         return sum(carrera.materias.filter(is_activa=True).count() for carrera in self.carreras.all())
@@ -160,9 +177,99 @@ class PlanificacionAcademica(models.Model):
             PlanificacionAcademica.objects.filter(
                 periodo=self.periodo,
                 estado='vigente'
-            ).update(estado='cerrada')
+            ).update(estado='cerrada', version=models.F('version') + 1)
 
             self.estado = 'vigente'
             self.fecha_aprobacion = timezone.now()
             self.aprobado_por = usuario
             self.save()
+
+
+class SchedulingRun(models.Model):
+    """Historial de ejecuciones de los motores de planificación"""
+    planificacion = models.ForeignKey(PlanificacionAcademica, on_delete=models.CASCADE, related_name='ejecuciones')
+    strategy = models.CharField(max_length=30)
+    parameters = models.JSONField(default=dict, blank=True)
+    seed = models.PositiveBigIntegerField(null=True, blank=True)
+    input_fingerprint = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="Hash de asignaciones, franjas y aulas usadas como entrada"
+    )
+    success = models.BooleanField(default=False)
+    score = models.FloatField(default=0.0)
+    execution_time = models.FloatField(default=0.0)
+    phases = models.JSONField(default=list, blank=True)
+    total_assignments = models.PositiveIntegerField(default=0)
+    total_conflicts = models.PositiveIntegerField(default=0)
+    total_unassigned = models.PositiveIntegerField(default=0)
+    solution = models.BinaryField(help_text="Solución codificada con scheduling.encoding")
+    message = models.TextField(blank=True)
+    ejecutado_por = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='ejecuciones_planificacion')
+    fecha_ejecucion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Ejecución de Planificación'
+        verbose_name_plural = 'Ejecuciones de Planificación'
+        ordering = ['-fecha_ejecucion']
+        indexes = [
+            models.Index(fields=['planificacion', 'strategy', '-fecha_ejecucion']),
+        ]
+
+    def __str__(self):
+        return f"{self.planificacion} - {self.strategy} ({self.fecha_ejecucion:%Y-%m-%d %H:%M})"
+
+
+class DisponibilidadDocente(models.Model):
+    """
+    Franja no disponible o preferida de un docente en un periodo.
+
+    Las franjas sin registro son neutras; el motor compila estos registros en
+    bitsets y vectores de pesos (ver scheduling.availability).
+    """
+    TIPOS = [
+        ('no_disponible', 'No disponible'),
+        ('preferida', 'Preferida'),
+    ]
+
+    docente = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        limit_choices_to={'rol': 'docente'},
+        related_name='disponibilidades'
+    )
+    periodo = models.ForeignKey(Periodo, on_delete=models.CASCADE, related_name='disponibilidades_docente')
+    franja_horaria = models.ForeignKey(FranjaHoraria, on_delete=models.CASCADE, related_name='disponibilidades_docente')
+    tipo = models.CharField(max_length=15, choices=TIPOS)
+    peso = models.FloatField(default=1.0, help_text="Intensidad de la preferencia (solo para franjas preferidas)")
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Disponibilidad de Docente'
+        verbose_name_plural = 'Disponibilidades de Docentes'
+        unique_together = ['docente', 'periodo', 'franja_horaria']
+        indexes = [
+            models.Index(fields=['periodo', 'docente']),
+        ]
+
+    def __str__(self):
+        return f"{self.docente.get_full_name()} - {self.franja_horaria} ({self.get_tipo_display()})"
+
+
+class EjecucionEnCurso(models.Model):
+    """
+    Ejecución activa de un motor de planificación.
+
+    Vive en la base de datos para que el bloqueo y la cancelación se vean
+    desde cualquier proceso (gunicorn, Celery o el comando de consola)
+    """
+    planificacion = models.OneToOneField(PlanificacionAcademica, on_delete=models.CASCADE, related_name='ejecucion_en_curso')
+    iniciada = models.DateTimeField()
+    cancelar = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = 'Ejecución en Curso'
+        verbose_name_plural = 'Ejecuciones en Curso'
+
+    def __str__(self):
+        return f"{self.planificacion} ({self.iniciada:%Y-%m-%d %H:%M})"
@@ -0,0 +1,171 @@
+"""
+Caché de lectura de los endpoints de una planificación
+Las entradas se identifican por (endpoint, planificación, versión, alcance):
+toda escritura dependiente incrementa PlanificacionAcademica.version, así que
+nunca se invalida una entrada, simplemente deja de consultarse y expira
+
+La misma identidad produce un ETag fuerte: si el cliente ya tiene la versión
+vigente se responde 304 sin leer la caché ni serializar
+
+Solo usa get/set/add/incr del backend de caché de Django, por lo que
+funciona igual con locmem, file o Redis
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+import hashlib
+import logging
+from django.core.cache import cache
+from django.db.models import F, QuerySet
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from .models import PlanificacionAcademica
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_KEY = 'planificacion:respuesta:{endpoint}:{planificacion_id}:{version}:{alcance}'
+METRIC_KEY = 'planificacion:respuesta_metricas:{endpoint}:{resultado}'
+RESPONSE_TIMEOUT = 60 * 60 * 24
+
+# Endpoints cacheados, para reportar sus métricas
+ENDPOINTS = (
+    'detalle',
+    'estadisticas',
+    'estadisticas_detalle',
+    'validar',
+    'por_planificacion',
+    'matriz_horarios',
+    'matriz_horarios_compacto',
+)
+
+ALCANCE_GLOBAL = 'global'
+ALCANCE_COMPLETO = 'completo'
+ALCANCE_RESTRINGIDO = 'restringido'
+
+
+def bump_planificacion_version(planificacion_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Incrementa la versión de las planificaciones indicadas (todas si es None).
+
+    Acepta ids o un queryset de ids (``values('planificacion_id')``).
+
+    Se ejecuta dentro de la transacción de la escritura, de modo que la
+    versión nueva y los datos nuevos se confirman juntos.
+    """
+    planificaciones = PlanificacionAcademica.objects.all()
+    if isinstance(planificacion_ids, QuerySet):
+        # Subconsulta: el incremento sigue siendo un único UPDATE
+        planificaciones = planificaciones.filter(id__in=planificacion_ids)
+    elif planificacion_ids is not None:
+        ids = set(planificacion_ids)
+        if not ids:
+            return 0
+        planificaciones = planificaciones.filter(id__in=ids)
+    return planificaciones.update(version=F('version') + 1)
+
+
+def user_scope(user, planificacion: PlanificacionAcademica) -> str:
+    """
+    Alcance de lo que el usuario ve de la planificación.
+
+    Los querysets de horarios filtran por creador y estado: para una misma
+    planificación y versión cada usuario ve todos sus horarios o ninguno.
+    """
+    if (user.is_staff or planificacion.creado_por_id == user.id
+            or planificacion.estado in ('aprobada', 'vigente')):
+        return ALCANCE_COMPLETO
+    return ALCANCE_RESTRINGIDO
+
+
+def _count(endpoint: str, resultado: str) -> None:
+    key = METRIC_KEY.format(endpoint=endpoint, resultado=resultado)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except ValueError:
+        # La clave expiró o fue desalojada entre add e incr
+        cache.set(key, 1, timeout=None)
+
+
+def read_through(endpoint: str, planificacion_id: int, version: int, alcance: str,
+                 builder: Callable[[], Any]) -> Any:
+    """Retorna la respuesta cacheada o la construye y la guarda"""
+    key = RESPONSE_CACHE_KEY.format(
+        endpoint=endpoint, planificacion_id=planificacion_id, version=version, alcance=alcance
+    )
+    data = cache.get(key)
+    if data is not None:
+        _count(endpoint, 'hit')
+        return data
+
+    _count(endpoint, 'miss')
+    logger.debug(f"Caché de respuesta sin entrada: {key}")
+    data = builder()
+    cache.set(key, data, timeout=RESPONSE_TIMEOUT)
+    return data
+
+
+def planificacion_etag(endpoint: str, planificacion_id: int, version: int, alcance: str, formato: str = '') -> str:
+    """ETag fuerte de una representación; ``formato`` distingue los renderers"""
+    digest = hashlib.sha1(f"{endpoint}:{planificacion_id}:{version}:{alcance}:{formato}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Comparación débil de If-None-Match, como exige RFC 9110 para GET"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = {tag.removeprefix('W/') for tag in parse_etags(header)}
+    return '*' in etags or etag in etags
+
+
+class VersionedResponseMixin:
+    """
+    Respuestas de ViewSet cacheadas por versión de la planificación y con ETag.
+
+    La única consulta necesaria es la que obtiene la planificación con su
+    versión; con un If-None-Match vigente se responde 304 sin cuerpo.
+    """
+
+    def versioned_response(self, endpoint: str, planificacion: PlanificacionAcademica,
+                           builder: Callable[[], Any]) -> Response:
+        alcance = user_scope(self.request.user, planificacion)
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        etag = planificacion_etag(
+            endpoint, planificacion.id, planificacion.version, alcance,
+            renderer.format if renderer is not None else ''
+        )
+
+        if etag_matches(self.request, etag):
+            _count(endpoint, 'not_modified')
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(read_through(endpoint, planificacion.id, planificacion.version, alcance, builder))
+
+        response['ETag'] = etag
+        # El cliente puede guardar la respuesta pero debe revalidarla siempre
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """Aciertos, fallos, respuestas 304 y tasa de acierto por endpoint"""
+    keys = {
+        (endpoint, resultado): METRIC_KEY.format(endpoint=endpoint, resultado=resultado)
+        for endpoint in ENDPOINTS
+        for resultado in ('hit', 'miss', 'not_modified')
+    }
+    valores = cache.get_many(list(keys.values()))
+
+    metricas = {}
+    for endpoint in ENDPOINTS:
+        hits = valores.get(keys[(endpoint, 'hit')], 0)
+        misses = valores.get(keys[(endpoint, 'miss')], 0)
+        metricas[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'no_modificados': valores.get(keys[(endpoint, 'not_modified')], 0),
+            'tasa_acierto': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return metricas
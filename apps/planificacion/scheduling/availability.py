@@ -0,0 +1,144 @@
+"""
+Disponibilidad y preferencias de los docentes compiladas para el motor
+Una sola consulta por ejecución produce un bitset de franjas no disponibles y
+un vector de pesos de preferencia por docente; las consultas del motor son O(1)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from django.db import transaction
+from ..models import DisponibilidadDocente, FranjaHoraria, Periodo
+from apps.usuarios.models import CustomUser
+
+
+class DocenteAvailability:
+    """
+    Disponibilidad compilada de los docentes de una ejecución.
+
+    - ``unavailable[docente_id]``: bitset sobre ``franja_pos``
+    - ``weights[docente_id]``: peso de preferencia por posición de franja
+
+    Un docente sin franjas preferidas no tiene vector: todas sus franjas
+    disponibles son igualmente aceptables.
+    """
+
+    def __init__(self, franja_ids: Iterable[int], rows: Iterable = ()):
+        self.franja_pos: Dict[int, int] = {franja_id: pos for pos, franja_id in enumerate(franja_ids)}
+        self.unavailable: Dict[int, int] = {}
+        self.weights: Dict[int, List[float]] = {}
+
+        for docente_id, franja_id, tipo, peso in rows:
+            pos = self.franja_pos.get(franja_id)
+            if pos is None:
+                continue
+            if tipo == 'no_disponible':
+                self.unavailable[docente_id] = self.unavailable.get(docente_id, 0) | (1 << pos)
+            else:
+                vector = self.weights.get(docente_id)
+                if vector is None:
+                    vector = self.weights[docente_id] = [0.0] * len(self.franja_pos)
+                vector[pos] = peso
+
+    def is_available(self, docente_id: int, franja) -> bool:
+        pos = self.franja_pos.get(franja.id)
+        return pos is None or not (self.unavailable.get(docente_id, 0) >> pos) & 1
+
+    def has_preferences(self, docente_id: int) -> bool:
+        return docente_id in self.weights
+
+    def preference(self, docente_id: int, franja) -> float:
+        """Peso de preferencia de la franja; 0 si el docente no la marcó como preferida"""
+        vector = self.weights.get(docente_id)
+        pos = self.franja_pos.get(franja.id)
+        if vector is None or pos is None:
+            return 0.0
+        return vector[pos]
+
+    def unavailable_franjas(self, docente_id: int) -> List[int]:
+        """Ids de las franjas no disponibles de un docente"""
+        mask = self.unavailable.get(docente_id, 0)
+        return [franja_id for franja_id, pos in self.franja_pos.items() if (mask >> pos) & 1]
+
+
+def compile_availability(periodo_id: int, docente_ids: Optional[Iterable[int]] = None,
+                         franja_ids: Optional[Iterable[int]] = None) -> DocenteAvailability:
+    """Compila los registros del periodo (opcionalmente solo de algunos docentes)"""
+    if franja_ids is None:
+        franja_ids = FranjaHoraria.objects.filter(is_activa=True).order_by('id').values_list('id', flat=True)
+
+    rows = DisponibilidadDocente.objects.filter(periodo_id=periodo_id)
+    if docente_ids is not None:
+        rows = rows.filter(docente_id__in=docente_ids)
+
+    return DocenteAvailability(
+        list(franja_ids),
+        rows.values_list('docente_id', 'franja_horaria_id', 'tipo', 'peso').iterator()
+    )
+
+
+def import_disponibilidades(periodo: Periodo, registros: List[Dict[str, Any]],
+                            reemplazar: bool = False) -> Dict[str, Any]:
+    """
+    Importa disponibilidades en bloque para un periodo.
+
+    Cada registro es ``{'docente': id, 'franja_horaria': id, 'tipo': ..., 'peso': ...}``.
+    Docentes y franjas se validan con una consulta cada uno y la escritura es un
+    único bulk_create (upsert sobre docente/periodo/franja). Con ``reemplazar``
+    se eliminan antes los registros previos de los docentes importados.
+    """
+    tipos = dict(DisponibilidadDocente.TIPOS)
+    docente_ids = {r.get('docente') for r in registros}
+    franja_ids = {r.get('franja_horaria') for r in registros}
+
+    docentes_validos = set(CustomUser.objects.filter(id__in=docente_ids, rol='docente').values_list('id', flat=True))
+    franjas_validas = set(FranjaHoraria.objects.filter(id__in=franja_ids).values_list('id', flat=True))
+
+    errores = []
+    objetos = {}
+    for i, registro in enumerate(registros):
+        docente_id = registro.get('docente')
+        franja_id = registro.get('franja_horaria')
+        tipo = registro.get('tipo')
+
+        if docente_id not in docentes_validos:
+            errores.append({'registro': i, 'error': f'Docente inválido: {docente_id}'})
+        elif franja_id not in franjas_validas:
+            errores.append({'registro': i, 'error': f'Franja horaria inválida: {franja_id}'})
+        elif tipo not in tipos:
+            errores.append({'registro': i, 'error': f'Tipo inválido: {tipo}. Opciones: {list(tipos)}'})
+        else:
+            try:
+                peso = float(registro.get('peso', 1.0))
+            except (TypeError, ValueError):
+                peso = 0.0
+            if peso <= 0:
+                errores.append({'registro': i, 'error': f"Peso inválido: {registro.get('peso')}"})
+                continue
+            # Un registro repetido para la misma franja reemplaza al anterior
+            objetos[(docente_id, franja_id)] = DisponibilidadDocente(
+                docente_id=docente_id,
+                periodo=periodo,
+                franja_horaria_id=franja_id,
+                tipo=tipo,
+                peso=peso
+            )
+
+    if errores:
+        return {'importados': 0, 'eliminados': 0, 'errores': errores}
+
+    eliminados = 0
+    with transaction.atomic():
+        if reemplazar:
+            eliminados, _ = DisponibilidadDocente.objects.filter(
+                periodo=periodo,
+                docente_id__in=docentes_validos
+            ).delete()
+
+        DisponibilidadDocente.objects.bulk_create(
+            objetos.values(),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['docente', 'periodo', 'franja_horaria'],
+            update_fields=['tipo', 'peso', 'fecha_actualizacion']
+        )
+
+    return {'importados': len(objetos), 'eliminados': eliminados, 'errores': []}
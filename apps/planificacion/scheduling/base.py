@@ -5,18 +5,43 @@ Arquitectura extensible para diferentes estrategias de asignación
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
+import random
 from django.db import transaction
 from django.utils import timezone
 from ..models import PlanificacionAcademica, FranjaHoraria, Materia
 from apps.asignaciones.models import AsignacionDocente, HorarioClase, ConflictoHorario
+from apps.asignaciones.conflicts import (
+    bulk_create_horarios,
+    delete_horarios,
+    suspend_conflict_tracking,
+    sync_planificacion_conflicts,
+)
 from apps.aulas.models import Aula
 from apps.usuarios.models import CustomUser
+from .index import OccupancyIndex
+from .feasibility import FeasibilityAnalyzer, FeasibilityReport
+from .profiling import PhaseProfiler
+from .cancellation import CancellationToken
+from .travel import TravelModel, TravelTimeIndex
+from .availability import DocenteAvailability, compile_availability
+from .explain import UnassignmentExplainer
 
 logger = logging.getLogger(__name__)
 
+# Las semillas se registran en SchedulingRun.seed (PositiveBigIntegerField)
+MAX_SEED = 2 ** 63 - 1
+
+
+def parse_seed(value) -> int:
+    """Convierte una semilla recibida del usuario; ValueError si no cabe en el historial"""
+    seed = int(value)
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f"La semilla debe estar entre 0 y {MAX_SEED}: {value}")
+    return seed
+
 
 class SchedulingStrategy(Enum):
     """Estrategias de planificación disponibles"""
@@ -25,6 +50,7 @@ class SchedulingStrategy(Enum):
     BALANCED_DISTRIBUTION = "balanced_distribution"
     PREREQUISITE_BASED = "prerequisite_based"
     MIXED_MODALITY = "mixed_modality"
+    MULTI_OBJECTIVE = "multi_objective"
     GENETIC_ALGORITHM = "genetic_algorithm"
 
 
@@ -46,13 +72,28 @@ class SchedulingConstraint:
         """Valida si la asignación cumple esta restricción"""
         raise NotImplementedError
 
+    def prepare(self, engine: 'BaseSchedulingEngine'):
+        """
+        Recibe los datos compilados de la ejecución: al inicio (p. ej. disponibilidad
+        docente) y de nuevo cuando el motor construye su índice de ocupación
+        """
+        pass
+
+    def reset(self):
+        """Reinicia el estado interno antes de validar un nuevo conjunto de asignaciones"""
+        pass
+
+    def commit(self, assignment: 'SchedulingAssignment'):
+        """Registra una asignación aceptada (solo para restricciones con estado)"""
+        pass
+
 
 @dataclass
 class SchedulingAssignment:
     """Representa una asignación de horario"""
     asignacion_docente: AsignacionDocente
     franja_horaria: FranjaHoraria
-    aula: Aula
+    aula: Optional[Aula]  # None para secciones virtuales
     capacidad_estudiantes: int
     modalidad: str = 'presencial'
     score: float = 0.0  # Puntuación de calidad de la asignación
@@ -69,14 +110,40 @@ class SchedulingResult:
     execution_time: float
     strategy_used: SchedulingStrategy
     message: str = ""
+    feasibility: Optional[FeasibilityReport] = None
+    seed: Optional[int] = None
+    # Métricas por fase (ver profiling.PhaseProfiler) y salida del perfilador opcional
+    phases: List[Dict[str, Any]] = field(default_factory=list)
+    profile_report: str = ""
+    cancelled: bool = False
+    # Soluciones no dominadas (pareto.ParetoSolution) de los motores multiobjetivo
+    pareto_front: List[Any] = field(default_factory=list)
+    # Motivos por asignación no colocada: {asignacion_id: [{'codigo', 'detalle'}]}
+    unassigned_reasons: Dict[int, List[Dict[str, str]]] = field(default_factory=dict)
 
 
 class BaseSchedulingEngine(ABC):
     """Clase base para motores de planificación automática"""
 
-    def __init__(self, strategy: SchedulingStrategy):
+    def __init__(self, strategy: SchedulingStrategy, seed: Optional[int] = None):
         self.strategy = strategy
+        # Sin semilla explícita se genera una para que la ejecución sea reproducible
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
         self.constraints: List[SchedulingConstraint] = []
+        self.occupancy: Optional[OccupancyIndex] = None
+        # Franjas y aulas cargadas por el motor, reutilizadas para explicar lo no asignado
+        self.franjas: Optional[List[FranjaHoraria]] = None
+        self.aulas: Optional[List[Aula]] = None
+        self.profiler = PhaseProfiler()
+        self.cancellation: Optional[CancellationToken] = None
+        self.pareto_front: List[Any] = []
+        # Matriz de desplazamiento de la ejecución y penalización por minuto de retraso
+        self.travel_model: Optional[TravelModel] = None
+        self.travel_penalty_per_minute = 2.0
+        # Disponibilidad y preferencias de los docentes compiladas al inicio de cada ejecución
+        self.availability: Optional[DocenteAvailability] = None
+        self.preference_bonus_per_weight = 20.0
         self.setup_default_constraints()
 
     def setup_default_constraints(self):
@@ -87,11 +154,13 @@ class BaseSchedulingEngine(ABC):
             AulaAvailabilityConstraint(),
             CapacityConstraint(),
             TimeConflictConstraint(),
+            StudentCohortConstraint(),
 
             # Restricciones suaves (preferencias)
             DocentePreferenceConstraint(),
             AulaTypeMatchConstraint(),
             DistributionBalanceConstraint(),
+            TravelTimeConstraint(),
         ]
 
     @abstractmethod
@@ -99,6 +168,109 @@ class BaseSchedulingEngine(ABC):
         """Genera asignaciones de horario para una planificación"""
         pass
 
+    def create_feasibility_analyzer(self) -> FeasibilityAnalyzer:
+        """Analizador de factibilidad acorde a las reglas de colocación del motor"""
+        return FeasibilityAnalyzer()
+
+    def build_occupancy_index(self, franjas: List[FranjaHoraria],
+                              asignaciones: List[AsignacionDocente],
+                              aulas: Optional[List[Aula]] = None) -> OccupancyIndex:
+        """
+        Crea el índice de ocupación compartido para una ejecución del motor.
+
+        Con ``aulas`` también se precalcula el modelo de desplazamiento y el
+        índice mantiene la ubicación de cada docente para ``travel_penalty``.
+        """
+        self.occupancy = OccupancyIndex(franjas, asignaciones)
+        self.apply_availability(self.occupancy)
+        self.franjas = franjas
+        if aulas is not None:
+            self.aulas = aulas
+            self.travel_model = TravelModel(franjas, aulas)
+            self.occupancy.travel = TravelTimeIndex(self.travel_model)
+        self.prepare_constraints()
+        return self.occupancy
+
+    def prepare_constraints(self):
+        """Entrega a las restricciones los datos compilados de la ejecución"""
+        for constraint in self.constraints:
+            constraint.prepare(self)
+
+    def apply_availability(self, occupancy: OccupancyIndex) -> OccupancyIndex:
+        """Marca como ocupadas las franjas no disponibles de cada docente"""
+        if self.availability is not None:
+            for docente_id in self.availability.unavailable:
+                occupancy.block_docente(docente_id, self.availability.unavailable_franjas(docente_id))
+        return occupancy
+
+    def preference_bonus(self, assignment: SchedulingAssignment) -> float:
+        """Bonificación O(1) por colocar la clase en una franja preferida del docente"""
+        if self.availability is None:
+            return 0.0
+        peso = self.availability.preference(assignment.asignacion_docente.docente_id, assignment.franja_horaria)
+        return self.preference_bonus_per_weight * peso
+
+    def soft_adjustment(self, assignment: SchedulingAssignment) -> float:
+        """Ajuste del puntaje de un candidato: preferencia del docente menos desplazamiento"""
+        return self.preference_bonus(assignment) - self.travel_penalty(assignment)
+
+    def explain_unassigned(self, unassigned: List[AsignacionDocente], assignments: List[SchedulingAssignment],
+                           rejected: Dict[int, List[str]]) -> Dict[int, List[Dict[str, str]]]:
+        """
+        Motivos de cada asignación no colocada según la ocupación final.
+
+        El índice se reconstruye en memoria a partir de las asignaciones
+        aceptadas, con las mismas reglas de capacidad que el motor.
+        """
+        if not unassigned:
+            return {}
+
+        if self.franjas is None or self.aulas is None:
+            return {
+                asignacion.id: [{'codigo': 'sin_datos', 'detalle': 'El motor no registró franjas ni aulas'}]
+                for asignacion in unassigned
+            }
+
+        occupancy = self.apply_availability(OccupancyIndex(
+            self.franjas, [a.asignacion_docente for a in assignments] + list(unassigned)
+        ))
+        for assignment in assignments:
+            occupancy.reserve(assignment)
+
+        analyzer = self.create_feasibility_analyzer()
+        explainer = UnassignmentExplainer(
+            occupancy, self.franjas, self.aulas,
+            capacity_estimator=analyzer.capacity_estimator,
+            allow_virtual=analyzer.allow_virtual,
+            unavailable=self.availability.unavailable_franjas if self.availability else None
+        )
+        return {
+            asignacion.id: [reason.to_dict() for reason in explainer.explain(asignacion, rejected.get(asignacion.id))]
+            for asignacion in unassigned
+        }
+
+    def travel_penalty(self, assignment: SchedulingAssignment) -> float:
+        """Penalización O(1) por el retraso del docente respecto a sus clases consecutivas ya colocadas"""
+        if self.occupancy is None or self.occupancy.travel is None:
+            return 0.0
+        minutos = self.occupancy.travel.lateness(
+            assignment.asignacion_docente.docente_id, assignment.franja_horaria, assignment.aula
+        )
+        return self.travel_penalty_per_minute * minutos if minutos > 0 else 0.0
+
+    def _estimate_capacity_needed(self, asignacion: AsignacionDocente) -> int:
+        """Estima la capacidad de estudiantes necesaria"""
+        # Lógica básica - se puede mejorar con datos históricos
+        base_capacity = 25
+
+        # Ajustar según el semestre de la materia
+        if asignacion.materia.semestre <= 2:
+            return base_capacity + 10  # Semestres iniciales más concurridos
+        elif asignacion.materia.semestre >= 7:
+            return base_capacity - 5   # Semestres avanzados menos concurridos
+
+        return base_capacity
+
     def validate_assignment(self, assignment: SchedulingAssignment) -> Tuple[bool, List[str]]:
         """Valida una asignación contra todas las restricciones"""
         is_valid = True
@@ -125,46 +297,137 @@ class BaseSchedulingEngine(ABC):
 
         return score
 
+    def should_stop(self) -> bool:
+        """Los motores lo consultan entre colocaciones o generaciones"""
+        return self.cancellation is not None and self.cancellation.is_cancelled()
+
+    def phase(self, name: str):
+        """Mide un bloque del motor como fase (p. ej. la carga de datos dentro de generate)"""
+        return self.profiler.phase(name)
+
     def execute_scheduling(self, planificacion: PlanificacionAcademica,
                           parameters: Dict[str, Any] = None) -> SchedulingResult:
         """Ejecuta el proceso completo de planificación"""
-        start_time = timezone.now()
         parameters = parameters or {}
+        self.pareto_front = []
+        self.profiler = PhaseProfiler(
+            track_memory=parameters.get('track_memory', False),
+            capture=parameters.get('profile')
+        )
+
+        self.cancellation = parameters.get('cancellation') or CancellationToken(planificacion.id)
+        self.cancellation.start()
+        try:
+            with self.profiler.session():
+                result = self._execute_scheduling(planificacion, parameters)
+        finally:
+            self.cancellation.finish()
+
+        # Una ejecución cancelada conserva lo colocado hasta el momento
+        if self.cancellation.cancelled:
+            result.cancelled = True
+            result.success = False
+            result.message = f"Cancelada por el usuario. {result.message}"
+            logger.info(f"Planificación {planificacion.id} cancelada: {len(result.assignments)} asignaciones conservadas")
+
+        result.pareto_front = list(self.pareto_front)
+        result.phases = self.profiler.to_list()
+        result.profile_report = self.profiler.report
+        return result
+
+    def _execute_scheduling(self, planificacion: PlanificacionAcademica,
+                            parameters: Dict[str, Any]) -> SchedulingResult:
+        start_time = timezone.now()
+        self.rng.seed(self.seed)
+        self.travel_model = None
+        self.franjas = self.aulas = None
+
+        with self.phase('availability'):
+            self.availability = compile_availability(
+                planificacion.periodo_id,
+                docente_ids=AsignacionDocente.objects.filter(
+                    planificacion=planificacion,
+                    is_activa=True
+                ).values('docente_id')
+            )
+        for constraint in self.constraints:
+            constraint.reset()
+        self.prepare_constraints()
 
         try:
             logger.info(f"Iniciando planificación automática con estrategia: {self.strategy.value}")
 
+            # Verificación rápida de factibilidad antes de resolver
+            feasibility = None
+            if parameters.get('check_feasibility', True):
+                with self.phase('feasibility'):
+                    feasibility = self.create_feasibility_analyzer().analyze(planificacion)
+                logger.info(f"Análisis de factibilidad en {feasibility.elapsed_ms} ms: {feasibility.summary()}")
+
+                if not feasibility.feasible and parameters.get('abort_if_infeasible', True):
+                    return SchedulingResult(
+                        success=False,
+                        assignments=[],
+                        conflicts=[],
+                        unassigned=list(AsignacionDocente.objects.filter(
+                            planificacion=planificacion,
+                            is_activa=True
+                        ).select_related('docente', 'materia')),
+                        score=0.0,
+                        execution_time=(timezone.now() - start_time).total_seconds(),
+                        strategy_used=self.strategy,
+                        message=f"Planificación infactible: {feasibility.summary()}",
+                        feasibility=feasibility,
+                        seed=self.seed
+                    )
+
             # Generar asignaciones
-            assignments = self.generate_assignments(planificacion)
+            with self.phase('generate'):
+                assignments = self.generate_assignments(planificacion)
 
             # Validar asignaciones
             valid_assignments = []
             conflicts = []
-
-            for assignment in assignments:
-                is_valid, violations = self.validate_assignment(assignment)
-                if is_valid:
+            rejected: Dict[int, List[str]] = {}
+
+            with self.phase('validate'):
+                for constraint in self.constraints:
+                    constraint.reset()
+
+                for assignment in assignments:
+                    is_valid, violations = self.validate_assignment(assignment)
+                    if is_valid:
+                        valid_assignments.append(assignment)
+                        for constraint in self.constraints:
+                            constraint.commit(assignment)
+                    else:
+                        rejected[assignment.asignacion_docente.id] = violations
+                        # Crear registro de conflicto
+                        conflict = ConflictoHorario(
+                            planificacion=planificacion,
+                            tipo='algoritmo_asignacion',
+                            descripcion=f"Violaciones: {'; '.join(violations)}"
+                        )
+                        conflicts.append(conflict)
+
+            # Con todas las asignaciones registradas en commit, las restricciones
+            # suaves con estado (desplazamiento) evalúan el horario completo
+            with self.phase('score'):
+                for assignment in valid_assignments:
                     assignment.score = self.calculate_assignment_score(assignment)
-                    valid_assignments.append(assignment)
-                else:
-                    # Crear registro de conflicto
-                    conflict = ConflictoHorario(
-                        planificacion=planificacion,
-                        tipo='algoritmo_asignacion',
-                        descripcion=f"Violaciones: {'; '.join(violations)}"
-                    )
-                    conflicts.append(conflict)
 
-            # Identificar asignaciones no realizadas
-            assigned_docente_ids = {a.asignacion_docente.id for a in valid_assignments}
-            all_asignaciones = AsignacionDocente.objects.filter(
-                planificacion=planificacion,
-                is_activa=True
-            )
-            unassigned = [a for a in all_asignaciones if a.id not in assigned_docente_ids]
+                # Calcular puntuación total
+                total_score = sum(a.score for a in valid_assignments)
 
-            # Calcular puntuación total
-            total_score = sum(a.score for a in valid_assignments)
+            # Identificar asignaciones no realizadas
+            with self.phase('unassigned'):
+                assigned_docente_ids = {a.asignacion_docente.id for a in valid_assignments}
+                all_asignaciones = AsignacionDocente.objects.filter(
+                    planificacion=planificacion,
+                    is_activa=True
+                ).select_related('docente', 'materia')
+                unassigned = [a for a in all_asignaciones if a.id not in assigned_docente_ids]
+                unassigned_reasons = self.explain_unassigned(unassigned, valid_assignments, rejected)
 
             execution_time = (timezone.now() - start_time).total_seconds()
 
@@ -176,7 +439,10 @@ class BaseSchedulingEngine(ABC):
                 score=total_score,
                 execution_time=execution_time,
                 strategy_used=self.strategy,
-                message=f"Generadas {len(valid_assignments)} asignaciones, {len(conflicts)} conflictos"
+                message=f"Generadas {len(valid_assignments)} asignaciones, {len(conflicts)} conflictos",
+                feasibility=feasibility,
+                seed=self.seed,
+                unassigned_reasons=unassigned_reasons
             )
 
         except Exception as e:
@@ -191,30 +457,45 @@ class BaseSchedulingEngine(ABC):
                 score=0.0,
                 execution_time=execution_time,
                 strategy_used=self.strategy,
-                message=f"Error: {str(e)}"
+                message=f"Error: {str(e)}",
+                seed=self.seed
             )
 
-    @transaction.atomic
     def save_scheduling_result(self, planificacion: PlanificacionAcademica,
-                             result: SchedulingResult) -> bool:
+                               result: SchedulingResult) -> bool:
         """Guarda el resultado de la planificación en la base de datos"""
+        profiler = PhaseProfiler()
+        with profiler.phase('persist'):
+            saved = self._save_scheduling_result(planificacion, result)
+        result.phases.extend(profiler.to_list())
+        return saved
+
+    @transaction.atomic
+    def _save_scheduling_result(self, planificacion: PlanificacionAcademica,
+                                result: SchedulingResult) -> bool:
         try:
-            # Limpiar horarios existentes si es necesario
-            if result.success:
-                HorarioClase.objects.filter(
-                    asignacion_docente__planificacion=planificacion
-                ).delete()
-
-            # Guardar asignaciones válidas
-            for assignment in result.assignments:
-                HorarioClase.objects.create(
-                    asignacion_docente=assignment.asignacion_docente,
-                    franja_horaria=assignment.franja_horaria,
-                    aula=assignment.aula,
-                    capacidad_estudiantes=assignment.capacidad_estudiantes,
-                    modalidad=assignment.modalidad,
-                    observaciones=f"Generado automáticamente - Estrategia: {self.strategy.value} - Score: {assignment.score:.2f}"
-                )
+            # Escritura masiva: los conflictos se concilian una sola vez al final;
+            # las rutas masivas igualmente versionan la planificación
+            with suspend_conflict_tracking():
+                # Limpiar horarios existentes si es necesario
+                if result.success:
+                    delete_horarios(HorarioClase.objects.filter(
+                        asignacion_docente__planificacion=planificacion
+                    ))
+
+                # Guardar asignaciones válidas
+                bulk_create_horarios([
+                    HorarioClase(
+                        asignacion_docente=assignment.asignacion_docente,
+                        franja_horaria=assignment.franja_horaria,
+                        aula=assignment.aula,
+                        capacidad_estudiantes=assignment.capacidad_estudiantes,
+                        modalidad=assignment.modalidad,
+                        observaciones=f"Generado automáticamente - Estrategia: {self.strategy.value} - Score: {assignment.score:.2f}"
+                    )
+                    for assignment in result.assignments
+                ])
+            sync_planificacion_conflicts(planificacion.id)
 
             # Guardar conflictos
             for conflict in result.conflicts:
@@ -240,11 +521,19 @@ class DocenteAvailabilityConstraint(SchedulingConstraint):
             weight=1.0,
             description="El docente debe estar disponible en la franja horaria"
         )
+        self.availability: Optional[DocenteAvailability] = None
+
+    def prepare(self, engine: 'BaseSchedulingEngine'):
+        self.availability = engine.availability
 
     def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
-        # Verificar que el docente no tenga otro horario en la misma franja
+        docente = assignment.asignacion_docente.docente
+        if self.availability is not None and not self.availability.is_available(docente.id, assignment.franja_horaria):
+            return False, f"Docente {docente.get_full_name()} no está disponible en {assignment.franja_horaria}"
+
+        # Verificar que el docente no tenga otro horario en la misma franja (índice docente/franja activa)
         conflictos = HorarioClase.objects.filter(
-            asignacion_docente__docente=assignment.asignacion_docente.docente,
+            docente_id=docente.id,
             franja_horaria=assignment.franja_horaria,
             is_activa=True
         ).exists()
@@ -267,6 +556,10 @@ class AulaAvailabilityConstraint(SchedulingConstraint):
         )
 
     def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
+        # Las secciones virtuales no ocupan aula
+        if assignment.aula is None:
+            return True, ""
+
         # Verificar que el aula no esté ocupada
         conflictos = HorarioClase.objects.filter(
             aula=assignment.aula,
@@ -295,6 +588,9 @@ class CapacityConstraint(SchedulingConstraint):
         )
 
     def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
+        if assignment.aula is None:
+            return True, ""
+
         if assignment.capacidad_estudiantes > assignment.aula.capacidad:
             return False, f"Capacidad requerida ({assignment.capacidad_estudiantes}) excede capacidad del aula ({assignment.aula.capacidad})"
 
@@ -318,6 +614,32 @@ class TimeConflictConstraint(SchedulingConstraint):
         return True, ""
 
 
+class StudentCohortConstraint(SchedulingConstraint):
+    """Restricción de cruce de horarios para una cohorte de estudiantes"""
+
+    def __init__(self):
+        super().__init__(
+            name="Conflicto Estudiantes",
+            type=ConstraintType.HARD,
+            weight=1.0,
+            description="Dos materias de la misma carrera y semestre no pueden coincidir en una franja"
+        )
+        self.index = OccupancyIndex()
+
+    def reset(self):
+        self.index = OccupancyIndex()
+
+    def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
+        if not self.index.cohort_free(assignment.asignacion_docente, assignment.franja_horaria):
+            materia = assignment.asignacion_docente.materia
+            return False, f"Otra materia del semestre {materia.semestre} de la carrera ya tiene clase en {assignment.franja_horaria}"
+
+        return True, ""
+
+    def commit(self, assignment: SchedulingAssignment):
+        self.index.reserve_cohort(assignment.asignacion_docente, assignment.franja_horaria)
+
+
 class DocentePreferenceConstraint(SchedulingConstraint):
     """Restricción suave de preferencias del docente"""
 
@@ -328,11 +650,22 @@ class DocentePreferenceConstraint(SchedulingConstraint):
             weight=0.3,
             description="Preferencias de horario del docente"
         )
+        self.availability: Optional[DocenteAvailability] = None
+
+    def prepare(self, engine: 'BaseSchedulingEngine'):
+        self.availability = engine.availability
 
     def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
-        # Aquí se pueden implementar preferencias específicas
-        # Por ahora, asumimos que todas las franjas son igualmente preferibles
-        return True, "Preferencias respetadas"
+        docente_id = assignment.asignacion_docente.docente_id
+
+        # Sin preferencias registradas todas las franjas son igualmente preferibles
+        if self.availability is None or not self.availability.has_preferences(docente_id):
+            return True, "Sin preferencias registradas"
+
+        if self.availability.preference(docente_id, assignment.franja_horaria) > 0:
+            return True, "Preferencias respetadas"
+
+        return False, f"{assignment.franja_horaria} no es una franja preferida del docente"
 
 
 class AulaTypeMatchConstraint(SchedulingConstraint):
@@ -347,6 +680,9 @@ class AulaTypeMatchConstraint(SchedulingConstraint):
         )
 
     def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
+        if assignment.aula is None:
+            return True, "Sección virtual"
+
         materia = assignment.asignacion_docente.materia
         aula_tipo = assignment.aula.tipo.nombre.lower()
         materia_nombre = materia.nombre.lower()
@@ -375,4 +711,40 @@ class DistributionBalanceConstraint(SchedulingConstraint):
         # Lógica para evaluar si la distribución está equilibrada
         # Por ahora retornamos True, pero aquí se puede implementar
         # análisis de distribución por días, docentes, etc.
-        return True, "Distribución aceptable"
\ No newline at end of file
+        return True, "Distribución aceptable"
+
+class TravelTimeConstraint(SchedulingConstraint):
+    """Restricción suave de tiempo de desplazamiento entre clases consecutivas del docente"""
+
+    def __init__(self):
+        super().__init__(
+            name="Tiempo de Desplazamiento",
+            type=ConstraintType.SOFT,
+            weight=0.3,
+            description="El docente debe alcanzar a llegar entre franjas consecutivas en edificios o pisos distintos"
+        )
+        self.index: Optional[TravelTimeIndex] = None
+
+    def prepare(self, engine: 'BaseSchedulingEngine'):
+        # Mismo modelo con el que el motor puntúa los candidatos (ver build_occupancy_index)
+        self.index = TravelTimeIndex(engine.travel_model) if engine.travel_model is not None else None
+
+    def reset(self):
+        if self.index is not None:
+            self.index.clear()
+
+    def validate(self, assignment: SchedulingAssignment) -> Tuple[bool, str]:
+        if self.index is None:
+            return True, ""
+
+        minutos = self.index.lateness(
+            assignment.asignacion_docente.docente_id, assignment.franja_horaria, assignment.aula
+        )
+        if minutos > 0:
+            return False, f"El docente llegaría {minutos} min tarde a su clase consecutiva"
+
+        return True, ""
+
+    def commit(self, assignment: SchedulingAssignment):
+        if self.index is not None:
+            self.index.reserve(assignment)
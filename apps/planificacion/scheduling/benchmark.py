@@ -0,0 +1,227 @@
+"""
+Generador de instituciones sintéticas y banco de pruebas de rendimiento
+para los motores de planificación
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import date, time
+from typing import Any, Dict, Iterator, List, Optional
+import random
+import time as timer
+import tracemalloc
+import uuid
+from django.db import connection
+from django.db.models import Q
+from ..models import Carrera, Periodo, Materia, FranjaHoraria, PlanificacionAcademica
+from apps.asignaciones.models import AsignacionDocente
+from apps.aulas.models import Aula, TipoAula
+from apps.usuarios.models import CustomUser
+from .base import SchedulingStrategy
+from .profiling import _QueryCounter
+from .strategies import SchedulingEngineFactory
+
+DIAS = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado']
+# Bloques de dos horas entre las 7:00 y las 21:00
+MAX_FRANJAS_POR_DIA = 7
+
+
+@dataclass
+class SyntheticScale:
+    """Dimensiones de la institución sintética"""
+    carreras: int = 2
+    materias_por_carrera: int = 20
+    semestres: int = 8
+    docentes: int = 20
+    aulas: int = 10
+    dias: int = 5
+    franjas_por_dia: int = 6
+    # Fracción de la grilla aula x franja que la demanda intenta ocupar
+    density: float = 0.6
+
+    def __post_init__(self):
+        # La grilla debe crearse completa: densidad y totales se derivan de ella
+        if not 1 <= self.dias <= len(DIAS):
+            raise ValueError(f"dias debe estar entre 1 y {len(DIAS)}: {self.dias}")
+        if not 1 <= self.franjas_por_dia <= MAX_FRANJAS_POR_DIA:
+            raise ValueError(f"franjas_por_dia debe estar entre 1 y {MAX_FRANJAS_POR_DIA}: {self.franjas_por_dia}")
+
+    @property
+    def total_franjas(self) -> int:
+        return self.dias * self.franjas_por_dia
+
+
+def generate_synthetic_institution(scale: SyntheticScale, seed: int = 0) -> PlanificacionAcademica:
+    """
+    Crea una institución sintética con bulk_create y retorna su planificación.
+
+    No modifica franjas ni aulas existentes salvo activar las franjas cuyo
+    horario coincide con el sintético; para que los motores solo vean los
+    datos generados use ``synthetic_institution``.
+    """
+    rng = random.Random(seed)
+    tag = uuid.uuid4().hex[:4]
+
+    creador = CustomUser.objects.create(username=f'bench_{tag}', rol='administrador')
+    docentes = CustomUser.objects.bulk_create([
+        CustomUser(username=f'bench_{tag}_d{i}', first_name='Docente', last_name=f'{i:04d}', rol='docente')
+        for i in range(scale.docentes)
+    ])
+
+    carreras = Carrera.objects.bulk_create([
+        Carrera(codigo=f'B{tag}{c:02d}', nombre=f'Carrera sintética {c}')
+        for c in range(scale.carreras)
+    ])
+
+    materias = Materia.objects.bulk_create([
+        Materia(
+            codigo=f'B{tag}{c:02d}{m:03d}',
+            nombre=f'{"Laboratorio" if m % 5 == 0 else "Materia"} {c}-{m}',
+            semestre=1 + m % scale.semestres,
+            horas_semanales=rng.choice([2, 4, 4, 6]),
+            carrera=carrera,
+        )
+        for c, carrera in enumerate(carreras)
+        for m in range(scale.materias_por_carrera)
+    ])
+
+    # Franjas de dos horas desde las 7:00; se reutilizan las existentes con el mismo horario
+    claves = [
+        (DIAS[d], time(7 + 2 * f), time(9 + 2 * f))
+        for d in range(scale.dias)
+        for f in range(scale.franjas_por_dia)
+    ]
+    FranjaHoraria.objects.bulk_create([
+        FranjaHoraria(nombre=f'Bloque {i + 1}', dia_semana=dia, hora_inicio=inicio, hora_fin=fin,
+                      duracion_minutos=120)
+        for i, (dia, inicio, fin) in enumerate(claves)
+    ], ignore_conflicts=True)
+    activas = Q()
+    for dia, inicio, fin in claves:
+        activas |= Q(dia_semana=dia, hora_inicio=inicio, hora_fin=fin)
+    FranjaHoraria.objects.filter(activas).update(is_activa=True)
+
+    tipos = [
+        TipoAula.objects.get_or_create(nombre='Magistral')[0],
+        TipoAula.objects.get_or_create(nombre='Laboratorio')[0],
+    ]
+    Aula.objects.bulk_create([
+        Aula(
+            codigo=f'B{tag}-{a:03d}',
+            nombre=f'Aula sintética {a}',
+            tipo=tipos[1] if a % 4 == 0 else tipos[0],
+            capacidad=rng.choice([20, 30, 35, 40, 60]),
+            piso=a % 4,
+            edificio=f'Bloque {a % 3}',
+        )
+        for a in range(scale.aulas)
+    ])
+
+    periodo, _ = Periodo.objects.get_or_create(
+        anio=2999, numero=1, tipo='semestre',
+        defaults={'nombre': 'Benchmark', 'fecha_inicio': date(2999, 1, 1), 'fecha_fin': date(2999, 6, 30)}
+    )
+    planificacion = PlanificacionAcademica.objects.create(
+        nombre=f'Benchmark {tag}', periodo=periodo, creado_por=creador
+    )
+    planificacion.carreras.set(carreras)
+
+    # Demanda proporcional a la grilla; pares docente-materia únicos
+    total = int(scale.density * scale.aulas * scale.total_franjas)
+    usados = set()
+    asignaciones = []
+    for i in range(total):
+        materia = materias[i % len(materias)]
+        offset = i + i // len(materias)
+        for intento in range(len(docentes)):
+            docente = docentes[(offset + intento) % len(docentes)]
+            if (docente.id, materia.id) not in usados:
+                usados.add((docente.id, materia.id))
+                asignaciones.append(AsignacionDocente(
+                    docente=docente,
+                    materia=materia,
+                    planificacion=planificacion,
+                    carga_horaria_semanal=materia.horas_semanales,
+                ))
+                break
+    AsignacionDocente.objects.bulk_create(asignaciones)
+
+    return planificacion
+
+
+@contextmanager
+def synthetic_institution(scale: SyntheticScale, seed: int = 0) -> Iterator[PlanificacionAcademica]:
+    """
+    Genera la institución sintética aislada del catálogo real.
+
+    Los motores leen todas las franjas activas y aulas disponibles, así que
+    las reales se ocultan durante el bloque; al salir, aun con error, se
+    restaura exactamente el estado previo y se ocultan las sintéticas.
+    """
+    franjas_activas = list(FranjaHoraria.objects.filter(is_activa=True).values_list('id', flat=True))
+    aulas_disponibles = list(Aula.objects.filter(is_disponible=True).values_list('id', flat=True))
+
+    try:
+        FranjaHoraria.objects.filter(id__in=franjas_activas).update(is_activa=False)
+        Aula.objects.filter(id__in=aulas_disponibles).update(is_disponible=False)
+        yield generate_synthetic_institution(scale, seed)
+    finally:
+        FranjaHoraria.objects.filter(is_activa=True).exclude(id__in=franjas_activas).update(is_activa=False)
+        FranjaHoraria.objects.filter(id__in=franjas_activas).update(is_activa=True)
+        Aula.objects.filter(is_disponible=True).exclude(id__in=aulas_disponibles).update(is_disponible=False)
+        Aula.objects.filter(id__in=aulas_disponibles).update(is_disponible=True)
+
+
+def benchmark_strategy(planificacion: PlanificacionAcademica, strategy: SchedulingStrategy,
+                       seed: int = 0, **engine_params) -> Dict[str, Any]:
+    """Ejecuta una estrategia y mide tiempo, memoria pico y consultas"""
+    engine = SchedulingEngineFactory.create_engine(strategy, seed=seed, **engine_params)
+
+    # Contador propio por estrategia: no depende de DEBUG ni tiene límite de consultas
+    queries = _QueryCounter()
+    tracemalloc.start()
+    start = timer.perf_counter()
+    with connection.execute_wrapper(queries):
+        result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+    runtime = timer.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'strategy': strategy.value,
+        'success': result.success,
+        'runtime_s': round(runtime, 4),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'queries': queries.count,
+        'query_time_s': round(queries.elapsed, 4),
+        'score': round(result.score, 4),
+        'assignments': len(result.assignments),
+        'unassigned': len(result.unassigned),
+        'conflicts': len(result.conflicts),
+        'seed': result.seed,
+        'phases': result.phases,
+    }
+
+
+def run_benchmark(scale: SyntheticScale, strategies: Optional[List[SchedulingStrategy]] = None,
+                  seed: int = 0, **engine_params) -> Dict[str, Any]:
+    """Genera la institución y ejecuta cada estrategia sobre ella"""
+    if strategies is None:
+        strategies = [
+            SchedulingStrategy(s['key']) for s in SchedulingEngineFactory.get_available_strategies()
+        ]
+
+    start = timer.perf_counter()
+    with synthetic_institution(scale, seed) as planificacion:
+        setup_time = timer.perf_counter() - start
+
+        return {
+            'scale': asdict(scale),
+            'seed': seed,
+            'asignaciones': planificacion.asignaciones_docente.count(),
+            'setup_s': round(setup_time, 4),
+            'results': [
+                benchmark_strategy(planificacion, strategy, seed, **engine_params)
+                for strategy in strategies
+            ],
+        }
@@ -0,0 +1,84 @@
+"""
+Cancelación cooperativa de ejecuciones de los motores de planificación
+El estado se guarda en EjecucionEnCurso para que otro request, worker de
+Celery o proceso pueda ver y detener una ejecución en curso
+"""
+
+from datetime import timedelta
+from typing import Optional
+import time
+from django.utils import timezone
+
+from ..models import EjecucionEnCurso
+
+# Una ejecución que muere sin limpiar su registro deja de figurar como activa
+RUNNING_TIMEOUT = 6 * 60 * 60
+
+
+def _active(planificacion_id: int):
+    return EjecucionEnCurso.objects.filter(
+        planificacion_id=planificacion_id,
+        iniciada__gte=timezone.now() - timedelta(seconds=RUNNING_TIMEOUT)
+    )
+
+
+class CancellationToken:
+    """
+    Token que los motores consultan entre generaciones o colocaciones.
+
+    La consulta a la base de datos se limita a una cada ``poll_interval``
+    segundos para que el sondeo no pese en los bucles internos del motor.
+    """
+
+    def __init__(self, planificacion_id: int, poll_interval: float = 0.5, manage_state: bool = True):
+        self.planificacion_id = planificacion_id
+        self.poll_interval = poll_interval
+        # Las particiones de una ejecución distribuida solo consultan el token;
+        # el coordinador es quien marca el inicio y el fin
+        self.manage_state = manage_state
+        self.cancelled = False
+        self._last_poll = 0.0
+
+    def start(self):
+        """Marca la ejecución como activa y descarta cancelaciones anteriores"""
+        self.cancelled = False
+        self._last_poll = 0.0
+        if self.manage_state:
+            EjecucionEnCurso.objects.update_or_create(
+                planificacion_id=self.planificacion_id,
+                defaults={'iniciada': timezone.now(), 'cancelar': False}
+            )
+
+    def finish(self):
+        if self.manage_state:
+            EjecucionEnCurso.objects.filter(planificacion_id=self.planificacion_id).delete()
+
+    def request(self):
+        """Solicita la cancelación (también desde el mismo proceso, p. ej. Ctrl+C)"""
+        self.cancelled = True
+        EjecucionEnCurso.objects.filter(planificacion_id=self.planificacion_id).update(cancelar=True)
+
+    def is_cancelled(self) -> bool:
+        if self.cancelled:
+            return True
+
+        now = time.monotonic()
+        if now - self._last_poll >= self.poll_interval:
+            self._last_poll = now
+            self.cancelled = is_cancel_requested(self.planificacion_id)
+        return self.cancelled
+
+
+def is_running(planificacion_id: int) -> Optional[float]:
+    """Retorna el timestamp de inicio de la ejecución activa, o None"""
+    iniciada = _active(planificacion_id).values_list('iniciada', flat=True).first()
+    return iniciada.timestamp() if iniciada else None
+
+
+def request_cancellation(planificacion_id: int) -> bool:
+    """Solicita cancelar la ejecución activa; False si no hay ninguna en curso"""
+    return _active(planificacion_id).update(cancelar=True) > 0
+
+
+def is_cancel_requested(planificacion_id: int) -> bool:
+    return _active(planificacion_id).filter(cancelar=True).exists()
@@ -0,0 +1,151 @@
+"""
+Checkpoints del algoritmo genético para reanudar ejecuciones largas
+La población se guarda con la codificación compacta de encoding.py
+"""
+
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+import json
+import os
+import struct
+import tempfile
+import uuid
+from django.conf import settings
+from .encoding import FIELDS_PER_ASSIGNMENT, encode_values, decode_values, pack_assignments, unpack_assignments, EncodedAssignment
+
+CHECKPOINT_SUFFIX = '.ckpt'
+_HEADER_SIZE = struct.Struct('<I')
+
+
+def checkpoint_dir() -> Path:
+    return Path(getattr(settings, 'SCHEDULING_CHECKPOINT_DIR', Path(settings.BASE_DIR) / 'checkpoints'))
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@dataclass
+class GACheckpoint:
+    """
+    Estado del algoritmo genético al inicio de una generación.
+
+    ``individuals`` contiene el mejor individuo evaluado hasta el momento
+    seguido de la población actual.
+    """
+    run_id: str
+    planificacion_id: int
+    input_fingerprint: str
+    seed: int
+    population_size: int
+    generations: int
+    generation: int
+    rng_state: Any
+    best_fitness: float
+    individuals: List[List[EncodedAssignment]]
+
+    @property
+    def best_so_far(self) -> List[EncodedAssignment]:
+        return self.individuals[0]
+
+    @property
+    def population(self) -> List[List[EncodedAssignment]]:
+        return self.individuals[1:]
+
+
+def _serialize_rng_state(state) -> List:
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _deserialize_rng_state(data) -> tuple:
+    version, internal, gauss_next = data
+    return version, tuple(internal), gauss_next
+
+
+def save_checkpoint(run_id: str, planificacion_id: int, input_fingerprint: str, seed: int,
+                    population_size: int, generations: int, generation: int, rng_state,
+                    best_so_far: list, best_fitness: float, population: List[list]) -> Path:
+    """
+    Escribe el checkpoint de forma atómica (archivo temporal + rename).
+
+    Formato: longitud del encabezado (uint32), encabezado JSON y la población
+    como un único array de enteros comprimido.
+    """
+    values = array('I')
+    lengths = []
+    for individual in [best_so_far] + population:
+        packed = pack_assignments(individual)
+        lengths.append(len(packed) // FIELDS_PER_ASSIGNMENT)
+        values.extend(packed)
+
+    header = json.dumps({
+        'run_id': run_id,
+        'planificacion_id': planificacion_id,
+        'input_fingerprint': input_fingerprint,
+        'seed': seed,
+        'population_size': population_size,
+        'generations': generations,
+        'generation': generation,
+        'rng_state': _serialize_rng_state(rng_state),
+        'best_fitness': best_fitness,
+        'lengths': lengths,
+    }, separators=(',', ':')).encode()
+
+    directory = checkpoint_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{run_id}{CHECKPOINT_SUFFIX}'
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(_HEADER_SIZE.pack(len(header)))
+            fh.write(header)
+            fh.write(encode_values(values))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return path
+
+
+def load_checkpoint(run_id: str) -> Optional[GACheckpoint]:
+    """Lee un checkpoint; retorna None si no existe"""
+    path = checkpoint_dir() / f'{run_id}{CHECKPOINT_SUFFIX}'
+    if not path.exists():
+        return None
+
+    data = path.read_bytes()
+    (header_size,) = _HEADER_SIZE.unpack_from(data)
+    header = json.loads(data[_HEADER_SIZE.size:_HEADER_SIZE.size + header_size])
+    values = decode_values(data[_HEADER_SIZE.size + header_size:])
+
+    individuals = []
+    offset = 0
+    for length in header['lengths']:
+        end = offset + length * FIELDS_PER_ASSIGNMENT
+        individuals.append(unpack_assignments(values[offset:end]))
+        offset = end
+
+    return GACheckpoint(
+        run_id=header['run_id'],
+        planificacion_id=header['planificacion_id'],
+        input_fingerprint=header['input_fingerprint'],
+        seed=header['seed'],
+        population_size=header['population_size'],
+        generations=header['generations'],
+        generation=header['generation'],
+        rng_state=_deserialize_rng_state(header['rng_state']),
+        best_fitness=header['best_fitness'],
+        individuals=individuals,
+    )
+
+
+def delete_checkpoint(run_id: str):
+    path = checkpoint_dir() / f'{run_id}{CHECKPOINT_SUFFIX}'
+    if path.exists():
+        path.unlink()
+
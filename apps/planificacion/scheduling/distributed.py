@@ -0,0 +1,170 @@
+"""
+Planificación distribuida con Celery
+El coordinador calcula la huella de la entrada una sola vez y reparte
+búsquedas independientes (estrategia x semilla) entre los workers; un chord
+reúne los resúmenes y conserva la mejor solución encontrada
+
+Los workers cargan la planificación desde la base de datos en lugar de
+recibir el problema serializado: los motores construyen sus índices a partir
+de querysets (disponibilidad, prerrequisitos, ocupación) y el mensaje solo
+lleva ids. La huella que calcula cada worker descarta ejecuciones cuya
+entrada cambió después del despacho
+"""
+
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+from celery import chord, group, shared_task
+from ..models import PlanificacionAcademica, SchedulingRun
+from .base import SchedulingResult, SchedulingStrategy
+from .cancellation import CancellationToken
+from .history import compute_input_fingerprint, record_run, load_run_assignments
+from .strategies import SchedulingEngineFactory
+
+logger = logging.getLogger(__name__)
+
+# Límites de una ejecución distribuida
+MAX_SEEDS = 16
+MAX_PARTITIONS = 32
+
+
+@shared_task
+def solve_partition(planificacion_id: int, strategy: str, seed: int,
+                    engine_params: Dict[str, Any], input_fingerprint: str) -> Dict[str, Any]:
+    """
+    Ejecuta una búsqueda independiente y la registra como SchedulingRun.
+
+    La solución viaja por la base de datos (codificada en el run); al chord
+    solo se devuelve un resumen pequeño. Los errores se devuelven como
+    resumen: una tarea del encabezado que falla impediría ejecutar el
+    callback que libera la planificación.
+    """
+    try:
+        return _solve_partition(planificacion_id, strategy, seed, engine_params, input_fingerprint)
+    except Exception as e:
+        logger.exception(f"Error en la partición {strategy}/{seed} de la planificación {planificacion_id}")
+        return {'strategy': strategy, 'seed': seed, 'error': str(e)}
+
+
+def _solve_partition(planificacion_id: int, strategy: str, seed: int,
+                     engine_params: Dict[str, Any], input_fingerprint: str) -> Dict[str, Any]:
+    planificacion = PlanificacionAcademica.objects.get(id=planificacion_id)
+    if compute_input_fingerprint(planificacion) != input_fingerprint:
+        return {
+            'strategy': strategy,
+            'seed': seed,
+            'error': 'Los datos de entrada cambiaron desde que se despachó la ejecución'
+        }
+
+    engine = SchedulingEngineFactory.create_engine(SchedulingStrategy(strategy), seed=seed, **engine_params)
+    result = engine.execute_scheduling(planificacion, {
+        'abort_if_infeasible': False,
+        'cancellation': CancellationToken(planificacion_id, manage_state=False),
+    })
+    run = record_run(
+        engine, planificacion, result,
+        parameters={**engine_params, 'seed': seed, 'distributed': True},
+        input_fingerprint=input_fingerprint
+    )
+
+    return {
+        'run_id': run.id,
+        'strategy': strategy,
+        'seed': result.seed,
+        'score': result.score,
+        'total_assignments': len(result.assignments),
+        'total_conflicts': len(result.conflicts),
+        'total_unassigned': len(result.unassigned),
+        'execution_time': result.execution_time,
+        'cancelled': result.cancelled,
+    }
+
+
+def _rank(summary: Dict[str, Any]) -> Tuple:
+    """Menos asignaciones sin colocar, luego menos conflictos, luego mayor puntaje"""
+    return summary['total_unassigned'], summary['total_conflicts'], -summary['score']
+
+
+@shared_task
+def merge_partitions(summaries: List[Dict[str, Any]], planificacion_id: int, save: bool = False) -> Dict[str, Any]:
+    """Callback del chord: elige la mejor partición y opcionalmente la guarda"""
+    try:
+        completed = [summary for summary in summaries if 'error' not in summary]
+        best = min(completed, key=_rank) if completed else None
+
+        saved = False
+        if best and save:
+            saved = save_run(SchedulingRun.objects.select_related('planificacion').get(id=best['run_id']))
+
+        logger.info(
+            f"Planificación distribuida {planificacion_id}: {len(completed)}/{len(summaries)} particiones, "
+            f"mejor run {best['run_id'] if best else None}"
+        )
+        return {
+            'planificacion_id': planificacion_id,
+            'best': best,
+            'partitions': sorted(summaries, key=lambda s: _rank(s) if 'error' not in s else (float('inf'),)),
+            'saved': saved,
+        }
+    finally:
+        CancellationToken(planificacion_id).finish()
+
+
+@shared_task
+def release_partitions(*args, planificacion_id: int) -> None:
+    """Errback del chord: libera la planificación si el callback no llega a ejecutarse"""
+    logger.error(f"La ejecución distribuida de la planificación {planificacion_id} falló: {args}")
+    CancellationToken(planificacion_id).finish()
+
+
+def save_run(run: SchedulingRun) -> bool:
+    """Materializa la solución de una ejecución guardada como HorarioClase"""
+    engine = SchedulingEngineFactory.create_engine(SchedulingStrategy(run.strategy), seed=run.seed)
+    result = SchedulingResult(
+        success=run.success,
+        assignments=load_run_assignments(run),
+        conflicts=[],
+        unassigned=[],
+        score=run.score,
+        execution_time=run.execution_time,
+        strategy_used=engine.strategy,
+        message=run.message,
+        seed=run.seed
+    )
+    return engine.save_scheduling_result(run.planificacion, result)
+
+
+def build_partitions(strategies: Iterable[str], seeds: Iterable[int]) -> List[Tuple[str, int]]:
+    """Producto estrategia x semilla; con una sola estrategia GA equivale a islas independientes"""
+    return list(product(strategies, seeds))
+
+
+def dispatch_distributed_scheduling(planificacion: PlanificacionAcademica, strategies: Iterable[str],
+                                    seeds: Iterable[int], engine_params: Optional[Dict[str, Any]] = None,
+                                    save: bool = False):
+    """
+    Despacha las particiones como un chord y retorna su AsyncResult.
+
+    Con CELERY_TASK_ALWAYS_EAGER el chord se ejecuta en el mismo proceso,
+    lo que permite probar el flujo completo sin broker.
+    """
+    engine_params = {k: v for k, v in (engine_params or {}).items() if k != 'seed'}
+    partitions = build_partitions(strategies, seeds)
+    fingerprint = compute_input_fingerprint(planificacion)
+
+    # La ejecución figura como activa hasta que el callback del chord termina
+    CancellationToken(planificacion.id).start()
+
+    header = group(
+        solve_partition.s(planificacion.id, strategy, seed, engine_params, fingerprint)
+        for strategy, seed in partitions
+    )
+    callback = merge_partitions.s(planificacion.id, save).on_error(
+        release_partitions.s(planificacion_id=planificacion.id)
+    )
+    try:
+        return chord(header)(callback)
+    except Exception:
+        # Sin chord despachado no habrá callback que libere la planificación
+        CancellationToken(planificacion.id).finish()
+        raise
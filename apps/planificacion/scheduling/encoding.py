@@ -0,0 +1,83 @@
+"""
+Codificación compacta de soluciones de planificación
+Cada asignación se reduce a cinco enteros sin signo de 32 bits:
+(asignacion_docente_id, franja_id, aula_id, modalidad, capacidad)
+"""
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple
+import sys
+import zlib
+
+MODALIDADES = ('presencial', 'virtual', 'hibrida')
+_MODALIDAD_CODE = {modalidad: code for code, modalidad in enumerate(MODALIDADES)}
+
+FIELDS_PER_ASSIGNMENT = 5
+NO_AULA = 0
+
+
+class EncodedAssignment(NamedTuple):
+    """Asignación decodificada; aula_id es None para secciones virtuales"""
+    asignacion_id: int
+    franja_id: int
+    aula_id: int
+    modalidad: str
+    capacidad: int
+
+
+def pack_assignments(assignments: Iterable) -> array:
+    """Convierte SchedulingAssignment en un array plano de enteros"""
+    values = array('I')
+    for assignment in assignments:
+        values.extend((
+            assignment.asignacion_docente.id,
+            assignment.franja_horaria.id,
+            assignment.aula.id if assignment.aula else NO_AULA,
+            _MODALIDAD_CODE.get(assignment.modalidad, 0),
+            assignment.capacidad_estudiantes,
+        ))
+    return values
+
+
+def unpack_assignments(values: array) -> List[EncodedAssignment]:
+    """Inverso de pack_assignments"""
+    decoded = []
+    for i in range(0, len(values), FIELDS_PER_ASSIGNMENT):
+        asignacion_id, franja_id, aula_id, modalidad, capacidad = values[i:i + FIELDS_PER_ASSIGNMENT]
+        decoded.append(EncodedAssignment(
+            asignacion_id, franja_id, aula_id or None, MODALIDADES[modalidad], capacidad
+        ))
+    return decoded
+
+
+def encode_values(values: array) -> bytes:
+    """Serializa un array de enteros en bytes comprimidos (little-endian)"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return zlib.compress(values.tobytes(), 1)
+
+
+def decode_values(blob: bytes, typecode: str = 'I') -> array:
+    """Inverso de encode_values"""
+    values = array(typecode)
+    if blob:
+        values.frombytes(zlib.decompress(bytes(blob)))
+        if sys.byteorder != 'little':
+            values.byteswap()
+    return values
+
+
+def encode_solution(assignments: Iterable) -> bytes:
+    """Serializa una solución completa"""
+    return encode_values(pack_assignments(assignments))
+
+
+def decode_solution(blob: bytes) -> List[EncodedAssignment]:
+    """Deserializa una solución guardada con encode_solution"""
+    return unpack_assignments(decode_values(blob))
+
+
+def solution_map(blob: bytes) -> Dict[int, EncodedAssignment]:
+    """Solución indexada por asignación docente, para comparar ejecuciones"""
+    return {item.asignacion_id: item for item in decode_solution(blob)}
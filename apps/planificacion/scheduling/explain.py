@@ -0,0 +1,129 @@
+"""
+Explicación de las asignaciones que el motor no pudo colocar
+Se calcula con los mismos bitsets de ocupación del motor, sin consultas
+adicionales a la base de datos
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional
+from .index import OccupancyIndex
+
+# Códigos de motivo, de más a menos determinante
+SIN_AULA_CAPACIDAD = 'sin_aula_capacidad'
+DOCENTE_SIN_FRANJAS = 'docente_sin_franjas'
+COHORTE_OCUPADA = 'cohorte_ocupada'
+AULAS_OCUPADAS = 'aulas_ocupadas'
+RECHAZADA_EN_VALIDACION = 'rechazada_en_validacion'
+SIN_RESTRICCION_ACTIVA = 'sin_restriccion_activa'
+
+
+@dataclass
+class UnassignedReason:
+    """Motivo por el que una asignación quedó sin colocar"""
+    codigo: str
+    detalle: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+class UnassignmentExplainer:
+    """
+    Explica asignaciones no colocadas a partir del índice de ocupación final.
+
+    Las franjas libres del docente, las de su cohorte y las de las aulas con
+    capacidad suficiente se cruzan como bitsets, de modo que cada explicación
+    cuesta O(franjas + aulas) sin tocar la base de datos.
+    """
+
+    def __init__(self, occupancy: OccupancyIndex, franjas: List, aulas: List,
+                 capacity_estimator: Optional[Callable] = None, allow_virtual: bool = False,
+                 unavailable: Optional[Callable[[int], Iterable[int]]] = None):
+        self.occupancy = occupancy
+        self.aulas = aulas
+        self.capacity_estimator = capacity_estimator
+        self.allow_virtual = allow_virtual
+        self.unavailable = unavailable
+
+        self.franja_at: Dict[int, object] = {occupancy.position(franja): franja for franja in franjas}
+        self.all_mask = 0
+        for pos in self.franja_at:
+            self.all_mask |= 1 << pos
+
+        # Franjas en las que cada aula sigue libre
+        self.aula_free_mask: Dict[int, int] = {
+            aula.id: self.all_mask & ~occupancy.aula_bits.get(aula.id, 0) for aula in aulas
+        }
+
+    def _unavailable_mask(self, docente_id: int) -> int:
+        if self.unavailable is None:
+            return 0
+        mask = 0
+        for franja_id in self.unavailable(docente_id):
+            pos = self.occupancy.franja_pos.get(franja_id)
+            if pos is not None:
+                mask |= 1 << pos
+        return mask
+
+    def explain(self, asignacion, violations: Optional[List[str]] = None) -> List[UnassignedReason]:
+        reasons: List[UnassignedReason] = []
+
+        if violations:
+            reasons.append(UnassignedReason(
+                RECHAZADA_EN_VALIDACION,
+                f"La colocación propuesta violó restricciones: {'; '.join(violations)}"
+            ))
+
+        demanda = self.capacity_estimator(asignacion) if self.capacity_estimator else 0
+        aulas_aptas = [aula for aula in self.aulas if aula.capacidad >= demanda]
+        if not aulas_aptas and not self.allow_virtual:
+            maxima = max((aula.capacidad for aula in self.aulas), default=0)
+            reasons.append(UnassignedReason(
+                SIN_AULA_CAPACIDAD,
+                f"Ninguna aula disponible tiene capacidad para {demanda} estudiantes (máxima: {maxima})"
+            ))
+
+        docente_id = asignacion.docente_id
+        ocupadas = self.occupancy.docente_bits.get(docente_id, 0) & self.all_mask
+        libres = self.all_mask & ~ocupadas
+        if not libres:
+            no_disponibles = self._unavailable_mask(docente_id) & ocupadas
+            reasons.append(UnassignedReason(
+                DOCENTE_SIN_FRANJAS,
+                f"El docente no tiene franjas libres: {bin(ocupadas & ~no_disponibles).count('1')} con otras clases "
+                f"y {bin(no_disponibles).count('1')} no disponibles"
+            ))
+            return reasons
+
+        cohorte_libre = 0
+        pos_libres = [pos for pos in self.franja_at if (libres >> pos) & 1]
+        for pos in pos_libres:
+            if self.occupancy.cohort_free(asignacion, self.franja_at[pos]):
+                cohorte_libre |= 1 << pos
+
+        if not cohorte_libre:
+            reasons.append(UnassignedReason(
+                COHORTE_OCUPADA,
+                f"En las {len(pos_libres)} franjas libres del docente ya tiene clase otra materia "
+                f"del semestre {asignacion.materia.semestre}"
+            ))
+            return reasons
+
+        if aulas_aptas and not self.allow_virtual:
+            aulas_libres = 0
+            for aula in aulas_aptas:
+                aulas_libres |= self.aula_free_mask[aula.id]
+            if not cohorte_libre & aulas_libres:
+                reasons.append(UnassignedReason(
+                    AULAS_OCUPADAS,
+                    f"Las {len(aulas_aptas)} aulas con capacidad suficiente están ocupadas en las "
+                    f"{bin(cohorte_libre).count('1')} franjas libres del docente y su cohorte"
+                ))
+
+        if not reasons:
+            reasons.append(UnassignedReason(
+                SIN_RESTRICCION_ACTIVA,
+                "Existía una franja y un aula libres; la estrategia no las utilizó "
+                "(búsqueda heurística o ejecución cancelada)"
+            ))
+        return reasons
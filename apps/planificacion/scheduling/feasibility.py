@@ -0,0 +1,157 @@
+"""
+Análisis rápido de factibilidad previo a la planificación
+Calcula cotas de conteo (principio del palomar) sobre datos precargados
+para detectar planes que nunca podrían completarse sin ejecutar el motor
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+import time
+from ..models import PlanificacionAcademica, FranjaHoraria
+from apps.asignaciones.models import AsignacionDocente
+from apps.aulas.models import Aula
+
+
+@dataclass
+class FeasibilityIssue:
+    """Una cota violada que impide (o limita) completar la planificación"""
+    code: str
+    message: str
+    blocking: bool = True
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FeasibilityReport:
+    """Resultado del análisis de factibilidad"""
+    feasible: bool
+    issues: List[FeasibilityIssue]
+    stats: Dict[str, Any]
+    elapsed_ms: float
+
+    @property
+    def blocking_issues(self) -> List[FeasibilityIssue]:
+        return [issue for issue in self.issues if issue.blocking]
+
+    def summary(self) -> str:
+        if not self.issues:
+            return "Planificación factible"
+        return '; '.join(issue.message for issue in self.issues)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class FeasibilityAnalyzer:
+    """
+    Analizador de factibilidad previo a la ejecución de un motor.
+
+    Usa tres consultas (asignaciones, franjas y aulas) y una sola pasada
+    sobre las asignaciones. Cada motor coloca una sesión por asignación,
+    por lo que las cotas se expresan en sesiones por franja.
+    """
+
+    def __init__(self, capacity_estimator: Optional[Callable[[AsignacionDocente], int]] = None,
+                 allow_virtual: bool = False):
+        self.capacity_estimator = capacity_estimator
+        self.allow_virtual = allow_virtual
+
+    def analyze(self, planificacion: PlanificacionAcademica) -> FeasibilityReport:
+        start = time.perf_counter()
+        issues: List[FeasibilityIssue] = []
+
+        asignaciones = list(AsignacionDocente.objects.filter(
+            planificacion=planificacion,
+            is_activa=True
+        ).select_related('materia'))
+        duraciones = list(FranjaHoraria.objects.filter(is_activa=True).values_list('duracion_minutos', flat=True))
+        capacidades = list(Aula.objects.filter(is_disponible=True).values_list('capacidad', flat=True))
+
+        total_franjas = len(duraciones)
+        horas_disponibles = sum(duraciones) / 60
+        max_capacidad = max(capacidades, default=0)
+
+        # Una sola pasada acumulando demanda por docente y por cohorte
+        sesiones_docente: Dict[int, int] = {}
+        horas_docente: Dict[int, int] = {}
+        materias_cohorte: Dict[tuple, set] = {}
+        sin_aula: List[int] = []
+
+        for asignacion in asignaciones:
+            docente_id = asignacion.docente_id
+            sesiones_docente[docente_id] = sesiones_docente.get(docente_id, 0) + 1
+            horas_docente[docente_id] = horas_docente.get(docente_id, 0) + asignacion.carga_horaria_semanal
+
+            cohorte = (asignacion.materia.carrera_id, asignacion.materia.semestre)
+            materias_cohorte.setdefault(cohorte, set()).add(asignacion.materia_id)
+
+            if self.capacity_estimator and self.capacity_estimator(asignacion) > max_capacidad:
+                sin_aula.append(asignacion.id)
+
+        if not total_franjas:
+            issues.append(FeasibilityIssue('sin_franjas', "No hay franjas horarias activas"))
+
+        if not capacidades and not self.allow_virtual:
+            issues.append(FeasibilityIssue('sin_aulas', "No hay aulas disponibles"))
+
+        # Cota global: cada sesión presencial ocupa un par (aula, franja)
+        capacidad_total = len(capacidades) * total_franjas
+        if len(asignaciones) > capacidad_total:
+            issues.append(FeasibilityIssue(
+                'capacidad_insuficiente',
+                f"Se requieren {len(asignaciones)} sesiones y solo hay {capacidad_total} pares aula-franja",
+                blocking=not self.allow_virtual,
+                details={'requeridas': len(asignaciones), 'disponibles': capacidad_total}
+            ))
+
+        # Cota por docente: sesiones distintas. Las horas semanales solo advierten:
+        # los motores colocan una sesión por asignación, no una por hora
+        for docente_id, sesiones in sesiones_docente.items():
+            if sesiones > total_franjas:
+                issues.append(FeasibilityIssue(
+                    'docente_sin_franjas',
+                    f"El docente {docente_id} tiene {sesiones} asignaciones y solo hay {total_franjas} franjas",
+                    details={'docente_id': docente_id, 'sesiones': sesiones, 'franjas': total_franjas}
+                ))
+            if horas_docente[docente_id] > horas_disponibles:
+                issues.append(FeasibilityIssue(
+                    'docente_sobrecarga',
+                    f"El docente {docente_id} requiere {horas_docente[docente_id]} horas semanales "
+                    f"y las franjas suman {horas_disponibles:.1f}",
+                    blocking=False,
+                    details={'docente_id': docente_id, 'horas': horas_docente[docente_id],
+                             'horas_disponibles': horas_disponibles}
+                ))
+
+        # Cota por cohorte: materias distintas de un mismo semestre no pueden coincidir
+        for (carrera_id, semestre), materias in materias_cohorte.items():
+            if len(materias) > total_franjas:
+                issues.append(FeasibilityIssue(
+                    'cohorte_sin_franjas',
+                    f"La carrera {carrera_id} semestre {semestre} tiene {len(materias)} materias "
+                    f"y solo hay {total_franjas} franjas",
+                    details={'carrera_id': carrera_id, 'semestre': semestre, 'materias': len(materias)}
+                ))
+
+        if sin_aula:
+            issues.append(FeasibilityIssue(
+                'sin_aula_suficiente',
+                f"{len(sin_aula)} asignaciones superan la capacidad del aula más grande ({max_capacidad})",
+                blocking=not self.allow_virtual,
+                details={'asignaciones': sin_aula, 'capacidad_maxima': max_capacidad}
+            ))
+
+        stats = {
+            'asignaciones': len(asignaciones),
+            'franjas': total_franjas,
+            'aulas': len(capacidades),
+            'pares_aula_franja': capacidad_total,
+            'horas_disponibles': round(horas_disponibles, 1),
+        }
+
+        return FeasibilityReport(
+            feasible=not any(issue.blocking for issue in issues),
+            issues=issues,
+            stats=stats,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 2)
+        )
@@ -0,0 +1,144 @@
+"""
+Historial de ejecuciones (SchedulingRun) y comparación entre ejecuciones
+sin volver a resolver la planificación
+"""
+
+from typing import Any, Dict, List, Optional
+import hashlib
+from ..models import PlanificacionAcademica, FranjaHoraria, SchedulingRun
+from apps.asignaciones.models import AsignacionDocente
+from apps.aulas.models import Aula
+from .base import BaseSchedulingEngine, SchedulingAssignment, SchedulingResult
+from .encoding import encode_solution, solution_map
+
+
+def compute_input_fingerprint(planificacion: PlanificacionAcademica) -> str:
+    """
+    Hash estable de los datos de entrada de una planificación.
+
+    Dos ejecuciones con la misma huella resolvieron exactamente el mismo
+    problema, por lo que sus tiempos y puntajes son comparables.
+    """
+    digest = hashlib.sha256()
+
+    asignaciones = AsignacionDocente.objects.filter(
+        planificacion=planificacion,
+        is_activa=True
+    ).order_by('id').values_list('id', 'docente_id', 'materia_id', 'carga_horaria_semanal')
+    franjas = FranjaHoraria.objects.filter(is_activa=True).order_by('id').values_list(
+        'id', 'dia_semana', 'hora_inicio', 'hora_fin'
+    )
+    aulas = Aula.objects.filter(is_disponible=True).order_by('id').values_list('id', 'capacidad', 'tipo_id')
+
+    for label, rows in (('asignaciones', asignaciones), ('franjas', franjas), ('aulas', aulas)):
+        digest.update(label.encode())
+        for row in rows:
+            digest.update(repr(row).encode())
+
+    return digest.hexdigest()
+
+
+def record_run(engine: BaseSchedulingEngine, planificacion: PlanificacionAcademica,
+               result: SchedulingResult, parameters: Optional[Dict[str, Any]] = None,
+               usuario=None, input_fingerprint: Optional[str] = None) -> SchedulingRun:
+    """Guarda una ejecución del motor en el historial"""
+    return SchedulingRun.objects.create(
+        planificacion=planificacion,
+        strategy=engine.strategy.value,
+        parameters=parameters or {},
+        seed=result.seed,
+        input_fingerprint=input_fingerprint or compute_input_fingerprint(planificacion),
+        success=result.success,
+        score=result.score,
+        execution_time=result.execution_time,
+        phases=result.phases,
+        total_assignments=len(result.assignments),
+        total_conflicts=len(result.conflicts),
+        total_unassigned=len(result.unassigned),
+        solution=encode_solution(result.assignments),
+        message=result.message,
+        ejecutado_por=usuario,
+    )
+
+
+def load_run_assignments(run: SchedulingRun) -> List[SchedulingAssignment]:
+    """Reconstruye las asignaciones de una ejecución guardada (tres consultas)"""
+    encoded = solution_map(run.solution)
+
+    asignaciones = AsignacionDocente.objects.select_related('docente', 'materia').in_bulk(encoded.keys())
+    franjas = FranjaHoraria.objects.in_bulk({item.franja_id for item in encoded.values()})
+    aulas = Aula.objects.in_bulk({item.aula_id for item in encoded.values() if item.aula_id})
+
+    return [
+        SchedulingAssignment(
+            asignacion_docente=asignaciones[item.asignacion_id],
+            franja_horaria=franjas[item.franja_id],
+            aula=aulas.get(item.aula_id),
+            capacidad_estudiantes=item.capacidad,
+            modalidad=item.modalidad
+        )
+        for item in encoded.values()
+        if item.asignacion_id in asignaciones and item.franja_id in franjas
+    ]
+
+
+def compare_runs(base: SchedulingRun, other: SchedulingRun) -> Dict[str, Any]:
+    """
+    Compara dos ejecuciones a partir de sus soluciones codificadas.
+
+    Cada solución se indexa por asignación docente, de modo que la
+    diferencia es lineal en el número de asignaciones.
+    """
+    base_solution = solution_map(base.solution)
+    other_solution = solution_map(other.solution)
+
+    moved = []
+    unchanged = 0
+    for asignacion_id, before in base_solution.items():
+        after = other_solution.get(asignacion_id)
+        if after is None:
+            continue
+        if (before.franja_id, before.aula_id, before.modalidad) == (after.franja_id, after.aula_id, after.modalidad):
+            unchanged += 1
+        else:
+            moved.append({
+                'asignacion_docente': asignacion_id,
+                'antes': {'franja': before.franja_id, 'aula': before.aula_id, 'modalidad': before.modalidad},
+                'despues': {'franja': after.franja_id, 'aula': after.aula_id, 'modalidad': after.modalidad},
+            })
+
+    return {
+        'base': base.id,
+        'otra': other.id,
+        'misma_entrada': base.input_fingerprint == other.input_fingerprint,
+        'diferencias': {
+            'score': round(other.score - base.score, 4),
+            'execution_time': round(other.execution_time - base.execution_time, 4),
+            'total_assignments': other.total_assignments - base.total_assignments,
+            'total_conflicts': other.total_conflicts - base.total_conflicts,
+            'total_unassigned': other.total_unassigned - base.total_unassigned,
+        },
+        'fases': _compare_phases(base.phases, other.phases),
+        'solucion': {
+            'sin_cambios': unchanged,
+            'movidas': moved,
+            'solo_en_base': sorted(base_solution.keys() - other_solution.keys()),
+            'solo_en_otra': sorted(other_solution.keys() - base_solution.keys()),
+        },
+    }
+
+
+def _compare_phases(base_phases, other_phases) -> Dict[str, Dict[str, float]]:
+    """Diferencia de tiempo de reloj y consultas por fase"""
+    base_by_name = {phase['name']: phase for phase in base_phases}
+    other_by_name = {phase['name']: phase for phase in other_phases}
+
+    comparison = {}
+    for name in base_by_name.keys() | other_by_name.keys():
+        before = base_by_name.get(name, {})
+        after = other_by_name.get(name, {})
+        comparison[name] = {
+            'wall_s': round(after.get('wall_s', 0.0) - before.get('wall_s', 0.0), 6),
+            'queries': after.get('queries', 0) - before.get('queries', 0),
+        }
+    return comparison
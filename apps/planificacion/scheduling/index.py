@@ -0,0 +1,155 @@
+"""
+Índices en memoria compartidos por los motores de planificación
+Representan la ocupación de docentes, aulas y cohortes como bitsets sobre franjas
+"""
+
+from typing import Dict, Iterable, Tuple
+
+
+class CohortMatrix:
+    """
+    Matriz dispersa de pertenencia asignación -> cohorte.
+
+    Una cohorte es el grupo de estudiantes de una misma carrera y semestre;
+    cada asignación pertenece a exactamente una cohorte, por lo que la matriz
+    se guarda como un diccionario asignacion_id -> índice de cohorte.
+    """
+
+    def __init__(self, asignaciones: Iterable = ()):
+        self.cohort_ids: Dict[Tuple[int, int], int] = {}
+        self.by_asignacion: Dict[int, int] = {}
+
+        for asignacion in asignaciones:
+            self.by_asignacion[asignacion.id] = self._cohort_for(asignacion)
+
+    def _cohort_for(self, asignacion) -> int:
+        materia = asignacion.materia
+        key = (materia.carrera_id, materia.semestre)
+        return self.cohort_ids.setdefault(key, len(self.cohort_ids))
+
+    def cohort_of(self, asignacion) -> int:
+        """Retorna el índice de cohorte de una asignación"""
+        cohort = self.by_asignacion.get(asignacion.id)
+        if cohort is None:
+            cohort = self.by_asignacion[asignacion.id] = self._cohort_for(asignacion)
+        return cohort
+
+
+class OccupancyIndex:
+    """
+    Índice de ocupación por franja horaria.
+
+    Cada docente, aula y cohorte tiene un entero usado como bitset donde el
+    bit i indica que la franja en la posición i está ocupada. Las consultas
+    de disponibilidad son O(1) y no tocan la base de datos.
+    """
+
+    def __init__(self, franjas: Iterable = (), asignaciones: Iterable = ()):
+        self.franja_pos: Dict[int, int] = {}
+        for franja in franjas:
+            self.position(franja)
+
+        self.cohorts = CohortMatrix(asignaciones)
+        self.docente_bits: Dict[int, int] = {}
+        self.aula_bits: Dict[int, int] = {}
+        self.cohort_bits: Dict[int, int] = {}
+
+        # Dos secciones de la misma materia pueden compartir franja, por eso
+        # se recuerda qué materia ocupa cada (cohorte, franja) y cuántas veces
+        self._cohort_owner: Dict[Tuple[int, int], int] = {}
+        self._cohort_load: Dict[Tuple[int, int], int] = {}
+
+        # Ubicación de los docentes para el tiempo de desplazamiento (ver travel.py);
+        # se mantiene junto con la ocupación en reserve/release
+        self.travel = None
+
+    def position(self, franja) -> int:
+        """Retorna la posición de bit de una franja, registrándola si es nueva"""
+        pos = self.franja_pos.get(franja.id)
+        if pos is None:
+            pos = self.franja_pos[franja.id] = len(self.franja_pos)
+        return pos
+
+    def docente_free(self, docente_id: int, franja) -> bool:
+        return not (self.docente_bits.get(docente_id, 0) >> self.position(franja)) & 1
+
+    def aula_free(self, aula_id: int, franja) -> bool:
+        return not (self.aula_bits.get(aula_id, 0) >> self.position(franja)) & 1
+
+    def cohort_free(self, asignacion, franja) -> bool:
+        """Verifica que ninguna otra materia de la cohorte ocupe la franja"""
+        cohort = self.cohorts.cohort_of(asignacion)
+        pos = self.position(franja)
+        if not (self.cohort_bits.get(cohort, 0) >> pos) & 1:
+            return True
+        return self._cohort_owner.get((cohort, pos)) == asignacion.materia_id
+
+    def is_free(self, asignacion, aula, franja) -> bool:
+        """Verifica docente, aula y cohorte para una posible asignación"""
+        return (
+            self.docente_free(asignacion.docente_id, franja)
+            and (aula is None or self.aula_free(aula.id, franja))
+            and self.cohort_free(asignacion, franja)
+        )
+
+    def block_docente(self, docente_id: int, franja_ids: Iterable[int]) -> None:
+        """Marca franjas como no disponibles para el docente (solo las registradas en el índice)"""
+        bits = self.docente_bits.get(docente_id, 0)
+        for franja_id in franja_ids:
+            pos = self.franja_pos.get(franja_id)
+            if pos is not None:
+                bits |= 1 << pos
+        self.docente_bits[docente_id] = bits
+
+    def reserve(self, assignment) -> None:
+        """Marca como ocupados los recursos de una asignación"""
+        asignacion = assignment.asignacion_docente
+        bit = 1 << self.position(assignment.franja_horaria)
+
+        docente_id = asignacion.docente_id
+        self.docente_bits[docente_id] = self.docente_bits.get(docente_id, 0) | bit
+
+        # Las secciones virtuales no consumen ocupación de aula
+        if assignment.aula is not None:
+            aula_id = assignment.aula.id
+            self.aula_bits[aula_id] = self.aula_bits.get(aula_id, 0) | bit
+
+        self.reserve_cohort(asignacion, assignment.franja_horaria)
+
+        if self.travel is not None:
+            self.travel.reserve(assignment)
+
+    def reserve_cohort(self, asignacion, franja) -> None:
+        """Marca la franja como ocupada para la cohorte de la asignación"""
+        cohort = self.cohorts.cohort_of(asignacion)
+        pos = self.position(franja)
+        key = (cohort, pos)
+        self.cohort_bits[cohort] = self.cohort_bits.get(cohort, 0) | (1 << pos)
+        self._cohort_owner.setdefault(key, asignacion.materia_id)
+        self._cohort_load[key] = self._cohort_load.get(key, 0) + 1
+
+    def release(self, assignment) -> None:
+        """Libera los recursos ocupados por una asignación"""
+        asignacion = assignment.asignacion_docente
+        pos = self.position(assignment.franja_horaria)
+        mask = ~(1 << pos)
+
+        docente_id = asignacion.docente_id
+        self.docente_bits[docente_id] = self.docente_bits.get(docente_id, 0) & mask
+
+        if assignment.aula is not None:
+            aula_id = assignment.aula.id
+            self.aula_bits[aula_id] = self.aula_bits.get(aula_id, 0) & mask
+
+        cohort = self.cohorts.cohort_of(asignacion)
+        key = (cohort, pos)
+        load = self._cohort_load.get(key, 0) - 1
+        if load > 0:
+            self._cohort_load[key] = load
+        else:
+            self._cohort_load.pop(key, None)
+            self._cohort_owner.pop(key, None)
+            self.cohort_bits[cohort] = self.cohort_bits.get(cohort, 0) & mask
+
+        if self.travel is not None:
+            self.travel.release(assignment)
@@ -0,0 +1,205 @@
+"""
+Optimización multiobjetivo estilo NSGA-II
+Ordenamiento no dominado, distancia de hacinamiento y archivo de soluciones
+no dominadas sobre los objetivos de calidad de un horario
+"""
+
+from dataclasses import dataclass
+from statistics import pstdev
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Todos los objetivos se maximizan
+OBJECTIVES = ('cobertura', 'eficiencia_aulas', 'preferencia_docente', 'equilibrio', 'desplazamiento')
+
+
+@dataclass
+class ParetoSolution:
+    """Individuo evaluado: vector de objetivos y violaciones de restricciones duras"""
+    assignments: list
+    objectives: Tuple[float, ...]
+    violations: int = 0
+    rank: int = 0
+    crowding: float = 0.0
+
+    def objectives_dict(self) -> Dict[str, float]:
+        return {name: round(value, 4) for name, value in zip(OBJECTIVES, self.objectives)}
+
+    def to_dict(self, include_solution: bool = True) -> Dict:
+        data = {
+            'objectives': self.objectives_dict(),
+            'violations': self.violations,
+            'total_assignments': len(self.assignments),
+        }
+        if include_solution:
+            # Solución compacta: [asignacion_docente, franja, aula, modalidad]
+            data['solution'] = [
+                [a.asignacion_docente.id, a.franja_horaria.id, a.aula.id if a.aula else None, a.modalidad]
+                for a in self.assignments
+            ]
+        return data
+
+
+def evaluate_objectives(assignments: list, demand: Callable, preference: Callable,
+                        dias: Sequence[str], lateness: Optional[Callable] = None) -> Tuple[float, ...]:
+    """
+    Calcula los objetivos de un horario en una sola pasada.
+
+    - cobertura: asignaciones colocadas
+    - eficiencia_aulas: ocupación media del aula respecto a la demanda estimada
+    - preferencia_docente: fracción de clases en franjas preferidas por el docente
+    - equilibrio: dispersión (negada) de clases por día
+    - desplazamiento: minutos de retraso (negados) entre clases consecutivas del docente
+    """
+    if not assignments:
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+
+    ocupacion = 0.0
+    presenciales = 0
+    preferidas = 0.0
+    por_dia = {dia: 0 for dia in dias}
+
+    for assignment in assignments:
+        if assignment.aula is not None:
+            ocupacion += min(demand(assignment.asignacion_docente) / assignment.aula.capacidad, 1.0)
+            presenciales += 1
+        preferidas += preference(assignment)
+        dia = assignment.franja_horaria.dia_semana
+        por_dia[dia] = por_dia.get(dia, 0) + 1
+
+    return (
+        float(len(assignments)),
+        ocupacion / presenciales if presenciales else 0.0,
+        preferidas / len(assignments),
+        -pstdev(por_dia.values()) if len(por_dia) > 1 else 0.0,
+        -float(lateness(assignments)) if lateness else 0.0,
+    )
+
+
+def dominates(a: ParetoSolution, b: ParetoSolution) -> bool:
+    """Dominancia con restricciones: una solución factible domina a una infactible"""
+    if a.violations != b.violations:
+        return a.violations < b.violations
+    return all(x >= y for x, y in zip(a.objectives, b.objectives)) and a.objectives != b.objectives
+
+
+def non_dominated_sort(solutions: List[ParetoSolution]) -> List[List[ParetoSolution]]:
+    """Ordenamiento rápido no dominado (Deb et al.); asigna ``rank`` a cada solución"""
+    dominated_by: List[List[int]] = [[] for _ in solutions]
+    domination_count = [0] * len(solutions)
+
+    for i, a in enumerate(solutions):
+        for j in range(i + 1, len(solutions)):
+            b = solutions[j]
+            if dominates(a, b):
+                dominated_by[i].append(j)
+                domination_count[j] += 1
+            elif dominates(b, a):
+                dominated_by[j].append(i)
+                domination_count[i] += 1
+
+    fronts: List[List[int]] = [[i for i in range(len(solutions)) if domination_count[i] == 0]]
+
+    current = 0
+    while fronts[current]:
+        next_front = []
+        for i in fronts[current]:
+            solutions[i].rank = current
+            for j in dominated_by[i]:
+                domination_count[j] -= 1
+                if domination_count[j] == 0:
+                    next_front.append(j)
+        current += 1
+        fronts.append(next_front)
+
+    return [[solutions[i] for i in front] for front in fronts if front]
+
+
+def assign_crowding_distance(front: List[ParetoSolution]):
+    """Distancia de hacinamiento: favorece soluciones en zonas poco pobladas del frente"""
+    for solution in front:
+        solution.crowding = 0.0
+    if len(front) <= 2:
+        for solution in front:
+            solution.crowding = float('inf')
+        return
+
+    for m in range(len(OBJECTIVES)):
+        front.sort(key=lambda s: s.objectives[m])
+        low, high = front[0].objectives[m], front[-1].objectives[m]
+        front[0].crowding = front[-1].crowding = float('inf')
+        if high == low:
+            continue
+        for k in range(1, len(front) - 1):
+            front[k].crowding += (front[k + 1].objectives[m] - front[k - 1].objectives[m]) / (high - low)
+
+
+def select_survivors(solutions: List[ParetoSolution], size: int) -> List[ParetoSolution]:
+    """Selección elitista (mu + lambda) por rango y distancia de hacinamiento"""
+    survivors: List[ParetoSolution] = []
+    for front in non_dominated_sort(solutions):
+        assign_crowding_distance(front)
+        if len(survivors) + len(front) <= size:
+            survivors.extend(front)
+        else:
+            front.sort(key=lambda s: -s.crowding)
+            survivors.extend(front[:size - len(survivors)])
+            break
+    return survivors
+
+
+def crowded_better(a: ParetoSolution, b: ParetoSolution) -> ParetoSolution:
+    """Operador de comparación por hacinamiento para el torneo binario"""
+    if a.rank != b.rank:
+        return a if a.rank < b.rank else b
+    return a if a.crowding >= b.crowding else b
+
+
+class ParetoArchive:
+    """Archivo acotado de soluciones no dominadas encontradas durante la búsqueda"""
+
+    def __init__(self, max_size: int = 50):
+        self.max_size = max_size
+        self.members: List[ParetoSolution] = []
+
+    def update(self, candidates: List[ParetoSolution]):
+        # Soluciones con el mismo vector de objetivos ofrecen el mismo compromiso:
+        # se conserva la primera encontrada
+        unique = {}
+        for solution in self.members + candidates:
+            unique.setdefault((solution.violations, solution.objectives), solution)
+        pool = list(unique.values())
+
+        self.members = [s for s in pool if not any(dominates(other, s) for other in pool if other is not s)]
+
+        if len(self.members) > self.max_size:
+            assign_crowding_distance(self.members)
+            self.members.sort(key=lambda s: -s.crowding)
+            del self.members[self.max_size:]
+
+
+def select_from_front(front: List[ParetoSolution],
+                      weights: Optional[Dict[str, float]] = None) -> Optional[ParetoSolution]:
+    """
+    Elige un compromiso del frente con pesos sobre objetivos normalizados.
+
+    Cambiar los pesos solo requiere volver a llamar a esta función, sin
+    resolver de nuevo la planificación.
+    """
+    if not front:
+        return None
+
+    weights = weights or {}
+    bounds = [
+        (min(s.objectives[m] for s in front), max(s.objectives[m] for s in front))
+        for m in range(len(OBJECTIVES))
+    ]
+
+    def utility(solution: ParetoSolution) -> float:
+        total = 0.0
+        for m, name in enumerate(OBJECTIVES):
+            low, high = bounds[m]
+            normalized = (solution.objectives[m] - low) / (high - low) if high > low else 1.0
+            total += weights.get(name, 1.0) * normalized
+        return total
+
+    return max(front, key=lambda s: (-s.violations, utility(s), s.objectives[0]))
@@ -0,0 +1,148 @@
+"""
+Índice de cierre transitivo de prerrequisitos por carrera
+Evita recorrer recursivamente Materia.prereq_materias con consultas ORM
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple
+import logging
+import time
+from django.core.cache import cache
+from ..models import Materia
+
+logger = logging.getLogger(__name__)
+
+CLOSURE_CACHE_KEY = 'planificacion:prereq_closure:{version}:{carrera_id}'
+CLOSURE_VERSION_KEY = 'planificacion:prereq_closure_version'
+
+
+class PrerequisiteClosure:
+    """
+    Cierre transitivo de prerrequisitos de una carrera.
+
+    Cada materia tiene una posición de bit; ``ancestors[i]`` contiene todos los
+    prerrequisitos (directos e indirectos) de la materia i y ``descendants[i]``
+    todas las materias que dependen de ella. Las consultas son O(1).
+    """
+
+    def __init__(self, carrera_id: int, materia_ids: Iterable[int], edges: Iterable[Tuple[int, int]]):
+        self.carrera_id = carrera_id
+        self.materia_ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+        for materia_id in materia_ids:
+            self._position(materia_id)
+
+        parents: Dict[int, Set[int]] = {}
+        children: Dict[int, Set[int]] = {}
+        for materia_id, prereq_id in edges:
+            m, p = self._position(materia_id), self._position(prereq_id)
+            if m == p:
+                continue
+            parents.setdefault(m, set()).add(p)
+            children.setdefault(p, set()).add(m)
+
+        size = len(self.materia_ids)
+        self.ancestors: List[int] = [0] * size
+        self.descendants: List[int] = [0] * size
+        self.depth: List[int] = [0] * size
+
+        order = self._topological_order(size, parents, children)
+
+        for i in order:
+            for p in parents.get(i, ()):
+                self.ancestors[i] |= (1 << p) | self.ancestors[p]
+                self.depth[i] = max(self.depth[i], self.depth[p] + 1)
+
+        for i in reversed(order):
+            for c in children.get(i, ()):
+                self.descendants[i] |= (1 << c) | self.descendants[c]
+
+    def _position(self, materia_id: int) -> int:
+        pos = self.positions.get(materia_id)
+        if pos is None:
+            pos = self.positions[materia_id] = len(self.materia_ids)
+            self.materia_ids.append(materia_id)
+        return pos
+
+    def _topological_order(self, size: int, parents: Dict[int, Set[int]],
+                           children: Dict[int, Set[int]]) -> List[int]:
+        """Orden topológico (Kahn); los ciclos se agregan al final con aviso"""
+        pending = {i: len(parents.get(i, ())) for i in range(size)}
+        queue = [i for i, count in pending.items() if count == 0]
+        order = []
+
+        while queue:
+            i = queue.pop()
+            order.append(i)
+            for c in children.get(i, ()):
+                pending[c] -= 1
+                if pending[c] == 0:
+                    queue.append(c)
+
+        if len(order) < size:
+            ciclo = [self.materia_ids[i] for i in range(size) if pending[i] > 0]
+            logger.warning(f"Ciclo de prerrequisitos en carrera {self.carrera_id}: materias {ciclo}")
+            order.extend(i for i in range(size) if pending[i] > 0)
+
+        return order
+
+    def requires(self, materia_id: int, prereq_id: int) -> bool:
+        """Indica si prereq_id es prerrequisito (directo o indirecto) de materia_id"""
+        m = self.positions.get(materia_id)
+        p = self.positions.get(prereq_id)
+        if m is None or p is None:
+            return False
+        return bool((self.ancestors[m] >> p) & 1)
+
+    def prerequisites_of(self, materia_id: int) -> Set[int]:
+        """Retorna los ids de todos los prerrequisitos de una materia"""
+        pos = self.positions.get(materia_id)
+        if pos is None:
+            return set()
+        return self._ids(self.ancestors[pos])
+
+    def depth_of(self, materia_id: int) -> int:
+        """Profundidad topológica: 0 para materias sin prerrequisitos"""
+        pos = self.positions.get(materia_id)
+        return self.depth[pos] if pos is not None else 0
+
+    def dependents_count(self, materia_id: int) -> int:
+        """Cantidad de materias que dependen (transitivamente) de esta materia"""
+        pos = self.positions.get(materia_id)
+        return bin(self.descendants[pos]).count('1') if pos is not None else 0
+
+    def _ids(self, bits: int) -> Set[int]:
+        ids = set()
+        while bits:
+            low = bits & -bits
+            ids.add(self.materia_ids[low.bit_length() - 1])
+            bits ^= low
+        return ids
+
+
+def build_prerequisite_closure(carrera_id: int) -> PrerequisiteClosure:
+    """Construye el cierre de una carrera con dos consultas"""
+    materia_ids = Materia.objects.filter(carrera_id=carrera_id).values_list('id', flat=True)
+    edges = Materia.prereq_materias.through.objects.filter(
+        from_materia__carrera_id=carrera_id
+    ).values_list('from_materia_id', 'to_materia_id')
+    return PrerequisiteClosure(carrera_id, list(materia_ids), list(edges))
+
+
+def _closure_version() -> int:
+    return cache.get_or_set(CLOSURE_VERSION_KEY, time.time_ns, timeout=None)
+
+
+def get_prerequisite_closure(carrera_id: int) -> PrerequisiteClosure:
+    """Retorna el cierre cacheado de una carrera, reconstruyéndolo si cambió el M2M"""
+    key = CLOSURE_CACHE_KEY.format(version=_closure_version(), carrera_id=carrera_id)
+    closure = cache.get(key)
+    if closure is None:
+        closure = build_prerequisite_closure(carrera_id)
+        cache.set(key, closure, timeout=None)
+    return closure
+
+
+def invalidate_prerequisite_closures():
+    """Invalida todos los cierres cacheados cambiando la versión"""
+    cache.set(CLOSURE_VERSION_KEY, time.time_ns(), timeout=None)
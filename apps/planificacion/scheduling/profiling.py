@@ -0,0 +1,161 @@
+"""
+Instrumentación por fases de los motores de planificación
+Mide tiempo de reloj y CPU, consultas a la base de datos y memoria pico por fase
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('cprofile', 'pyinstrument')
+
+
+@dataclass
+class PhaseMetrics:
+    """Métricas de una fase; las fases anidadas usan nombres con punto"""
+    name: str
+    wall_s: float
+    cpu_s: float
+    queries: int
+    query_time_s: float
+    peak_memory_kb: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _QueryCounter:
+    """Wrapper de ejecución de Django que cuenta y cronometra consultas"""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - start
+
+
+class PhaseProfiler:
+    """
+    Registra métricas por fase de una ejecución.
+
+    Las consultas se cuentan con ``connection.execute_wrapper``, por lo que
+    funciona sin DEBUG. La memoria pico requiere ``track_memory`` porque
+    tracemalloc ralentiza la ejecución.
+    """
+
+    def __init__(self, track_memory: bool = False, capture: Optional[str] = None):
+        if capture and capture not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfilado no soportado: {capture}")
+
+        self.track_memory = track_memory
+        self.capture = capture
+        self.phases: List[PhaseMetrics] = []
+        self.report = ""
+        self._stack: List[str] = []
+        # tracemalloc tiene un único pico global; cada fase abierta acumula
+        # aquí el pico observado antes de que una fase hija lo reinicie
+        self._peaks: List[int] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el bloque como una fase; anidar fases produce nombres 'padre.hija'"""
+        self._stack.append(name)
+        full_name = '.'.join(self._stack)
+        counter = _QueryCounter()
+
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            with connection.execute_wrapper(counter):
+                yield
+        finally:
+            peak_bytes = self._peaks.pop()
+            peak = None
+            if tracing:
+                peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak_bytes)
+                peak = round(peak_bytes / 1024, 1)
+
+            self.phases.append(PhaseMetrics(
+                name=full_name,
+                wall_s=round(time.perf_counter() - wall_start, 6),
+                cpu_s=round(time.process_time() - cpu_start, 6),
+                queries=counter.count,
+                query_time_s=round(counter.elapsed, 6),
+                peak_memory_kb=peak,
+            ))
+            self._stack.pop()
+
+    @contextmanager
+    def session(self):
+        """Envuelve la ejecución completa activando tracemalloc y el perfilador elegido"""
+        started_tracing = False
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        profiler = self._start_capture()
+        try:
+            yield self
+        finally:
+            self._stop_capture(profiler)
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _start_capture(self):
+        if self.capture == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("pyinstrument no está instalado; se usa cProfile")
+                self.capture = 'cprofile'
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+
+        if self.capture == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+
+        return None
+
+    def _stop_capture(self, profiler):
+        if profiler is None:
+            return
+
+        if self.capture == 'pyinstrument':
+            profiler.stop()
+            self.report = profiler.output_text()
+        else:
+            profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(30)
+            self.report = stream.getvalue()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [phase.to_dict() for phase in self.phases]
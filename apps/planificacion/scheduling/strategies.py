@@ -2,14 +2,20 @@
 Implementaciones específicas de estrategias de planificación automática
 """
 
-import random
-from typing import List, Dict, Set
+from typing import List, Dict, Optional
 from django.db.models import Count, Q
-from .base import BaseSchedulingEngine, SchedulingAssignment, SchedulingStrategy
+from .base import BaseSchedulingEngine, SchedulingAssignment, SchedulingStrategy, DocentePreferenceConstraint
+from .feasibility import FeasibilityAnalyzer
+from .index import OccupancyIndex
+from .prerequisites import PrerequisiteClosure, get_prerequisite_closure
+from .checkpoint import save_checkpoint, load_checkpoint, delete_checkpoint
+from .history import compute_input_fingerprint
+from .pareto import ParetoArchive, ParetoSolution, crowded_better, evaluate_objectives, select_from_front, select_survivors
 from ..models import PlanificacionAcademica, FranjaHoraria
 from apps.asignaciones.models import AsignacionDocente, HorarioClase
 from apps.aulas.models import Aula
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -19,33 +25,34 @@ class DocentePriorityEngine(BaseSchedulingEngine):
     Estrategia que prioriza las preferencias y disponibilidad de los docentes
     """
 
-    def __init__(self):
-        super().__init__(SchedulingStrategy.DOCENTE_PRIORITY)
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(SchedulingStrategy.DOCENTE_PRIORITY, seed)
 
     def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
         """Genera asignaciones priorizando docentes"""
         assignments = []
 
-        # Obtener todas las asignaciones docente-materia
-        asignaciones = AsignacionDocente.objects.filter(
-            planificacion=planificacion,
-            is_activa=True
-        ).select_related('docente', 'materia').order_by('docente__last_name')
+        with self.phase('load_data'):
+            # Obtener todas las asignaciones docente-materia
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia').order_by('docente__last_name'))
 
-        # Obtener franjas horarias disponibles
-        franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
+            # Obtener franjas horarias disponibles
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
 
-        # Obtener aulas disponibles
-        aulas = list(Aula.objects.filter(is_disponible=True).order_by('capacidad'))
+            # Obtener aulas disponibles
+            aulas = list(Aula.objects.filter(is_disponible=True).order_by('capacidad'))
 
-        # Tracking de asignaciones por docente y franja
-        docente_franjas_usadas = {}
-        aula_franjas_usadas = set()
+        # Tracking de ocupación por docente, aula y cohorte
+        occupancy = self.build_occupancy_index(franjas, asignaciones, aulas)
 
         for asignacion in asignaciones:
+            if self.should_stop():
+                break
+
             docente_id = asignacion.docente.id
-            if docente_id not in docente_franjas_usadas:
-                docente_franjas_usadas[docente_id] = set()
 
             # Buscar la mejor franja y aula para esta asignación
             best_assignment = None
@@ -53,12 +60,16 @@ class DocentePriorityEngine(BaseSchedulingEngine):
 
             for franja in franjas:
                 # Skip si el docente ya tiene clase en esta franja
-                if franja.id in docente_franjas_usadas[docente_id]:
+                if not occupancy.docente_free(docente_id, franja):
+                    continue
+
+                # Skip si otra materia de la misma cohorte ocupa la franja
+                if not occupancy.cohort_free(asignacion, franja):
                     continue
 
                 for aula in aulas:
                     # Skip si el aula ya está ocupada en esta franja
-                    if (aula.id, franja.id) in aula_franjas_usadas:
+                    if not occupancy.aula_free(aula.id, franja):
                         continue
 
                     # Calcular capacidad apropiada (80% de la capacidad del aula)
@@ -73,7 +84,7 @@ class DocentePriorityEngine(BaseSchedulingEngine):
                     )
 
                     # Calcular score para esta combinación
-                    score = self._calculate_docente_priority_score(assignment, asignaciones)
+                    score = self._calculate_docente_priority_score(assignment, asignaciones) + self.soft_adjustment(assignment)
 
                     if score > best_score:
                         best_score = score
@@ -81,8 +92,7 @@ class DocentePriorityEngine(BaseSchedulingEngine):
 
             if best_assignment:
                 # Marcar como usado
-                docente_franjas_usadas[docente_id].add(best_assignment.franja_horaria.id)
-                aula_franjas_usadas.add((best_assignment.aula.id, best_assignment.franja_horaria.id))
+                occupancy.reserve(best_assignment)
 
                 best_assignment.score = best_score
                 assignments.append(best_assignment)
@@ -125,28 +135,35 @@ class AulaOptimizationEngine(BaseSchedulingEngine):
     Estrategia que optimiza el uso eficiente de las aulas
     """
 
-    def __init__(self):
-        super().__init__(SchedulingStrategy.AULA_OPTIMIZATION)
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(SchedulingStrategy.AULA_OPTIMIZATION, seed)
+
+    def create_feasibility_analyzer(self) -> FeasibilityAnalyzer:
+        # Este motor descarta aulas con capacidad menor a la demanda estimada
+        return FeasibilityAnalyzer(capacity_estimator=self._estimate_capacity_needed)
 
     def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
         """Genera asignaciones optimizando uso de aulas"""
         assignments = []
 
-        # Obtener asignaciones ordenadas por capacidad requerida (descendente)
-        asignaciones = AsignacionDocente.objects.filter(
-            planificacion=planificacion,
-            is_activa=True
-        ).select_related('docente', 'materia').order_by('-materia__horas_semanales')
+        with self.phase('load_data'):
+            # Obtener asignaciones ordenadas por capacidad requerida (descendente)
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia').order_by('-materia__horas_semanales'))
 
-        # Obtener aulas ordenadas por capacidad
-        aulas = list(Aula.objects.filter(is_disponible=True).order_by('capacidad'))
-        franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
+            # Obtener aulas ordenadas por capacidad
+            aulas = list(Aula.objects.filter(is_disponible=True).order_by('capacidad'))
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
 
         # Tracking de uso de recursos
-        aula_ocupacion = {aula.id: [] for aula in aulas}
-        docente_horarios = {}
+        occupancy = self.build_occupancy_index(franjas, asignaciones, aulas)
 
         for asignacion in asignaciones:
+            if self.should_stop():
+                break
+
             # Estimar capacidad requerida basada en la materia
             capacidad_requerida = self._estimate_capacity_needed(asignacion)
 
@@ -159,8 +176,8 @@ class AulaOptimizationEngine(BaseSchedulingEngine):
 
                 for franja in franjas:
                     # Verificar disponibilidad
-                    if self._is_aula_available(aula, franja, aula_ocupacion):
-                        if self._is_docente_available(asignacion.docente, franja, docente_horarios):
+                    if self._is_aula_available(aula, franja, occupancy):
+                        if self._is_docente_available(asignacion, franja, occupancy):
 
                             assignment = SchedulingAssignment(
                                 asignacion_docente=asignacion,
@@ -171,7 +188,7 @@ class AulaOptimizationEngine(BaseSchedulingEngine):
                             )
 
                             # Calcular eficiencia de uso del aula
-                            efficiency = self._calculate_aula_efficiency(assignment)
+                            efficiency = self._calculate_aula_efficiency(assignment) + self.soft_adjustment(assignment)
 
                             if efficiency > best_efficiency:
                                 best_efficiency = efficiency
@@ -179,15 +196,7 @@ class AulaOptimizationEngine(BaseSchedulingEngine):
 
             if best_assignment:
                 # Marcar recursos como usados
-                aula_id = best_assignment.aula.id
-                franja_id = best_assignment.franja_horaria.id
-                docente_id = best_assignment.asignacion_docente.docente.id
-
-                aula_ocupacion[aula_id].append(franja_id)
-
-                if docente_id not in docente_horarios:
-                    docente_horarios[docente_id] = []
-                docente_horarios[docente_id].append(franja_id)
+                occupancy.reserve(best_assignment)
 
                 best_assignment.score = best_efficiency
                 assignments.append(best_assignment)
@@ -195,26 +204,15 @@ class AulaOptimizationEngine(BaseSchedulingEngine):
         logger.info(f"AulaOptimization generó {len(assignments)} asignaciones")
         return assignments
 
-    def _estimate_capacity_needed(self, asignacion: AsignacionDocente) -> int:
-        """Estima la capacidad de estudiantes necesaria"""
-        # Lógica básica - se puede mejorar con datos históricos
-        base_capacity = 25
-
-        # Ajustar según el semestre de la materia
-        if asignacion.materia.semestre <= 2:
-            return base_capacity + 10  # Semestres iniciales más concurridos
-        elif asignacion.materia.semestre >= 7:
-            return base_capacity - 5   # Semestres avanzados menos concurridos
-
-        return base_capacity
-
-    def _is_aula_available(self, aula: Aula, franja: FranjaHoraria, ocupacion: Dict) -> bool:
+    def _is_aula_available(self, aula: Aula, franja: FranjaHoraria, occupancy: OccupancyIndex) -> bool:
         """Verifica si un aula está disponible en una franja"""
-        return franja.id not in ocupacion[aula.id]
+        return occupancy.aula_free(aula.id, franja)
 
-    def _is_docente_available(self, docente, franja: FranjaHoraria, horarios: Dict) -> bool:
-        """Verifica si un docente está disponible en una franja"""
-        return docente.id not in horarios or franja.id not in horarios[docente.id]
+    def _is_docente_available(self, asignacion: AsignacionDocente, franja: FranjaHoraria,
+                              occupancy: OccupancyIndex) -> bool:
+        """Verifica si el docente y la cohorte de la asignación están libres en una franja"""
+        return (occupancy.docente_free(asignacion.docente_id, franja)
+                and occupancy.cohort_free(asignacion, franja))
 
     def _calculate_aula_efficiency(self, assignment: SchedulingAssignment) -> float:
         """Calcula la eficiencia de uso del aula"""
@@ -247,20 +245,21 @@ class BalancedDistributionEngine(BaseSchedulingEngine):
     Estrategia que busca una distribución equilibrada de la carga horaria
     """
 
-    def __init__(self):
-        super().__init__(SchedulingStrategy.BALANCED_DISTRIBUTION)
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(SchedulingStrategy.BALANCED_DISTRIBUTION, seed)
 
     def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
         """Genera asignaciones con distribución equilibrada"""
         assignments = []
 
-        asignaciones = list(AsignacionDocente.objects.filter(
-            planificacion=planificacion,
-            is_activa=True
-        ).select_related('docente', 'materia'))
+        with self.phase('load_data'):
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia'))
 
-        franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
-        aulas = list(Aula.objects.filter(is_disponible=True))
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
+            aulas = list(Aula.objects.filter(is_disponible=True))
 
         # Agrupar franjas por día para distribución equilibrada
         franjas_por_dia = {}
@@ -272,51 +271,58 @@ class BalancedDistributionEngine(BaseSchedulingEngine):
 
         # Tracking de distribución
         ocupacion_por_dia = {dia: 0 for dia in franjas_por_dia.keys()}
-        recursos_usados = set()  # (docente_id, franja_id) y (aula_id, franja_id)
+        occupancy = self.build_occupancy_index(franjas, asignaciones, aulas)
 
         # Distribuir asignaciones de manera equilibrada
         dias_disponibles = list(franjas_por_dia.keys())
 
         for i, asignacion in enumerate(asignaciones):
-            # Seleccionar día con menos carga
-            dia_seleccionado = min(ocupacion_por_dia.keys(), key=lambda d: ocupacion_por_dia[d])
+            if self.should_stop():
+                break
 
             best_assignment = None
             best_score = -1
 
-            for franja in franjas_por_dia[dia_seleccionado]:
-                # Verificar disponibilidad del docente
-                if (asignacion.docente.id, franja.id) in recursos_usados:
-                    continue
-
-                for aula in aulas:
-                    # Verificar disponibilidad del aula
-                    if (aula.id, franja.id) in recursos_usados:
+            # Día con menos carga; si el docente o la cohorte no tienen lugar ese
+            # día (p. ej. franjas no disponibles) se prueba el siguiente
+            for dia_seleccionado in sorted(ocupacion_por_dia.keys(), key=lambda d: ocupacion_por_dia[d]):
+                for franja in franjas_por_dia[dia_seleccionado]:
+                    # Verificar disponibilidad del docente y de su cohorte
+                    if not occupancy.docente_free(asignacion.docente.id, franja):
+                        continue
+                    if not occupancy.cohort_free(asignacion, franja):
                         continue
 
-                    capacidad = min(30, int(aula.capacidad * 0.8))
+                    for aula in aulas:
+                        # Verificar disponibilidad del aula
+                        if not occupancy.aula_free(aula.id, franja):
+                            continue
 
-                    assignment = SchedulingAssignment(
-                        asignacion_docente=asignacion,
-                        franja_horaria=franja,
-                        aula=aula,
-                        capacidad_estudiantes=capacidad,
-                        modalidad='presencial'
-                    )
+                        capacidad = min(30, int(aula.capacidad * 0.8))
 
-                    score = self._calculate_balance_score(assignment, ocupacion_por_dia)
+                        assignment = SchedulingAssignment(
+                            asignacion_docente=asignacion,
+                            franja_horaria=franja,
+                            aula=aula,
+                            capacidad_estudiantes=capacidad,
+                            modalidad='presencial'
+                        )
 
-                    if score > best_score:
-                        best_score = score
-                        best_assignment = assignment
+                        score = self._calculate_balance_score(assignment, ocupacion_por_dia) + self.soft_adjustment(assignment)
+
+                        if score > best_score:
+                            best_score = score
+                            best_assignment = assignment
+
+                if best_assignment:
+                    break
 
             if best_assignment:
                 # Actualizar contadores
                 dia = best_assignment.franja_horaria.dia_semana
                 ocupacion_por_dia[dia] += 1
 
-                recursos_usados.add((best_assignment.asignacion_docente.docente.id, best_assignment.franja_horaria.id))
-                recursos_usados.add((best_assignment.aula.id, best_assignment.franja_horaria.id))
+                occupancy.reserve(best_assignment)
 
                 best_assignment.score = best_score
                 assignments.append(best_assignment)
@@ -351,50 +357,345 @@ class BalancedDistributionEngine(BaseSchedulingEngine):
         return score
 
 
+class PrerequisiteBasedEngine(BaseSchedulingEngine):
+    """
+    Estrategia que ordena la colocación según la malla de prerrequisitos
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(SchedulingStrategy.PREREQUISITE_BASED, seed)
+
+    def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
+        """Genera asignaciones colocando primero las materias base de la malla"""
+        assignments = []
+
+        with self.phase('load_data'):
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia', 'materia__carrera'))
+
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
+            aulas = list(Aula.objects.filter(is_disponible=True).select_related('tipo').order_by('capacidad'))
+
+            # Un cierre transitivo por carrera (cacheado hasta que cambie el M2M)
+            closures = {
+                carrera_id: get_prerequisite_closure(carrera_id)
+                for carrera_id in {a.materia.carrera_id for a in asignaciones}
+            }
+
+        # Orden topológico: menor profundidad primero y, a igual profundidad,
+        # las materias de las que dependen más materias
+        asignaciones.sort(key=lambda a: (
+            closures[a.materia.carrera_id].depth_of(a.materia_id),
+            -closures[a.materia.carrera_id].dependents_count(a.materia_id),
+            a.materia.semestre,
+        ))
+
+        occupancy = self.build_occupancy_index(franjas, asignaciones, aulas)
+
+        for asignacion in asignaciones:
+            if self.should_stop():
+                break
+
+            closure = closures[asignacion.materia.carrera_id]
+            best_assignment = None
+            best_score = -1
+
+            for franja in franjas:
+                if not occupancy.docente_free(asignacion.docente_id, franja):
+                    continue
+                if not occupancy.cohort_free(asignacion, franja):
+                    continue
+
+                for aula in aulas:
+                    if not occupancy.aula_free(aula.id, franja):
+                        continue
+
+                    capacidad = min(30, int(aula.capacidad * 0.8))
+
+                    assignment = SchedulingAssignment(
+                        asignacion_docente=asignacion,
+                        franja_horaria=franja,
+                        aula=aula,
+                        capacidad_estudiantes=capacidad,
+                        modalidad='presencial'
+                    )
+
+                    score = self._calculate_prerequisite_score(assignment, closure) + self.soft_adjustment(assignment)
+
+                    if score > best_score:
+                        best_score = score
+                        best_assignment = assignment
+
+            if best_assignment:
+                occupancy.reserve(best_assignment)
+                best_assignment.score = best_score
+                assignments.append(best_assignment)
+
+        logger.info(f"PrerequisiteBased generó {len(assignments)} asignaciones")
+        return assignments
+
+    def _calculate_prerequisite_score(self, assignment: SchedulingAssignment,
+                                      closure: PrerequisiteClosure) -> float:
+        """Calcula score favoreciendo buenos horarios para materias troncales"""
+        score = 100.0
+        materia = assignment.asignacion_docente.materia
+
+        # Las materias de las que dependen otras reciben los horarios matutinos
+        dependientes = closure.dependents_count(materia.id)
+        if assignment.franja_horaria.hora_inicio.hour < 12:
+            score += min(dependientes, 5) * 5
+
+        # Penalización por aulas muy grandes para grupos pequeños (desperdicio)
+        if assignment.aula.capacidad > assignment.capacidad_estudiantes * 2:
+            score -= 10
+
+        materia_nombre = materia.nombre.lower()
+        aula_tipo = assignment.aula.tipo.nombre.lower()
+
+        if 'laboratorio' in materia_nombre and 'laboratorio' in aula_tipo:
+            score += 30
+        elif 'laboratorio' not in materia_nombre and 'magistral' in aula_tipo:
+            score += 20
+
+        return score
+
+
+class MixedModalityEngine(BaseSchedulingEngine):
+    """
+    Estrategia que envía secciones a modalidad híbrida o virtual cuando
+    las aulas están saturadas, maximizando los estudiantes en modalidad presencial
+    """
+
+    def __init__(self, hybrid_min_ratio: float = 0.5, seed: Optional[int] = None):
+        super().__init__(SchedulingStrategy.MIXED_MODALITY, seed)
+        # Fracción mínima de la sección que debe caber en el aula para ser híbrida
+        self.hybrid_min_ratio = hybrid_min_ratio
+
+    def create_feasibility_analyzer(self) -> FeasibilityAnalyzer:
+        # Las secciones sin aula pueden pasar a modalidad virtual
+        return FeasibilityAnalyzer(capacity_estimator=self._estimate_capacity_needed, allow_virtual=True)
+
+    def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
+        """Genera asignaciones presenciales y descarga el excedente a híbrida/virtual"""
+        assignments = []
+
+        with self.phase('load_data'):
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia'))
+
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('dia_semana', 'hora_inicio'))
+            aulas = list(Aula.objects.filter(is_disponible=True).select_related('tipo').order_by('capacidad'))
+
+        occupancy = self.build_occupancy_index(franjas, asignaciones, aulas)
+        demanda = {a.id: self._estimate_capacity_needed(a) for a in asignaciones}
+
+        # Las secciones más grandes reciben aula primero: así se maximiza
+        # la cantidad de estudiantes que asisten de forma presencial
+        asignaciones.sort(key=lambda a: -demanda[a.id])
+
+        pendientes = []
+        for asignacion in asignaciones:
+            if self.should_stop():
+                break
+
+            assignment = self._best_presencial(asignacion, demanda[asignacion.id], franjas, aulas, occupancy)
+            if assignment:
+                occupancy.reserve(assignment)
+                assignments.append(assignment)
+            else:
+                pendientes.append(asignacion)
+
+        # Aulas saturadas: híbrida si parte de la sección cabe en un aula libre,
+        # de lo contrario virtual (sin ocupar aula)
+        for asignacion in pendientes:
+            if self.should_stop():
+                break
+
+            assignment = (
+                self._best_hibrida(asignacion, demanda[asignacion.id], franjas, aulas, occupancy)
+                or self._best_virtual(asignacion, demanda[asignacion.id], franjas, occupancy)
+            )
+            if assignment:
+                occupancy.reserve(assignment)
+                assignments.append(assignment)
+
+        por_modalidad = {}
+        for assignment in assignments:
+            por_modalidad[assignment.modalidad] = por_modalidad.get(assignment.modalidad, 0) + 1
+        logger.info(f"MixedModality generó {len(assignments)} asignaciones: {por_modalidad}")
+        return assignments
+
+    def _free_franjas(self, asignacion: AsignacionDocente, franjas: List, occupancy: OccupancyIndex):
+        """Franjas en las que el docente y la cohorte de la asignación están libres"""
+        for franja in franjas:
+            if occupancy.docente_free(asignacion.docente_id, franja) and occupancy.cohort_free(asignacion, franja):
+                yield franja
+
+    def _best_presencial(self, asignacion: AsignacionDocente, demanda: int, franjas: List,
+                         aulas: List, occupancy: OccupancyIndex):
+        """Aula libre más ajustada a la demanda entre las franjas disponibles"""
+        best = None
+        for franja in self._free_franjas(asignacion, franjas, occupancy):
+            # Aulas ordenadas por capacidad: la primera libre que alcanza es la más ajustada
+            for aula in aulas:
+                if aula.capacidad < demanda or not occupancy.aula_free(aula.id, franja):
+                    continue
+                candidate = SchedulingAssignment(
+                    asignacion_docente=asignacion,
+                    franja_horaria=franja,
+                    aula=aula,
+                    capacidad_estudiantes=demanda,
+                    modalidad='presencial'
+                )
+                candidate.score = 100.0 - (aula.capacidad - demanda) + self.soft_adjustment(candidate)
+                if best is None or candidate.score > best.score:
+                    best = candidate
+                break
+        return best
+
+    def _best_hibrida(self, asignacion: AsignacionDocente, demanda: int, franjas: List,
+                      aulas: List, occupancy: OccupancyIndex):
+        """Aula libre más grande, si al menos una fracción de la sección cabe en ella"""
+        minimo = demanda * self.hybrid_min_ratio
+        best = None
+        for franja in self._free_franjas(asignacion, franjas, occupancy):
+            for aula in reversed(aulas):
+                if aula.capacidad < minimo:
+                    break
+                if not occupancy.aula_free(aula.id, franja):
+                    continue
+                candidate = SchedulingAssignment(
+                    asignacion_docente=asignacion,
+                    franja_horaria=franja,
+                    aula=aula,
+                    capacidad_estudiantes=min(demanda, aula.capacidad),
+                    modalidad='hibrida'
+                )
+                candidate.score = 60.0 * aula.capacidad / demanda + self.soft_adjustment(candidate)
+                if best is None or candidate.score > best.score:
+                    best = candidate
+                break
+        return best
+
+    def _best_virtual(self, asignacion: AsignacionDocente, demanda: int, franjas: List,
+                      occupancy: OccupancyIndex):
+        """Primera franja libre para docente y cohorte; no consume aula"""
+        for franja in self._free_franjas(asignacion, franjas, occupancy):
+            return SchedulingAssignment(
+                asignacion_docente=asignacion,
+                franja_horaria=franja,
+                aula=None,
+                capacidad_estudiantes=demanda,
+                modalidad='virtual',
+                score=40.0
+            )
+        return None
+
+
 class GeneticAlgorithmEngine(BaseSchedulingEngine):
     """
     Estrategia avanzada usando algoritmo genético para optimización global
     """
 
-    def __init__(self, population_size: int = 50, generations: int = 100):
-        super().__init__(SchedulingStrategy.GENETIC_ALGORITHM)
+    def __init__(self, population_size: int = 50, generations: int = 100, seed: Optional[int] = None,
+                 checkpoint_id: Optional[str] = None, checkpoint_interval: float = 5.0, resume: bool = False):
+        super().__init__(SchedulingStrategy.GENETIC_ALGORITHM, seed)
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = 0.1
+        # Checkpoints periódicos (ver checkpoint.py); sin checkpoint_id no se escriben
+        self.checkpoint_id = checkpoint_id
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
 
     def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
         """Genera asignaciones usando algoritmo genético"""
         logger.info(f"Iniciando algoritmo genético: población={self.population_size}, generaciones={self.generations}")
 
-        asignaciones = list(AsignacionDocente.objects.filter(
-            planificacion=planificacion,
-            is_activa=True
-        ).select_related('docente', 'materia'))
+        with self.phase('load_data'):
+            # Orden explícito para que la misma semilla produzca el mismo horario
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia').order_by('id'))
 
-        franjas = list(FranjaHoraria.objects.filter(is_activa=True))
-        aulas = list(Aula.objects.filter(is_disponible=True))
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('id'))
+            aulas = list(Aula.objects.filter(is_disponible=True).order_by('id'))
 
         if not asignaciones or not franjas or not aulas:
             return []
 
-        # Crear población inicial
-        population = self._create_initial_population(asignaciones, franjas, aulas)
+        self.build_occupancy_index(franjas, asignaciones, aulas)
+
+        fingerprint = compute_input_fingerprint(planificacion) if self.checkpoint_id else None
+        checkpoint = load_checkpoint(self.checkpoint_id) if self.checkpoint_id and self.resume else None
+
+        if checkpoint:
+            if checkpoint.planificacion_id != planificacion.id or checkpoint.input_fingerprint != fingerprint:
+                raise ValueError(
+                    f"El checkpoint {self.checkpoint_id} no corresponde a los datos actuales de la planificación"
+                )
+
+            # Reanudar exactamente donde quedó: población, generación y estado del RNG
+            lookup = (
+                {a.id: a for a in asignaciones},
+                {f.id: f for f in franjas},
+                {a.id: a for a in aulas},
+            )
+            population = [self._decode_individual(individual, *lookup) for individual in checkpoint.population]
+            best_so_far = self._decode_individual(checkpoint.best_so_far, *lookup)
+            best_so_far_fitness = checkpoint.best_fitness
+            self.rng.setstate(checkpoint.rng_state)
+            start_generation = checkpoint.generation
+            logger.info(f"Reanudando algoritmo genético {self.checkpoint_id} en la generación {start_generation}")
+        else:
+            # Crear población inicial
+            population = self._create_initial_population(asignaciones, franjas, aulas)
+
+            # Mejor individuo evaluado hasta ahora, por si la ejecución se cancela
+            best_so_far, best_so_far_fitness = population[0], float('-inf')
+            start_generation = 0
+
+        last_checkpoint = time.monotonic()
 
         # Evolucionar durante las generaciones especificadas
-        for generation in range(self.generations):
+        for generation in range(start_generation, self.generations):
+            stop = self.should_stop()
+
+            # El checkpoint se toma al inicio de la generación, antes de usar el RNG
+            if self.checkpoint_id and (stop or time.monotonic() - last_checkpoint >= self.checkpoint_interval):
+                save_checkpoint(
+                    self.checkpoint_id, planificacion.id, fingerprint, self.seed,
+                    self.population_size, self.generations, generation, self.rng.getstate(),
+                    best_so_far, best_so_far_fitness, population
+                )
+                last_checkpoint = time.monotonic()
+
+            if stop:
+                logger.info(f"Algoritmo genético cancelado en la generación {generation}")
+                return best_so_far
+
             # Evaluar fitness de cada individuo
             fitness_scores = [self._evaluate_fitness(individual) for individual in population]
 
+            generation_best = max(range(len(population)), key=fitness_scores.__getitem__)
+            if fitness_scores[generation_best] > best_so_far_fitness:
+                best_so_far, best_so_far_fitness = population[generation_best], fitness_scores[generation_best]
+
             # Seleccionar mejores individuos para reproducción
             selected = self._selection(population, fitness_scores)
 
             # Crear nueva generación
             new_population = []
             while len(new_population) < self.population_size:
-                parent1, parent2 = random.sample(selected, 2)
+                parent1, parent2 = self.rng.sample(selected, 2)
                 child = self._crossover(parent1, parent2)
 
-                if random.random() < self.mutation_rate:
+                if self.rng.random() < self.mutation_rate:
                     child = self._mutate(child, franjas, aulas)
 
                 new_population.append(child)
@@ -409,29 +710,45 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
         final_fitness = [self._evaluate_fitness(individual) for individual in population]
         best_individual = population[final_fitness.index(max(final_fitness))]
 
+        if self.checkpoint_id:
+            delete_checkpoint(self.checkpoint_id)
+
         logger.info(f"Algoritmo genético completado. Fitness final: {max(final_fitness):.2f}")
         return best_individual
 
+    def _decode_individual(self, encoded: List, asignaciones: Dict, franjas: Dict, aulas: Dict) -> List[SchedulingAssignment]:
+        """Reconstruye un individuo desde su codificación compacta"""
+        return [
+            SchedulingAssignment(
+                asignacion_docente=asignaciones[gene.asignacion_id],
+                franja_horaria=franjas[gene.franja_id],
+                aula=aulas.get(gene.aula_id),
+                capacidad_estudiantes=gene.capacidad,
+                modalidad=gene.modalidad
+            )
+            for gene in encoded
+        ]
+
     def _create_initial_population(self, asignaciones: List, franjas: List, aulas: List) -> List[List[SchedulingAssignment]]:
         """Crea población inicial aleatoria"""
         population = []
 
         for _ in range(self.population_size):
+            # Al cancelar basta con un individuo para retornar algo utilizable
+            if population and self.should_stop():
+                break
+
             individual = []
-            used_resources = set()
+            occupancy = self.apply_availability(OccupancyIndex(franjas, asignaciones))
 
             for asignacion in asignaciones:
                 # Intentar asignar horario para esta materia
                 attempts = 0
                 while attempts < 50:  # Máximo 50 intentos por asignación
-                    franja = random.choice(franjas)
-                    aula = random.choice(aulas)
+                    franja = self.rng.choice(franjas)
+                    aula = self.rng.choice(aulas)
 
-                    resource_key = (asignacion.docente.id, franja.id, aula.id)
-                    docente_franja = (asignacion.docente.id, franja.id)
-                    aula_franja = (aula.id, franja.id)
-
-                    if docente_franja not in used_resources and aula_franja not in used_resources:
+                    if occupancy.is_free(asignacion, aula, franja):
                         capacidad = min(30, int(aula.capacidad * 0.8))
 
                         assignment = SchedulingAssignment(
@@ -443,8 +760,7 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
                         )
 
                         individual.append(assignment)
-                        used_resources.add(docente_franja)
-                        used_resources.add(aula_franja)
+                        occupancy.reserve(assignment)
                         break
 
                     attempts += 1
@@ -465,13 +781,17 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
             else:
                 fitness += 50   # Bonificación por asignación válida
 
-            # Agregar score de la asignación individual
-            fitness += self.calculate_assignment_score(assignment)
+            # Agregar score de la asignación individual y la preferencia del docente
+            fitness += self.calculate_assignment_score(assignment) + self.preference_bonus(assignment)
 
         # Bonificación por completitud (cuántas asignaciones se lograron)
         completeness_bonus = len(individual) * 10
         fitness += completeness_bonus
 
+        # Penalización por minutos de retraso entre clases consecutivas del docente
+        if self.travel_model is not None:
+            fitness -= self.travel_penalty_per_minute * self.travel_model.total_lateness(individual)
+
         return fitness
 
     def _selection(self, population: List, fitness_scores: List[float]) -> List:
@@ -481,7 +801,7 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
 
         for _ in range(len(population) // 2):
             # Selección por torneo
-            tournament_indices = random.sample(range(len(population)), tournament_size)
+            tournament_indices = self.rng.sample(range(len(population)), tournament_size)
             winner_index = max(tournament_indices, key=lambda i: fitness_scores[i])
             selected.append(population[winner_index])
 
@@ -493,23 +813,18 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
             return parent1 if parent1 else parent2
 
         # Crossover de un punto
-        crossover_point = random.randint(1, min(len(parent1), len(parent2)) - 1)
+        crossover_point = self.rng.randint(1, min(len(parent1), len(parent2)) - 1)
 
         child = parent1[:crossover_point] + parent2[crossover_point:]
 
-        # Eliminar asignaciones duplicadas (mismo docente en misma franja)
-        seen_docente_franja = set()
-        seen_aula_franja = set()
+        # Eliminar asignaciones en conflicto (docente, aula o cohorte en misma franja)
+        occupancy = OccupancyIndex()
         valid_child = []
 
         for assignment in child:
-            docente_franja = (assignment.asignacion_docente.docente.id, assignment.franja_horaria.id)
-            aula_franja = (assignment.aula.id, assignment.franja_horaria.id)
-
-            if docente_franja not in seen_docente_franja and aula_franja not in seen_aula_franja:
+            if occupancy.is_free(assignment.asignacion_docente, assignment.aula, assignment.franja_horaria):
                 valid_child.append(assignment)
-                seen_docente_franja.add(docente_franja)
-                seen_aula_franja.add(aula_franja)
+                occupancy.reserve(assignment)
 
         return valid_child
 
@@ -519,13 +834,13 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
             return individual
 
         # Mutar una asignación aleatoria
-        mutation_index = random.randint(0, len(individual) - 1)
+        mutation_index = self.rng.randint(0, len(individual) - 1)
         assignment = individual[mutation_index]
 
         # Cambiar franja o aula aleatoriamente
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             # Cambiar franja horaria
-            new_franja = random.choice(franjas)
+            new_franja = self.rng.choice(franjas)
             individual[mutation_index] = SchedulingAssignment(
                 asignacion_docente=assignment.asignacion_docente,
                 franja_horaria=new_franja,
@@ -535,7 +850,7 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
             )
         else:
             # Cambiar aula
-            new_aula = random.choice(aulas)
+            new_aula = self.rng.choice(aulas)
             capacidad = min(30, int(new_aula.capacidad * 0.8))
             individual[mutation_index] = SchedulingAssignment(
                 asignacion_docente=assignment.asignacion_docente,
@@ -548,6 +863,122 @@ class GeneticAlgorithmEngine(BaseSchedulingEngine):
         return individual
 
 
+class MultiObjectiveEngine(GeneticAlgorithmEngine):
+    """
+    Optimización multiobjetivo estilo NSGA-II sobre los operadores del algoritmo
+    genético. Mantiene un archivo de soluciones no dominadas y retorna el frente
+    de Pareto junto con el compromiso elegido según ``weights``.
+    """
+
+    def __init__(self, population_size: int = 50, generations: int = 100, seed: Optional[int] = None,
+                 weights: Optional[Dict[str, float]] = None, archive_size: int = 50):
+        super().__init__(population_size, generations, seed)
+        self.strategy = SchedulingStrategy.MULTI_OBJECTIVE
+        self.weights = weights or {}
+        self.archive_size = archive_size
+        self._validity_cache: Dict[tuple, bool] = {}
+
+    def generate_assignments(self, planificacion: PlanificacionAcademica) -> List[SchedulingAssignment]:
+        """Evoluciona la población con ordenamiento no dominado y retorna el compromiso elegido"""
+        logger.info(f"Iniciando NSGA-II: población={self.population_size}, generaciones={self.generations}")
+
+        with self.phase('load_data'):
+            asignaciones = list(AsignacionDocente.objects.filter(
+                planificacion=planificacion,
+                is_activa=True
+            ).select_related('docente', 'materia').order_by('id'))
+
+            franjas = list(FranjaHoraria.objects.filter(is_activa=True).order_by('id'))
+            aulas = list(Aula.objects.filter(is_disponible=True).order_by('id'))
+
+        if not asignaciones or not franjas or not aulas:
+            return []
+
+        self.build_occupancy_index(franjas, asignaciones, aulas)
+
+        # La validez de cada gen solo depende del estado guardado: se cachea por ejecución
+        for constraint in self.constraints:
+            constraint.reset()
+        self._validity_cache = {}
+
+        demanda = {a.id: self._estimate_capacity_needed(a) for a in asignaciones}
+        dias = sorted({f.dia_semana for f in franjas})
+        preference = next((c for c in self.constraints if isinstance(c, DocentePreferenceConstraint)), None)
+
+        def evaluate(individual: List[SchedulingAssignment]) -> ParetoSolution:
+            return ParetoSolution(
+                assignments=individual,
+                objectives=evaluate_objectives(
+                    individual,
+                    demand=lambda asignacion: demanda[asignacion.id],
+                    preference=lambda a: 1.0 if preference is None or preference.validate(a)[0] else 0.0,
+                    dias=dias,
+                    lateness=self.travel_model.total_lateness
+                ),
+                violations=sum(1 for a in individual if not self._gene_valid(a))
+            )
+
+        population = select_survivors(
+            [evaluate(individual) for individual in self._create_initial_population(asignaciones, franjas, aulas)],
+            self.population_size
+        )
+        archive = ParetoArchive(self.archive_size)
+        archive.update(population)
+
+        for generation in range(self.generations):
+            if self.should_stop():
+                logger.info(f"NSGA-II cancelado en la generación {generation}")
+                break
+
+            # Torneo binario por rango y distancia de hacinamiento
+            offspring = []
+            while len(offspring) < self.population_size:
+                parent1 = crowded_better(self.rng.choice(population), self.rng.choice(population))
+                parent2 = crowded_better(self.rng.choice(population), self.rng.choice(population))
+                offspring.append(evaluate(self._breed(parent1.assignments, parent2.assignments, franjas, aulas)))
+
+            population = select_survivors(population + offspring, self.population_size)
+            archive.update(offspring)
+
+        self.pareto_front = sorted(archive.members, key=lambda s: (s.violations, -s.objectives[0]))
+        chosen = select_from_front(self.pareto_front, self.weights)
+
+        logger.info(f"NSGA-II completado: {len(self.pareto_front)} soluciones en el frente de Pareto")
+        return list(chosen.assignments) if chosen else []
+
+    def _breed(self, parent1: List, parent2: List, franjas: List, aulas: List) -> List[SchedulingAssignment]:
+        """Cruce y mutación sin modificar a los padres, reparando choques internos"""
+        if min(len(parent1), len(parent2)) < 2:
+            child = list(parent1 if len(parent1) >= len(parent2) else parent2)
+        else:
+            child = self._crossover(parent1, parent2)
+
+        if self.rng.random() < self.mutation_rate:
+            child = self._mutate(list(child), franjas, aulas)
+
+            # La mutación puede generar choques de docente, aula o cohorte
+            occupancy = OccupancyIndex()
+            repaired = []
+            for assignment in child:
+                if occupancy.is_free(assignment.asignacion_docente, assignment.aula, assignment.franja_horaria):
+                    repaired.append(assignment)
+                    occupancy.reserve(assignment)
+            child = repaired
+
+        return child
+
+    def _gene_valid(self, assignment: SchedulingAssignment) -> bool:
+        key = (
+            assignment.asignacion_docente.id,
+            assignment.franja_horaria.id,
+            assignment.aula.id if assignment.aula else 0,
+        )
+        valid = self._validity_cache.get(key)
+        if valid is None:
+            valid = self._validity_cache[key] = self.validate_assignment(assignment)[0]
+        return valid
+
+
 # Factory para crear motores de planificación
 class SchedulingEngineFactory:
     """Factory para crear diferentes tipos de motores de planificación"""
@@ -555,20 +986,40 @@ class SchedulingEngineFactory:
     @staticmethod
     def create_engine(strategy: SchedulingStrategy, **kwargs) -> BaseSchedulingEngine:
         """Crea un motor de planificación según la estrategia especificada"""
+        seed = kwargs.get('seed')
 
         if strategy == SchedulingStrategy.DOCENTE_PRIORITY:
-            return DocentePriorityEngine()
+            return DocentePriorityEngine(seed)
 
         elif strategy == SchedulingStrategy.AULA_OPTIMIZATION:
-            return AulaOptimizationEngine()
+            return AulaOptimizationEngine(seed)
 
         elif strategy == SchedulingStrategy.BALANCED_DISTRIBUTION:
-            return BalancedDistributionEngine()
+            return BalancedDistributionEngine(seed)
+
+        elif strategy == SchedulingStrategy.PREREQUISITE_BASED:
+            return PrerequisiteBasedEngine(seed)
+
+        elif strategy == SchedulingStrategy.MIXED_MODALITY:
+            return MixedModalityEngine(kwargs.get('hybrid_min_ratio', 0.5), seed)
+
+        elif strategy == SchedulingStrategy.MULTI_OBJECTIVE:
+            return MultiObjectiveEngine(
+                kwargs.get('population_size', 50),
+                kwargs.get('generations', 100),
+                seed,
+                weights=kwargs.get('weights')
+            )
 
         elif strategy == SchedulingStrategy.GENETIC_ALGORITHM:
             population_size = kwargs.get('population_size', 50)
             generations = kwargs.get('generations', 100)
-            return GeneticAlgorithmEngine(population_size, generations)
+            return GeneticAlgorithmEngine(
+                population_size, generations, seed,
+                checkpoint_id=kwargs.get('checkpoint_id'),
+                checkpoint_interval=kwargs.get('checkpoint_interval', 5.0),
+                resume=kwargs.get('resume', False)
+            )
 
         else:
             raise ValueError(f"Estrategia no soportada: {strategy}")
@@ -592,6 +1043,21 @@ class SchedulingEngineFactory:
                 'name': 'Distribución Equilibrada',
                 'description': 'Balancea la carga horaria uniformemente durante la semana'
             },
+            {
+                'key': SchedulingStrategy.PREREQUISITE_BASED.value,
+                'name': 'Basada en Prerrequisitos',
+                'description': 'Coloca primero las materias troncales según la malla de prerrequisitos'
+            },
+            {
+                'key': SchedulingStrategy.MIXED_MODALITY.value,
+                'name': 'Modalidad Mixta',
+                'description': 'Envía secciones a modalidad híbrida o virtual cuando las aulas están saturadas'
+            },
+            {
+                'key': SchedulingStrategy.MULTI_OBJECTIVE.value,
+                'name': 'Multiobjetivo (Pareto)',
+                'description': 'Explora compromisos entre cobertura, uso de aulas, preferencias y equilibrio en una sola ejecución'
+            },
             {
                 'key': SchedulingStrategy.GENETIC_ALGORITHM.value,
                 'name': 'Algoritmo Genético',
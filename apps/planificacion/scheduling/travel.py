@@ -0,0 +1,149 @@
+"""
+Tiempo de desplazamiento de los docentes entre clases consecutivas
+Matriz de distancias entre edificios y adyacencia de franjas precalculadas,
+de modo que evaluar un candidato cuesta O(1)
+
+Configuración opcional en settings:
+- SCHEDULING_BUILDING_DISTANCES: {'Edificio A': {'Edificio B': 5}} en minutos (simétrica)
+- SCHEDULING_DEFAULT_BUILDING_MINUTES: minutos entre edificios sin distancia configurada
+- SCHEDULING_MINUTES_PER_FLOOR: minutos por piso de diferencia
+- SCHEDULING_MAX_BREAK_MINUTES: receso máximo para considerar dos franjas consecutivas
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from ..models import FranjaHoraria
+from apps.aulas.models import Aula
+
+DEFAULT_BUILDING_MINUTES = 10
+DEFAULT_MINUTES_PER_FLOOR = 1
+DEFAULT_MAX_BREAK_MINUTES = 15
+
+
+def _minutes(value) -> int:
+    return value.hour * 60 + value.minute
+
+
+class TravelModel:
+    """
+    Datos estáticos de desplazamiento de una ejecución.
+
+    - ``distance[i][j]``: minutos entre los edificios i y j
+    - ``adjacent[franja_id]``: franjas consecutivas del mismo día con el
+      receso disponible entre ambas, en minutos
+    """
+
+    def __init__(self, franjas: Iterable, aulas: Iterable):
+        distances = getattr(settings, 'SCHEDULING_BUILDING_DISTANCES', {})
+        self.default_minutes = getattr(settings, 'SCHEDULING_DEFAULT_BUILDING_MINUTES', DEFAULT_BUILDING_MINUTES)
+        self.minutes_per_floor = getattr(settings, 'SCHEDULING_MINUTES_PER_FLOOR', DEFAULT_MINUTES_PER_FLOOR)
+        max_break = getattr(settings, 'SCHEDULING_MAX_BREAK_MINUTES', DEFAULT_MAX_BREAK_MINUTES)
+
+        configurados = set(distances) | {destino for destinos in distances.values() for destino in destinos}
+        edificios = sorted({aula.edificio for aula in aulas} | configurados)
+        self.building_idx: Dict[str, int] = {edificio: i for i, edificio in enumerate(edificios)}
+        self.distance: List[List[int]] = [
+            [0 if a == b else self.default_minutes for b in edificios]
+            for a in edificios
+        ]
+        for origen, destinos in distances.items():
+            for destino, minutos in destinos.items():
+                i, j = self.building_idx[origen], self.building_idx[destino]
+                self.distance[i][j] = self.distance[j][i] = minutos
+
+        self.adjacent: Dict[int, Tuple[Tuple[int, int], ...]] = self._build_adjacency(franjas, max_break)
+
+    @staticmethod
+    def _build_adjacency(franjas: Iterable, max_break: int) -> Dict[int, Tuple[Tuple[int, int], ...]]:
+        por_dia: Dict[str, List] = {}
+        for franja in franjas:
+            por_dia.setdefault(franja.dia_semana, []).append(franja)
+
+        adjacent: Dict[int, List[Tuple[int, int]]] = {}
+        for franjas_dia in por_dia.values():
+            franjas_dia.sort(key=lambda f: f.hora_inicio)
+            for k, franja in enumerate(franjas_dia):
+                fin = _minutes(franja.hora_fin)
+                adjacent.setdefault(franja.id, [])
+                for siguiente in franjas_dia[k + 1:]:
+                    receso = _minutes(siguiente.hora_inicio) - fin
+                    if receso > max_break:
+                        break
+                    if receso >= 0:
+                        adjacent[franja.id].append((siguiente.id, receso))
+                        adjacent.setdefault(siguiente.id, []).append((franja.id, receso))
+
+        return {franja_id: tuple(vecinas) for franja_id, vecinas in adjacent.items()}
+
+    def travel_minutes(self, aula_a, aula_b) -> int:
+        """Minutos para ir de un aula a otra (edificio y diferencia de pisos)"""
+        floors = abs(aula_a.piso - aula_b.piso) * self.minutes_per_floor
+        if aula_a.edificio == aula_b.edificio:
+            return floors
+
+        i = self.building_idx.get(aula_a.edificio)
+        j = self.building_idx.get(aula_b.edificio)
+        building = self.default_minutes if i is None or j is None else self.distance[i][j]
+        return building + floors
+
+    def total_lateness(self, assignments: Iterable) -> int:
+        """Minutos de retraso acumulados de un horario completo"""
+        index = TravelTimeIndex(self)
+        total = 0
+        for assignment in assignments:
+            total += index.lateness(assignment.asignacion_docente.docente_id, assignment.franja_horaria, assignment.aula)
+            index.reserve(assignment)
+        return total
+
+
+class TravelTimeIndex:
+    """
+    Ubicación de cada docente por franja durante una ejecución.
+
+    Cada franja tiene a lo sumo un par de franjas consecutivas, por lo que el
+    retraso de un candidato se calcula con un número constante de búsquedas.
+    """
+
+    def __init__(self, model: TravelModel):
+        self.model = model
+        self.placements: Dict[int, Dict[int, object]] = {}
+
+    def lateness(self, docente_id: int, franja, aula) -> int:
+        """Minutos que el docente llegaría tarde a (o desde) sus clases consecutivas"""
+        # Las secciones virtuales no requieren desplazamiento
+        if aula is None:
+            return 0
+
+        ubicaciones = self.placements.get(docente_id)
+        if not ubicaciones:
+            return 0
+
+        worst = 0
+        for vecina_id, receso in self.model.adjacent.get(franja.id, ()):
+            otra_aula = ubicaciones.get(vecina_id)
+            if otra_aula is not None:
+                worst = max(worst, self.model.travel_minutes(aula, otra_aula) - receso)
+        return worst
+
+    def reserve(self, assignment) -> None:
+        if assignment.aula is not None:
+            docente_id = assignment.asignacion_docente.docente_id
+            self.placements.setdefault(docente_id, {})[assignment.franja_horaria.id] = assignment.aula
+
+    def clear(self) -> None:
+        """Descarta las ubicaciones registradas, conservando el modelo"""
+        self.placements.clear()
+
+    def release(self, assignment) -> None:
+        ubicaciones = self.placements.get(assignment.asignacion_docente.docente_id)
+        if ubicaciones:
+            ubicaciones.pop(assignment.franja_horaria.id, None)
+
+
+def load_travel_model(franjas: Optional[Iterable] = None, aulas: Optional[Iterable] = None) -> TravelModel:
+    """Construye el modelo desde la base de datos para los datos que no se proporcionan"""
+    if franjas is None:
+        franjas = FranjaHoraria.objects.filter(is_activa=True).only('id', 'dia_semana', 'hora_inicio', 'hora_fin')
+    if aulas is None:
+        aulas = Aula.objects.filter(is_disponible=True).only('id', 'edificio', 'piso')
+    return TravelModel(franjas, aulas)
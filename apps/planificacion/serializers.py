@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Periodo, Carrera, Materia, FranjaHoraria, PlanificacionAcademica
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from .models import Periodo, Carrera, Materia, FranjaHoraria, PlanificacionAcademica, SchedulingRun, DisponibilidadDocente
 from apps.asignaciones.models import AsignacionDocente, HorarioClase, ConflictoHorario
+from .stats import get_planificacion_stats
 
 User = get_user_model()
 
@@ -14,6 +17,7 @@ class PeriodoSerializer(serializers.ModelSerializer):
 
 class CarreraSerializer(serializers.ModelSerializer):
     total_materias = serializers.SerializerMethodField()
+    fecha_creacion = serializers.DateTimeField(source='created_at', read_only=True)
 
     class Meta:
         model = Carrera
@@ -99,15 +103,46 @@ class HorarioClaseSerializer(serializers.ModelSerializer):
 class ConflictoHorarioSerializer(serializers.ModelSerializer):
     class Meta:
         model = ConflictoHorario
-        fields = ['id', 'tipo', 'descripcion', 'estado', 'fecha_deteccion', 'fecha_resolucion']
+        fields = [
+            'id', 'tipo', 'descripcion', 'horario_clase', 'horarios_involucrados',
+            'resuelto', 'fecha_deteccion', 'fecha_resolucion'
+        ]
+
+
+def _count_subquery(queryset, campo_planificacion: str):
+    """COUNT correlacionado por planificación, 0 si no hay filas"""
+    filas = queryset.filter(**{campo_planificacion: OuterRef('pk')}).order_by().values(campo_planificacion)
+    return Coalesce(Subquery(filas.annotate(total=Count('pk')).values('total')[:1]), 0)
+
+
+def annotate_list_totals(queryset):
+    """
+    Anota los totales que lee PlanificacionAcademicaListSerializer.
+
+    Cada total es una subconsulta correlacionada, así que una página del
+    listado cuesta una sola consulta sin importar cuántas planificaciones
+    incluya (un JOIN con Count multiplicaría las filas entre sí).
+    """
+    return queryset.select_related('periodo', 'creado_por').annotate(
+        total_asignaciones=_count_subquery(
+            AsignacionDocente.objects.filter(is_activa=True), 'planificacion'
+        ),
+        total_horarios=_count_subquery(
+            HorarioClase.objects.filter(is_activa=True), 'asignacion_docente__planificacion'
+        ),
+        total_conflictos=_count_subquery(
+            ConflictoHorario.objects.filter(resuelto=False), 'planificacion'
+        ),
+    )
 
 
 class PlanificacionAcademicaListSerializer(serializers.ModelSerializer):
+    """Requiere un queryset preparado con annotate_list_totals"""
     periodo_nombre = serializers.CharField(source='periodo.nombre', read_only=True)
     creado_por_nombre = serializers.CharField(source='creado_por.get_full_name', read_only=True)
-    total_asignaciones = serializers.SerializerMethodField()
-    total_horarios = serializers.SerializerMethodField()
-    total_conflictos = serializers.SerializerMethodField()
+    total_asignaciones = serializers.IntegerField(read_only=True)
+    total_horarios = serializers.IntegerField(read_only=True)
+    total_conflictos = serializers.IntegerField(read_only=True)
     progreso = serializers.SerializerMethodField()
 
     class Meta:
@@ -118,30 +153,37 @@ class PlanificacionAcademicaListSerializer(serializers.ModelSerializer):
             'total_conflictos', 'progreso'
         ]
 
-    def get_total_asignaciones(self, obj):
-        return obj.asignaciones_docente.filter(is_activa=True).count()
-
-    def get_total_horarios(self, obj):
-        return HorarioClase.objects.filter(
-            asignacion_docente__planificacion=obj,
-            is_activa=True
-        ).count()
-
-    def get_total_conflictos(self, obj):
-        return ConflictoHorario.objects.filter(
-            planificacion=obj,
-            estado='pendiente'
-        ).count()
-
     def get_progreso(self, obj):
-        total_asignaciones = self.get_total_asignaciones(obj)
-        total_horarios = self.get_total_horarios(obj)
-        if total_asignaciones == 0:
+        if obj.total_asignaciones == 0:
             return 0
-        return round((total_horarios / total_asignaciones) * 100, 1)
+        return round((obj.total_horarios / obj.total_asignaciones) * 100, 1)
+
+
+def prefetch_detail(queryset):
+    """
+    Prefetch que consume PlanificacionAcademicaDetailSerializer.
+
+    Los horarios activos se cargan una sola vez colgados de sus asignaciones:
+    cada horario recibe su asignación ya cargada, de modo que el listado de
+    horarios y el de asignaciones comparten las mismas instancias.
+    """
+    horarios = HorarioClase.objects.filter(is_activa=True).select_related('franja_horaria', 'aula')
+    asignaciones = AsignacionDocente.objects.select_related(
+        'docente', 'materia__carrera'
+    ).prefetch_related(
+        'materia__prereq_materias',
+        Prefetch('horarios', queryset=horarios, to_attr='horarios_activos'),
+    )
+    return queryset.select_related('periodo', 'creado_por', 'aprobado_por').prefetch_related(
+        'carreras',
+        Prefetch('asignaciones_docente', queryset=asignaciones),
+        Prefetch('conflictos', queryset=ConflictoHorario.objects.filter(resuelto=False),
+                 to_attr='conflictos_pendientes'),
+    )
 
 
 class PlanificacionAcademicaDetailSerializer(serializers.ModelSerializer):
+    """Requiere un queryset preparado con prefetch_detail"""
     periodo = PeriodoSerializer(read_only=True)
     carreras = CarreraSerializer(many=True, read_only=True)
     creado_por = DocenteBasicoSerializer(read_only=True)
@@ -160,49 +202,19 @@ class PlanificacionAcademicaDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_horarios(self, obj):
-        horarios = HorarioClase.objects.filter(
-            asignacion_docente__planificacion=obj,
-            is_activa=True
-        ).select_related('asignacion_docente__docente', 'asignacion_docente__materia', 'franja_horaria', 'aula')
+        horarios = [
+            horario
+            for asignacion in obj.asignaciones_docente.all()
+            for horario in asignacion.horarios_activos
+        ]
+        horarios.sort(key=lambda horario: horario.id)
         return HorarioClaseSerializer(horarios, many=True).data
 
     def get_conflictos(self, obj):
-        conflictos = ConflictoHorario.objects.filter(planificacion=obj, estado='pendiente')
-        return ConflictoHorarioSerializer(conflictos, many=True).data
+        return ConflictoHorarioSerializer(obj.conflictos_pendientes, many=True).data
 
     def get_estadisticas(self, obj):
-        asignaciones_activas = obj.asignaciones_docente.filter(is_activa=True)
-        horarios_activos = HorarioClase.objects.filter(
-            asignacion_docente__planificacion=obj,
-            is_activa=True
-        )
-
-        # Estadísticas por día
-        dias_stats = {}
-        for horario in horarios_activos:
-            dia = horario.franja_horaria.get_dia_semana_display()
-            if dia not in dias_stats:
-                dias_stats[dia] = 0
-            dias_stats[dia] += 1
-
-        # Estadísticas por aula
-        aulas_stats = {}
-        for horario in horarios_activos:
-            aula = horario.aula.codigo
-            if aula not in aulas_stats:
-                aulas_stats[aula] = 0
-            aulas_stats[aula] += 1
-
-        return {
-            'total_docentes': asignaciones_activas.values('docente').distinct().count(),
-            'total_materias': asignaciones_activas.values('materia').distinct().count(),
-            'total_horas_semanales': sum(a.carga_horaria_semanal for a in asignaciones_activas),
-            'horarios_por_dia': dias_stats,
-            'uso_de_aulas': aulas_stats,
-            'cobertura_horaria': round(
-                (horarios_activos.count() / max(asignaciones_activas.count(), 1)) * 100, 1
-            )
-        }
+        return get_planificacion_stats(obj)
 
 
 class PlanificacionAcademicaCreateSerializer(serializers.ModelSerializer):
@@ -268,4 +280,36 @@ class PlanificacionAcademicaUpdateSerializer(serializers.ModelSerializer):
             carreras = Carrera.objects.filter(id__in=carreras_ids)
             instance.carreras.set(carreras)
 
-        return instance
\ No newline at end of file
+        return instance
+
+
+class SchedulingRunSerializer(serializers.ModelSerializer):
+    """Ejecución del motor sin la solución codificada"""
+    ejecutado_por_nombre = serializers.CharField(source='ejecutado_por.get_full_name', read_only=True, default=None)
+
+    class Meta:
+        model = SchedulingRun
+        fields = [
+            'id', 'planificacion', 'strategy', 'parameters', 'seed', 'input_fingerprint',
+            'success', 'score', 'execution_time', 'phases', 'total_assignments',
+            'total_conflicts', 'total_unassigned', 'message', 'ejecutado_por',
+            'ejecutado_por_nombre', 'fecha_ejecucion'
+        ]
+
+
+class DisponibilidadDocenteSerializer(serializers.ModelSerializer):
+    docente_nombre = serializers.CharField(source='docente.get_full_name', read_only=True)
+    franja_horaria_info = FranjaHorariaSerializer(source='franja_horaria', read_only=True)
+
+    class Meta:
+        model = DisponibilidadDocente
+        fields = [
+            'id', 'docente', 'docente_nombre', 'periodo', 'franja_horaria',
+            'franja_horaria_info', 'tipo', 'peso', 'fecha_actualizacion'
+        ]
+        read_only_fields = ['fecha_actualizacion']
+
+    def validate_peso(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("El peso debe ser mayor que 0")
+        return value
@@ -0,0 +1,85 @@
+"""
+Señales de la app de planificación
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from apps.aulas.models import Aula
+from .models import Carrera, FranjaHoraria, Materia, Periodo, PlanificacionAcademica
+from .response_cache import bump_planificacion_version
+from .scheduling.prerequisites import invalidate_prerequisite_closures
+
+
+@receiver(m2m_changed, sender=Materia.prereq_materias.through)
+def invalidar_cierre_prerrequisitos(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    """Reconstruye el cierre de prerrequisitos solo cuando cambia el M2M"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_prerequisite_closures()
+        # Los nombres de prerrequisitos se muestran con la materia de cada asignación
+        materias = pk_set if reverse and pk_set else {instance.pk}
+        bump_planificacion_version(
+            PlanificacionAcademica.objects.filter(asignaciones_docente__materia__in=materias).values('id')
+        )
+
+
+@receiver(post_delete, sender=Materia)
+def invalidar_cierre_por_materia_eliminada(sender, instance, **kwargs):
+    """Al eliminar una materia sus filas del M2M se borran sin emitir m2m_changed"""
+    invalidate_prerequisite_closures()
+
+
+# Versión de las planificaciones: escrituras de datos que aparecen en sus respuestas.
+# Las eliminaciones en cascada de asignaciones y horarios versionan por sus propias señales
+
+@receiver(m2m_changed, sender=PlanificacionAcademica.carreras.through)
+def versionar_por_carreras(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # instance es la carrera; con post_clear pk_set es None y se versionan todas
+        bump_planificacion_version(pk_set)
+    else:
+        bump_planificacion_version([instance.pk])
+
+
+@receiver(post_save, sender=Carrera)
+@receiver(pre_delete, sender=Carrera)
+def versionar_por_carrera(sender, instance, raw=False, **kwargs):
+    """pre_delete: las filas del M2M se borran sin emitir m2m_changed"""
+    if raw:
+        return
+    bump_planificacion_version(PlanificacionAcademica.objects.filter(carreras=instance).values('id'))
+
+
+@receiver(post_save, sender=Periodo)
+def versionar_por_periodo(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    bump_planificacion_version(PlanificacionAcademica.objects.filter(periodo=instance).values('id'))
+
+
+@receiver(post_save, sender=Materia)
+def versionar_por_materia(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    bump_planificacion_version(
+        PlanificacionAcademica.objects.filter(asignaciones_docente__materia=instance).values('id')
+    )
+
+
+@receiver(post_save, sender=FranjaHoraria)
+def versionar_por_franja(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    bump_planificacion_version(
+        PlanificacionAcademica.objects.filter(asignaciones_docente__horarios__franja_horaria=instance).values('id')
+    )
+
+
+@receiver(post_save, sender=Aula)
+def versionar_por_aula(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    bump_planificacion_version(
+        PlanificacionAcademica.objects.filter(asignaciones_docente__horarios__aula=instance).values('id')
+    )
@@ -0,0 +1,63 @@
+"""
+Estadísticas de una planificación para el detalle
+Se calculan con dos agregados en la base de datos y se cachean por versión
+de la planificación; cualquier escritura de asignaciones u horarios cambia
+la versión y deja obsoleta la entrada anterior
+"""
+
+from typing import Any, Dict
+import logging
+from django.db.models import Count, Sum
+from .models import FranjaHoraria, PlanificacionAcademica
+from .response_cache import ALCANCE_GLOBAL, read_through
+from apps.asignaciones.models import AsignacionDocente, HorarioClase
+
+logger = logging.getLogger(__name__)
+
+DIAS = dict(FranjaHoraria.DIAS_SEMANA)
+
+
+def compute_planificacion_stats(planificacion_id: int) -> Dict[str, Any]:
+    """Estadísticas del detalle con dos consultas agregadas"""
+    asignaciones = AsignacionDocente.objects.filter(
+        planificacion_id=planificacion_id,
+        is_activa=True
+    ).aggregate(
+        total=Count('id'),
+        docentes=Count('docente', distinct=True),
+        materias=Count('materia', distinct=True),
+        horas=Sum('carga_horaria_semanal'),
+    )
+
+    # Una fila por (día, aula): de ella salen ambos conteos
+    filas = HorarioClase.objects.filter(
+        asignacion_docente__planificacion_id=planificacion_id,
+        is_activa=True
+    ).order_by().values_list('franja_horaria__dia_semana', 'aula__codigo').annotate(total=Count('id'))
+
+    por_dia: Dict[str, int] = {}
+    por_aula: Dict[str, int] = {}
+    total_horarios = 0
+    for dia, aula_codigo, total in filas:
+        por_dia[dia] = por_dia.get(dia, 0) + total
+        # Las clases virtuales no ocupan aula
+        if aula_codigo is not None:
+            por_aula[aula_codigo] = por_aula.get(aula_codigo, 0) + total
+        total_horarios += total
+
+    return {
+        'total_docentes': asignaciones['docentes'],
+        'total_materias': asignaciones['materias'],
+        'total_horas_semanales': asignaciones['horas'] or 0,
+        'horarios_por_dia': {DIAS[dia]: por_dia[dia] for dia in DIAS if dia in por_dia},
+        'uso_de_aulas': dict(sorted(por_aula.items())),
+        'cobertura_horaria': round((total_horarios / max(asignaciones['total'], 1)) * 100, 1)
+    }
+
+
+def get_planificacion_stats(planificacion: PlanificacionAcademica) -> Dict[str, Any]:
+    """Retorna las estadísticas cacheadas para la versión de la planificación"""
+    return read_through(
+        'estadisticas_detalle', planificacion.id, planificacion.version, ALCANCE_GLOBAL,
+        lambda: compute_planificacion_stats(planificacion.id)
+    )
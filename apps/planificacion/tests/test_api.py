@@ -0,0 +1,409 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from apps.asignaciones.conflicts import sync_planificacion_conflicts
+from apps.asignaciones.models import AsignacionDocente, ConflictoHorario, HorarioClase
+from apps.asignaciones.views import HorarioClaseViewSet
+from apps.aulas.models import Aula, TipoAula
+from apps.planificacion.models import Carrera, FranjaHoraria, Materia, Periodo, PlanificacionAcademica
+from apps.planificacion.stats import compute_planificacion_stats, get_planificacion_stats
+
+User = get_user_model()
+
+
+class PlanificacionListQueriesTest(APITestCase):
+    """El listado de planificaciones anota los totales en una sola consulta"""
+
+    url = '/api/planificacion/planificaciones/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        cls.periodo = Periodo.objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        carrera = Carrera.objects.create(codigo='ING', nombre='Ingeniería')
+        cls.materias = [
+            Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=1, carrera=carrera)
+            for i in range(2)
+        ]
+        # Una franja por planificación: un docente no puede repetir franja
+        cls.franjas = [
+            FranjaHoraria.objects.create(
+                nombre=f'Bloque {hora}', dia_semana='lunes',
+                hora_inicio=datetime.time(hora), hora_fin=datetime.time(hora + 1)
+            )
+            for hora in range(7, 13)
+        ]
+        cls.docentes = [
+            User.objects.create_user(f'docente{i}', password='x', rol='docente') for i in range(2)
+        ]
+
+    def crear_planificacion(self, nombre):
+        franja = self.franjas[PlanificacionAcademica.objects.count()]
+        planificacion = PlanificacionAcademica.objects.create(
+            nombre=nombre, periodo=self.periodo, creado_por=self.admin
+        )
+        for docente, materia in zip(self.docentes, self.materias):
+            asignacion = AsignacionDocente.objects.create(
+                docente=docente, materia=materia, planificacion=planificacion, carga_horaria_semanal=4
+            )
+        HorarioClase.objects.create(
+            asignacion_docente=asignacion, franja_horaria=franja, aula=None, modalidad='virtual'
+        )
+        ConflictoHorario.objects.create(
+            planificacion=planificacion, tipo='docente_sobrecarga', descripcion='Pendiente'
+        )
+        ConflictoHorario.objects.create(
+            planificacion=planificacion, tipo='docente_sobrecarga', descripcion='Resuelto', resuelto=True
+        )
+        return planificacion
+
+    def listar(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_totales_anotados(self):
+        self.crear_planificacion('Única')
+        self.client.force_authenticate(self.admin)
+
+        fila = self.listar()[0]
+
+        self.assertEqual(fila['total_asignaciones'], 2)
+        self.assertEqual(fila['total_horarios'], 1)
+        self.assertEqual(fila['total_conflictos'], 1)
+        self.assertEqual(fila['progreso'], 50.0)
+
+    def test_consultas_constantes(self):
+        self.client.force_authenticate(self.admin)
+        self.crear_planificacion('Primera')
+
+        # Conteo de la paginación + página anotada
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.listar()), 1)
+
+        for i in range(5):
+            self.crear_planificacion(f'Adicional {i}')
+
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.listar()), 6)
+
+
+class HorariosTestCase(APITestCase):
+    """Planificación con horarios independientes: docente, materia, franja y aula propios"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        periodo = Periodo.objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        cls.planificacion = PlanificacionAcademica.objects.create(
+            nombre='Plan', periodo=periodo, creado_por=cls.admin
+        )
+        carrera = Carrera.objects.create(codigo='ING', nombre='Ingeniería')
+        cls.materias = [
+            Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=i + 1, carrera=carrera)
+            for i in range(6)
+        ]
+        cls.docentes = [
+            User.objects.create_user(f'docente{i}', password='x', rol='docente', first_name=f'Docente {i}')
+            for i in range(6)
+        ]
+        dias = ['lunes', 'martes']
+        cls.franjas = [
+            FranjaHoraria.objects.create(
+                nombre=f'Bloque {i}', dia_semana=dias[i % 2],
+                hora_inicio=datetime.time(7 + i), hora_fin=datetime.time(8 + i)
+            )
+            for i in range(6)
+        ]
+        tipo = TipoAula.objects.create(nombre='Magistral')
+        cls.aulas = [
+            Aula.objects.create(codigo=f'A-{i}', nombre=f'Aula {i}', tipo=tipo, capacidad=30, piso=1, edificio='A')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.admin)
+
+    def agregar_horarios(self, desde, hasta, capacidad=20):
+        """Un horario por índice; con capacidad mayor a 30 el aula queda excedida"""
+        for i in range(desde, hasta):
+            asignacion = AsignacionDocente.objects.create(
+                docente=self.docentes[i], materia=self.materias[i],
+                planificacion=self.planificacion, carga_horaria_semanal=4
+            )
+            HorarioClase.objects.create(
+                asignacion_docente=asignacion, franja_horaria=self.franjas[i],
+                aula=self.aulas[i % 3], capacidad_estudiantes=capacidad
+            )
+
+
+class ConflictSyncQueriesTest(HorariosTestCase):
+    """La conciliación completa usa un número fijo de consultas"""
+
+    def pendientes(self):
+        return ConflictoHorario.objects.filter(planificacion=self.planificacion, resuelto=False)
+
+    def test_consultas_constantes(self):
+        self.agregar_horarios(0, 2, capacidad=40)
+        # Detección (2), registros sin clave, pendientes, inserción y versión, más el savepoint
+        with self.assertNumQueries(8):
+            self.assertEqual(len(sync_planificacion_conflicts(self.planificacion.id)), 2)
+
+        self.agregar_horarios(2, 6, capacidad=40)
+        # Las mismas consultas con el triple de horarios
+        with self.assertNumQueries(8):
+            self.assertEqual(len(sync_planificacion_conflicts(self.planificacion.id)), 6)
+
+        # Sin cambios no hay escrituras ni nueva versión
+        with self.assertNumQueries(6):
+            sync_planificacion_conflicts(self.planificacion.id)
+
+        self.assertEqual(self.pendientes().count(), 6)
+
+    def test_resuelve_y_no_duplica(self):
+        self.agregar_horarios(0, 3, capacidad=40)
+        sync_planificacion_conflicts(self.planificacion.id)
+
+        HorarioClase.objects.filter(franja_horaria=self.franjas[0]).update(capacidad_estudiantes=20)
+        vigentes = sync_planificacion_conflicts(self.planificacion.id)
+
+        self.assertEqual(len(vigentes), 2)
+        self.assertEqual(self.pendientes().count(), 2)
+        self.assertEqual(
+            ConflictoHorario.objects.filter(planificacion=self.planificacion, resuelto=True).count(), 1
+        )
+        self.assertTrue(all(c.tipo == 'capacidad_excedida' for c in self.pendientes()))
+
+
+class MatrizHorariosQueriesTest(HorariosTestCase):
+    """La matriz sale de una sola proyección, sin importar la cantidad de horarios"""
+
+    def matriz(self, **params):
+        # Las rutas de asignaciones no están montadas en la raíz: se invoca la acción directamente
+        request = APIRequestFactory().get('/', {'planificacion_id': self.planificacion.id, **params})
+        force_authenticate(request, self.admin)
+        response = HorarioClaseViewSet.as_view({'get': 'matriz_horarios'})(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_consultas_constantes(self):
+        self.agregar_horarios(0, 2)
+        # Planificación con su versión + proyección
+        with self.assertNumQueries(2):
+            self.matriz()
+
+        self.agregar_horarios(2, 6)
+        with self.assertNumQueries(2):
+            data = self.matriz()
+
+        celdas = [celda for por_franja in data['matriz'].values() for lista in por_franja.values() for celda in lista]
+        self.assertEqual(len(celdas), 6)
+        self.assertEqual(data['franjas_horarias'][0], '07:00:00-08:00:00')
+        lunes = data['matriz']['lunes']['07:00:00-08:00:00']
+        self.assertEqual(lunes, [{
+            'id': lunes[0]['id'], 'materia': 'Materia 0', 'docente': 'Docente 0', 'aula': 'A-0',
+            'modalidad': 'presencial', 'estudiantes': 20,
+        }])
+
+    def test_formato_compacto(self):
+        self.agregar_horarios(0, 3)
+
+        with self.assertNumQueries(2):
+            data = self.matriz(formato='compacto')
+
+        self.assertEqual(len(data['celdas']), 3)
+        self.assertEqual(data['columnas'][:2], ['dia', 'franja'])
+        # Las celdas referencian las tablas de materias, docentes y aulas
+        for dia, franja, _, materia, docente, aula, modalidad, _ in data['celdas']:
+            self.assertIn(materia, data['materias'])
+            self.assertIn(docente, data['docentes'])
+            self.assertIn(aula, data['aulas'])
+            self.assertEqual(data['modalidades'][modalidad], 'presencial')
+        self.assertEqual([celda[0] for celda in data['celdas']], [0, 1, 0])
+
+
+class DetalleEstadisticasQueriesTest(HorariosTestCase):
+    """Las estadísticas del detalle son dos agregados cacheados por versión"""
+
+    def detalle(self):
+        response = self.client.get(f'/api/planificacion/planificaciones/{self.planificacion.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_agregados(self):
+        self.agregar_horarios(0, 2)
+        with self.assertNumQueries(2):
+            compute_planificacion_stats(self.planificacion.id)
+
+        self.agregar_horarios(2, 6)
+        with self.assertNumQueries(2):
+            stats = compute_planificacion_stats(self.planificacion.id)
+
+        self.assertEqual(stats, {
+            'total_docentes': 6,
+            'total_materias': 6,
+            'total_horas_semanales': 24,
+            'horarios_por_dia': {'Lunes': 3, 'Martes': 3},
+            'uso_de_aulas': {'A-0': 2, 'A-1': 2, 'A-2': 2},
+            'cobertura_horaria': 100.0,
+        })
+
+    def test_cache_por_version(self):
+        self.agregar_horarios(0, 2)
+        self.planificacion.refresh_from_db()
+        get_planificacion_stats(self.planificacion)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_planificacion_stats(self.planificacion)['total_docentes'], 2)
+
+    def test_detalle_sin_consultas_por_horario(self):
+        self.agregar_horarios(0, 2)
+        with CaptureQueriesContext(connection) as pocos:
+            self.detalle()
+
+        cache.clear()
+        self.agregar_horarios(2, 6)
+        with CaptureQueriesContext(connection) as muchos:
+            data = self.detalle()
+
+        self.assertEqual(len(pocos), len(muchos))
+        self.assertEqual(len(data['horarios']), 6)
+        self.assertEqual(data['estadisticas']['total_docentes'], 6)
+
+        # Con la caché caliente solo se lee la planificación
+        with self.assertNumQueries(1):
+            self.detalle()
+
+
+class ResponseCacheInvalidationTest(HorariosTestCase):
+    """Toda escritura dependiente cambia la versión y deja de servir la entrada anterior"""
+
+    def url(self, accion=''):
+        return f'/api/planificacion/planificaciones/{self.planificacion.id}/{accion}'
+
+    def resumen(self):
+        response = self.client.get(self.url('estadisticas/'))
+        self.assertEqual(response.status_code, 200)
+        return response.data['resumen']
+
+    def test_nuevo_horario(self):
+        self.agregar_horarios(0, 2)
+        self.assertEqual(self.resumen()['total_horarios'], 2)
+
+        self.agregar_horarios(2, 3)
+
+        self.assertEqual(self.resumen()['total_horarios'], 3)
+
+    def test_conflicto_resuelto(self):
+        conflicto = ConflictoHorario.objects.create(
+            planificacion=self.planificacion, tipo='docente_sobrecarga', descripcion='Pendiente'
+        )
+        self.assertEqual(self.resumen()['total_conflictos'], 1)
+
+        conflicto.resuelto = True
+        conflicto.save()
+
+        self.assertEqual(self.resumen()['total_conflictos'], 0)
+
+    def test_escritura_por_api(self):
+        self.assertEqual(self.client.get(self.url()).data['nombre'], 'Plan')
+
+        response = self.client.patch(self.url(), {'nombre': 'Plan revisado'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get(self.url()).data['nombre'], 'Plan revisado')
+
+    def test_docente_renombrado(self):
+        self.agregar_horarios(0, 1)
+        horario = self.client.get(self.url()).data['horarios'][0]
+        self.assertEqual(horario['asignacion_docente']['docente']['first_name'], 'Docente 0')
+
+        docente = self.docentes[0]
+        docente.first_name = 'Renombrado'
+        docente.save()
+
+        horario = self.client.get(self.url()).data['horarios'][0]
+        self.assertEqual(horario['asignacion_docente']['docente']['first_name'], 'Renombrado')
+
+    def test_metricas(self):
+        self.resumen()
+        self.resumen()
+        self.agregar_horarios(0, 1)
+        self.resumen()
+
+        metricas = self.client.get('/api/planificacion/cache/metricas/').data['endpoints']['estadisticas']
+
+        self.assertEqual((metricas['hits'], metricas['misses']), (1, 2))
+        self.assertEqual(metricas['tasa_acierto'], 0.333)
+
+
+class ETagTest(HorariosTestCase):
+    """If-None-Match con la versión vigente responde 304 sin leer la caché"""
+
+    def url(self, accion=''):
+        return f'/api/planificacion/planificaciones/{self.planificacion.id}/{accion}'
+
+    def test_304_con_etag_vigente(self):
+        self.agregar_horarios(0, 2)
+        response = self.client.get(self.url())
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        # Solo se lee la planificación con su versión
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+    def test_comparacion_debil_y_comodin(self):
+        etag = self.client.get(self.url())['ETag']
+
+        for header in (f'W/{etag}', f'"otro", {etag}', '*'):
+            with self.subTest(header=header):
+                self.assertEqual(self.client.get(self.url(), HTTP_IF_NONE_MATCH=header).status_code, 304)
+
+    def test_nueva_version_nuevo_etag(self):
+        self.agregar_horarios(0, 2)
+        etag = self.client.get(self.url())['ETag']
+
+        self.agregar_horarios(2, 3)
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data['horarios']), 3)
+        self.assertEqual(self.client.get(self.url(), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_etag_por_endpoint(self):
+        etags = {self.client.get(self.url(accion))['ETag'] for accion in ('', 'estadisticas/', 'validar/')}
+
+        self.assertEqual(len(etags), 3)
+
+    def test_matriz_horarios(self):
+        self.agregar_horarios(0, 2)
+        vista = HorarioClaseViewSet.as_view({'get': 'matriz_horarios'})
+
+        def matriz(**headers):
+            request = APIRequestFactory().get('/', {'planificacion_id': self.planificacion.id}, **headers)
+            force_authenticate(request, self.admin)
+            return vista(request)
+
+        etag = matriz()['ETag']
+        self.assertEqual(matriz(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.planificacion.save()
+        self.assertEqual(matriz(HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from apps.asignaciones.models import AsignacionDocente
+from apps.planificacion.models import DisponibilidadDocente, FranjaHoraria
+from apps.planificacion.scheduling.availability import (
+    DocenteAvailability, compile_availability, import_disponibilidades,
+)
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+
+
+class DocenteAvailabilityTest(SimpleTestCase):
+    """Bitset de franjas no disponibles y vector de preferencias"""
+
+    def setUp(self):
+        self.availability = DocenteAvailability([10, 11, 12], [
+            (1, 10, 'no_disponible', 1.0),
+            (1, 12, 'preferida', 2.5),
+            (2, 11, 'preferida', 1.0),
+            # Franja fuera de la ejecución: se ignora
+            (3, 99, 'no_disponible', 1.0),
+        ])
+
+    def test_disponibilidad(self):
+        self.assertFalse(self.availability.is_available(1, SimpleNamespace(id=10)))
+        self.assertTrue(self.availability.is_available(1, SimpleNamespace(id=11)))
+        self.assertTrue(self.availability.is_available(2, SimpleNamespace(id=10)))
+        self.assertTrue(self.availability.is_available(1, SimpleNamespace(id=99)))
+        self.assertEqual(self.availability.unavailable_franjas(1), [10])
+        self.assertNotIn(3, self.availability.unavailable)
+
+    def test_preferencias(self):
+        self.assertEqual(self.availability.preference(1, SimpleNamespace(id=12)), 2.5)
+        self.assertEqual(self.availability.preference(1, SimpleNamespace(id=11)), 0.0)
+        self.assertEqual(self.availability.preference(3, SimpleNamespace(id=11)), 0.0)
+        self.assertTrue(self.availability.has_preferences(2))
+        self.assertFalse(self.availability.has_preferences(3))
+
+
+class AvailabilityDatabaseTest(APITestCase):
+    """Compilación, importación masiva y uso en el motor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=8)
+        cls.periodo = cls.planificacion.periodo
+        cls.franjas = list(FranjaHoraria.objects.order_by('id'))
+        cls.docentes = list(User.objects.filter(
+            asignaciones_docente__planificacion=cls.planificacion
+        ).distinct().order_by('id'))
+        cls.admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+
+    def registro(self, docente, franja, tipo='no_disponible', **extra):
+        return {'docente': docente.id, 'franja_horaria': franja.id, 'tipo': tipo, **extra}
+
+    def test_compilacion_con_una_consulta(self):
+        docente = self.docentes[0]
+        import_disponibilidades(self.periodo, [self.registro(docente, self.franjas[1])])
+
+        with self.assertNumQueries(1):
+            availability = compile_availability(self.periodo.id, franja_ids=[f.id for f in self.franjas])
+
+        self.assertEqual(availability.unavailable_franjas(docente.id), [self.franjas[1].id])
+
+    def test_importacion_valida_todo_o_nada(self):
+        resultado = import_disponibilidades(self.periodo, [
+            self.registro(self.docentes[0], self.franjas[0]),
+            self.registro(self.admin, self.franjas[0]),
+            self.registro(self.docentes[1], self.franjas[0], tipo='quizas'),
+            self.registro(self.docentes[1], self.franjas[0], tipo='preferida', peso=0),
+        ])
+
+        self.assertEqual(resultado['importados'], 0)
+        self.assertEqual([error['registro'] for error in resultado['errores']], [1, 2, 3])
+        self.assertFalse(DisponibilidadDocente.objects.exists())
+
+    def test_importacion_actualiza_y_reemplaza(self):
+        docente = self.docentes[0]
+        import_disponibilidades(self.periodo, [
+            self.registro(docente, self.franjas[0]),
+            self.registro(docente, self.franjas[1]),
+        ])
+
+        resultado = import_disponibilidades(self.periodo, [
+            self.registro(docente, self.franjas[0], tipo='preferida', peso=2),
+        ])
+        self.assertEqual(resultado['importados'], 1)
+        self.assertEqual(
+            set(DisponibilidadDocente.objects.values_list('franja_horaria_id', 'tipo', 'peso')),
+            {(self.franjas[0].id, 'preferida', 2.0), (self.franjas[1].id, 'no_disponible', 1.0)}
+        )
+
+        resultado = import_disponibilidades(
+            self.periodo, [self.registro(docente, self.franjas[2])], reemplazar=True
+        )
+        self.assertEqual(resultado['eliminados'], 2)
+        self.assertEqual(list(DisponibilidadDocente.objects.values_list('franja_horaria_id', flat=True)),
+                         [self.franjas[2].id])
+
+    def test_endpoint_importar(self):
+        url = '/api/planificacion/disponibilidades/importar/'
+        datos = {'periodo': self.periodo.id, 'registros': [self.registro(self.docentes[0], self.franjas[0])]}
+
+        self.client.force_authenticate(self.docentes[0])
+        self.assertEqual(self.client.post(url, datos, format='json').status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.post(url, {**datos, 'registros': {}}, format='json').status_code, 400)
+        response = self.client.post(url, datos, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['importados'], 1)
+
+    def test_motor_respeta_franjas_no_disponibles(self):
+        # Cada docente bloquea la primera franja de cada día
+        bloqueadas = self.franjas[::ESCALA.franjas_por_dia]
+        import_disponibilidades(self.periodo, [
+            self.registro(docente, franja) for docente in self.docentes for franja in bloqueadas
+        ])
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.DOCENTE_PRIORITY, seed=1)
+
+        result = engine.execute_scheduling(self.planificacion, {'abort_if_infeasible': False})
+
+        self.assertTrue(result.assignments)
+        self.assertFalse({a.franja_horaria.id for a in result.assignments} & {f.id for f in bloqueadas})
+        self.assertEqual(
+            len(result.assignments) + len(result.unassigned),
+            AsignacionDocente.objects.filter(planificacion=self.planificacion, is_activa=True).count()
+        )
@@ -0,0 +1,83 @@
+import datetime
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.aulas.models import Aula, TipoAula
+from apps.planificacion.models import FranjaHoraria
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, benchmark_strategy, synthetic_institution
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.5)
+
+
+class SyntheticScaleTest(SimpleTestCase):
+    """Las escalas que no caben en la grilla sintética se rechazan antes de generar datos"""
+
+    def test_rechaza_grilla_fuera_de_rango(self):
+        for dimensiones in ({'franjas_por_dia': 8}, {'franjas_por_dia': 0}, {'dias': 7}, {'dias': 0}):
+            with self.subTest(**dimensiones):
+                with self.assertRaises(ValueError):
+                    SyntheticScale(**dimensiones)
+
+        self.assertEqual(SyntheticScale(dias=6, franjas_por_dia=7).total_franjas, 42)
+
+    def test_comando_rechaza_franjas_por_dia(self):
+        with self.assertRaisesMessage(CommandError, 'franjas_por_dia debe estar entre 1 y 7'):
+            call_command('bench_scheduling', franjas_por_dia=8)
+
+
+class SyntheticInstitutionTest(TestCase):
+    """La institución sintética no altera el catálogo real de franjas y aulas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.franja_activa = FranjaHoraria.objects.create(
+            nombre='Real', dia_semana='sabado', hora_inicio=datetime.time(18), hora_fin=datetime.time(20)
+        )
+        cls.franja_inactiva = FranjaHoraria.objects.create(
+            nombre='Inactiva', dia_semana='sabado', hora_inicio=datetime.time(20), hora_fin=datetime.time(22),
+            is_activa=False
+        )
+        # Mismo horario que el primer bloque sintético: se reutiliza y debe volver a quedar inactiva
+        cls.franja_compartida = FranjaHoraria.objects.create(
+            nombre='Compartida', dia_semana='lunes', hora_inicio=datetime.time(7), hora_fin=datetime.time(9),
+            is_activa=False
+        )
+        tipo = TipoAula.objects.create(nombre='Real')
+        cls.aula = Aula.objects.create(codigo='REAL-1', nombre='Real', tipo=tipo, capacidad=30, piso=1, edificio='A')
+
+    def estado(self):
+        return (
+            set(FranjaHoraria.objects.filter(is_activa=True).values_list('id', flat=True)),
+            set(Aula.objects.filter(is_disponible=True).values_list('id', flat=True)),
+        )
+
+    def test_oculta_y_restaura_catalogo(self):
+        with synthetic_institution(ESCALA) as planificacion:
+            franjas, aulas = self.estado()
+            self.assertNotIn(self.franja_activa.id, franjas)
+            self.assertIn(self.franja_compartida.id, franjas)
+            self.assertEqual(len(franjas), ESCALA.total_franjas)
+            self.assertNotIn(self.aula.id, aulas)
+            self.assertEqual(len(aulas), ESCALA.aulas)
+            self.assertTrue(planificacion.asignaciones_docente.exists())
+
+        self.assertEqual(self.estado(), ({self.franja_activa.id}, {self.aula.id}))
+
+    def test_restaura_con_error(self):
+        with self.assertRaises(RuntimeError):
+            with synthetic_institution(ESCALA):
+                raise RuntimeError('fallo del motor')
+
+        self.assertEqual(self.estado(), ({self.franja_activa.id}, {self.aula.id}))
+
+    def test_cuenta_consultas_por_estrategia(self):
+        with synthetic_institution(ESCALA) as planificacion:
+            primero = benchmark_strategy(planificacion, SchedulingStrategy.DOCENTE_PRIORITY)
+            segundo = benchmark_strategy(planificacion, SchedulingStrategy.DOCENTE_PRIORITY)
+
+        self.assertGreater(primero['queries'], 0)
+        # Cada estrategia parte de cero: no se acumulan las consultas anteriores
+        self.assertEqual(primero['queries'], segundo['queries'])
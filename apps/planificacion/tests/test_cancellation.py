@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.models import EjecucionEnCurso
+from apps.planificacion.scheduling.cancellation import (
+    CancellationToken, is_cancel_requested, is_running, request_cancellation,
+)
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+
+
+class CancellationTest(APITestCase):
+    """Cancelación cooperativa del algoritmo genético y su endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=5)
+        cls.creador = cls.planificacion.creado_por
+        cls.otro = User.objects.create_user('otro', password='x', rol='docente')
+        cls.url = f'/api/planificacion/algoritmo/{cls.planificacion.id}/cancelar/'
+
+    def test_genetico_cancelado_retorna_mejor_parcial(self):
+        CancellationToken(self.planificacion.id).start()
+        request_cancellation(self.planificacion.id)
+        engine = SchedulingEngineFactory.create_engine(
+            SchedulingStrategy.GENETIC_ALGORITHM, seed=1, population_size=20, generations=50
+        )
+
+        # Sin manage_state el token no descarta la cancelación al iniciar
+        with mock.patch.object(engine, '_evaluate_fitness', wraps=engine._evaluate_fitness) as fitness:
+            result = engine.execute_scheduling(self.planificacion, {
+                'abort_if_infeasible': False,
+                'cancellation': CancellationToken(self.planificacion.id, manage_state=False),
+            })
+
+        self.assertTrue(result.cancelled)
+        # Se detuvo antes de evaluar la primera generación
+        fitness.assert_not_called()
+        self.assertTrue(result.assignments)
+        # El único individuo creado antes de detenerse es válido
+        for assignment in result.assignments:
+            self.assertTrue(engine.validate_assignment(assignment)[0])
+        self.assertEqual(
+            len({(a.asignacion_docente.id, a.franja_horaria.id) for a in result.assignments}),
+            len(result.assignments)
+        )
+
+    def test_endpoint_requiere_propietario(self):
+        CancellationToken(self.planificacion.id).start()
+
+        self.client.force_authenticate(self.otro)
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(is_cancel_requested(self.planificacion.id))
+
+    def test_endpoint_cancela_ejecucion_activa(self):
+        self.client.force_authenticate(self.creador)
+        self.assertEqual(self.client.post(self.url).status_code, 409)
+
+        CancellationToken(self.planificacion.id).start()
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(is_cancel_requested(self.planificacion.id))
+
+    def test_estado_compartido_entre_tokens(self):
+        # Otro proceso solo comparte la base de datos: un token nuevo ve la cancelación
+        coordinador = CancellationToken(self.planificacion.id)
+        coordinador.start()
+        particion = CancellationToken(self.planificacion.id, poll_interval=0, manage_state=False)
+
+        self.assertIsNotNone(is_running(self.planificacion.id))
+        self.assertFalse(particion.is_cancelled())
+        self.assertTrue(request_cancellation(self.planificacion.id))
+        self.assertTrue(particion.is_cancelled())
+
+        # Reiniciar descarta la cancelación anterior y finalizar libera la planificación
+        coordinador.start()
+        self.assertFalse(is_cancel_requested(self.planificacion.id))
+        coordinador.finish()
+        self.assertIsNone(is_running(self.planificacion.id))
+        self.assertFalse(request_cancellation(self.planificacion.id))
+
+    def test_ejecucion_abandonada_caduca(self):
+        CancellationToken(self.planificacion.id).start()
+        EjecucionEnCurso.objects.update(iniciada=timezone.now() - timedelta(hours=7))
+
+        self.assertIsNone(is_running(self.planificacion.id))
+        self.assertFalse(request_cancellation(self.planificacion.id))
@@ -0,0 +1,127 @@
+import datetime
+import random
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.planificacion.models import FranjaHoraria
+from apps.planificacion.scheduling.base import SchedulingAssignment, SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.checkpoint import delete_checkpoint, load_checkpoint, save_checkpoint
+from apps.planificacion.scheduling.encoding import EncodedAssignment
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+POBLACION = 6
+GENERACIONES = 8
+
+
+class CheckpointDirMixin:
+
+    def setUp(self):
+        super().setUp()
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = override_settings(SCHEDULING_CHECKPOINT_DIR=directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+
+class CheckpointFileTest(CheckpointDirMixin, SimpleTestCase):
+    """Escritura y lectura del archivo de checkpoint"""
+
+    def test_ida_y_vuelta(self):
+        def colocacion(asignacion_id, aula_id):
+            return SchedulingAssignment(
+                asignacion_docente=SimpleNamespace(id=asignacion_id), franja_horaria=SimpleNamespace(id=7),
+                aula=SimpleNamespace(id=aula_id) if aula_id else None, capacidad_estudiantes=30,
+                modalidad='presencial' if aula_id else 'virtual'
+            )
+
+        rng = random.Random(3)
+        mejor = [colocacion(1, 100)]
+        poblacion = [[colocacion(1, 100), colocacion(2, None)], []]
+
+        save_checkpoint('run', 9, 'huella', 3, 2, 10, 4, rng.getstate(), mejor, 12.5, poblacion)
+        checkpoint = load_checkpoint('run')
+
+        self.assertEqual((checkpoint.planificacion_id, checkpoint.generation, checkpoint.best_fitness), (9, 4, 12.5))
+        self.assertEqual(checkpoint.best_so_far, [EncodedAssignment(1, 7, 100, 'presencial', 30)])
+        self.assertEqual(checkpoint.population, [
+            [EncodedAssignment(1, 7, 100, 'presencial', 30), EncodedAssignment(2, 7, None, 'virtual', 30)],
+            [],
+        ])
+        # El estado del RNG se restaura exactamente
+        restaurado = random.Random()
+        restaurado.setstate(checkpoint.rng_state)
+        self.assertEqual(restaurado.random(), rng.random())
+
+        delete_checkpoint('run')
+        self.assertIsNone(load_checkpoint('run'))
+
+
+class GeneticCheckpointResumeTest(CheckpointDirMixin, TestCase):
+    """Una ejecución interrumpida se reanuda desde la generación guardada"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=6)
+
+    def engine(self, **kwargs):
+        return SchedulingEngineFactory.create_engine(
+            SchedulingStrategy.GENETIC_ALGORITHM, seed=5, population_size=POBLACION, generations=GENERACIONES,
+            checkpoint_id='ga', checkpoint_interval=0, **kwargs
+        )
+
+    def ejecutar(self, engine):
+        return engine.execute_scheduling(self.planificacion, {'abort_if_infeasible': False})
+
+    def interrumpir(self, generacion):
+        """Ejecuta hasta que falla la evaluación de la generación indicada"""
+        engine = self.engine()
+        original = engine._evaluate_fitness
+        llamadas = iter(range(POBLACION * GENERACIONES))
+
+        def evaluar(individual):
+            if next(llamadas) == POBLACION * generacion:
+                raise RuntimeError('worker caído')
+            return original(individual)
+
+        with self.assertLogs('apps.planificacion.scheduling', 'ERROR'):
+            with mock.patch.object(engine, '_evaluate_fitness', side_effect=evaluar):
+                self.assertFalse(self.ejecutar(engine).success)
+
+    def horario(self, result):
+        return [(a.asignacion_docente.id, a.franja_horaria.id, a.aula.id) for a in result.assignments]
+
+    def test_reanuda_desde_generacion_guardada(self):
+        completo = self.ejecutar(self.engine())
+        # La ejecución completa elimina su checkpoint
+        self.assertIsNone(load_checkpoint('ga'))
+
+        self.interrumpir(generacion=3)
+        self.assertEqual(load_checkpoint('ga').generation, 3)
+
+        engine = self.engine(resume=True)
+        with mock.patch.object(engine, '_evaluate_fitness', wraps=engine._evaluate_fitness) as fitness:
+            reanudado = self.ejecutar(engine)
+
+        # Solo se evalúan las generaciones restantes y la población final
+        self.assertEqual(fitness.call_count, POBLACION * (GENERACIONES - 3 + 1))
+        self.assertEqual(self.horario(reanudado), self.horario(completo))
+        self.assertIsNone(load_checkpoint('ga'))
+
+    def test_datos_modificados_rechazan_checkpoint(self):
+        self.interrumpir(generacion=2)
+        FranjaHoraria.objects.create(
+            nombre='Nueva', dia_semana='sabado', hora_inicio=datetime.time(8), hora_fin=datetime.time(10)
+        )
+
+        with self.assertLogs('apps.planificacion.scheduling', 'ERROR'):
+            result = self.ejecutar(self.engine(resume=True))
+
+        self.assertFalse(result.success)
+        self.assertIn('no corresponde', result.message)
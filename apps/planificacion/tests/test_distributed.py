@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.planificacion.models import SchedulingRun
+from apps.planificacion.scheduling import distributed
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.cancellation import is_running
+
+User = get_user_model()
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+PARAMETROS = {'population_size': 6, 'generations': 3}
+
+
+# Backend de resultados en memoria: las pruebas no requieren Redis
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True, CELERY_RESULT_BACKEND='cache+memory://')
+class DistributedSchedulingTest(APITestCase):
+    """El chord se ejecuta en el proceso con task_always_eager"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=3)
+        cls.admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        cls.otro = User.objects.create_user('otro', password='x', rol='docente')
+
+    def setUp(self):
+        cache.clear()
+
+    def despachar(self, **kwargs):
+        return distributed.dispatch_distributed_scheduling(
+            self.planificacion, ['docente_priority', 'genetic_algorithm'], [1, 2], PARAMETROS, **kwargs
+        ).get()
+
+    def test_elige_mejor_particion(self):
+        resultado = self.despachar()
+
+        self.assertEqual(len(resultado['partitions']), 4)
+        mejor = min(resultado['partitions'], key=distributed._rank)
+        self.assertEqual(resultado['best'], mejor)
+        self.assertEqual(resultado['partitions'][0], mejor)
+        self.assertEqual(SchedulingRun.objects.filter(planificacion=self.planificacion).count(), 4)
+        self.assertFalse(resultado['saved'])
+        self.assertIsNone(is_running(self.planificacion.id))
+
+    def test_guarda_mejor_particion(self):
+        resultado = self.despachar(save=True)
+
+        self.assertTrue(resultado['saved'])
+        self.assertEqual(
+            self.planificacion.asignaciones_docente.filter(horarios__is_activa=True).count(),
+            resultado['best']['total_assignments']
+        )
+
+    def test_particion_con_error_no_bloquea(self):
+        original = distributed._solve_partition
+
+        def solve(planificacion_id, strategy, seed, *args):
+            if strategy == 'genetic_algorithm' and seed == 2:
+                raise RuntimeError('worker caído')
+            return original(planificacion_id, strategy, seed, *args)
+
+        with self.assertLogs(distributed.logger, 'ERROR'):
+            with mock.patch.object(distributed, '_solve_partition', side_effect=solve):
+                resultado = self.despachar()
+
+        errores = [p for p in resultado['partitions'] if 'error' in p]
+        self.assertEqual(errores, [{'strategy': 'genetic_algorithm', 'seed': 2, 'error': 'worker caído'}])
+        # Las particiones con error quedan al final
+        self.assertEqual(resultado['partitions'][-1], errores[0])
+        self.assertIsNotNone(resultado['best'])
+        self.assertIsNone(is_running(self.planificacion.id))
+
+    def test_despacho_fallido_libera_planificacion(self):
+        with mock.patch.object(distributed, 'chord', side_effect=ConnectionError('sin broker')):
+            with self.assertRaises(ConnectionError):
+                self.despachar()
+
+        self.assertIsNone(is_running(self.planificacion.id))
+
+    def test_endpoint(self):
+        url = f'/api/planificacion/algoritmo/{self.planificacion.id}/distribuido/'
+        datos = {'strategies': ['genetic_algorithm'], 'seeds': [1, 2], **PARAMETROS}
+
+        self.client.force_authenticate(self.otro)
+        self.assertEqual(self.client.post(url, datos, format='json').status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        invalidos = [
+            {'seeds': distributed.MAX_SEEDS + 1},
+            {'seeds': list(range(distributed.MAX_SEEDS + 1))},
+            {'seeds': [1, -1]},
+            {'seeds': [2 ** 63]},
+            {'strategies': ['docente_priority', 'genetic_algorithm', 'multi_objective'],
+             'seeds': distributed.MAX_SEEDS},
+            {'strategies': 'genetic_algorithm'},
+            {'population_size': 0},
+            {'generations': 'muchas'},
+        ]
+        for cambio in invalidos:
+            with self.subTest(cambio=cambio):
+                response = self.client.post(url, {**datos, **cambio}, format='json')
+                self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(url, datos, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['particiones'], 2)
+        self.assertEqual(len(response.data['resultado']['partitions']), 2)
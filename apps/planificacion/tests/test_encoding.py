@@ -0,0 +1,65 @@
+from array import array
+import zlib
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from apps.planificacion.scheduling.base import SchedulingAssignment
+from apps.planificacion.scheduling.encoding import (
+    EncodedAssignment, decode_solution, decode_values, encode_solution, encode_values,
+    pack_assignments, solution_map,
+)
+
+
+def colocacion(asignacion_id, franja_id, aula_id, modalidad, capacidad):
+    return SchedulingAssignment(
+        asignacion_docente=SimpleNamespace(id=asignacion_id),
+        franja_horaria=SimpleNamespace(id=franja_id),
+        aula=SimpleNamespace(id=aula_id) if aula_id else None,
+        capacidad_estudiantes=capacidad,
+        modalidad=modalidad
+    )
+
+
+class EncodingTest(SimpleTestCase):
+    """Codificación compacta de soluciones"""
+
+    def setUp(self):
+        self.assignments = [
+            colocacion(1, 10, 100, 'presencial', 30),
+            colocacion(2, 11, None, 'virtual', 35),
+            colocacion(3, 10, 101, 'hibrida', 20),
+            colocacion(2 ** 32 - 1, 12, 102, 'presencial', 0),
+        ]
+
+    def test_ida_y_vuelta(self):
+        self.assertEqual(decode_solution(encode_solution(self.assignments)), [
+            EncodedAssignment(1, 10, 100, 'presencial', 30),
+            EncodedAssignment(2, 11, None, 'virtual', 35),
+            EncodedAssignment(3, 10, 101, 'hibrida', 20),
+            EncodedAssignment(2 ** 32 - 1, 12, 102, 'presencial', 0),
+        ])
+
+    def test_cinco_enteros_por_asignacion(self):
+        values = pack_assignments(self.assignments)
+
+        self.assertEqual(values.typecode, 'I')
+        self.assertEqual(len(values), 5 * len(self.assignments))
+        self.assertEqual(list(values[5:10]), [2, 11, 0, 1, 35])
+
+    def test_solucion_vacia(self):
+        self.assertEqual(decode_solution(encode_solution([])), [])
+        self.assertEqual(len(decode_values(b'')), 0)
+
+    def test_bytes_little_endian(self):
+        blob = encode_values(array('I', [1, 256]))
+
+        self.assertEqual(zlib.decompress(blob), b'\x01\x00\x00\x00\x00\x01\x00\x00')
+        self.assertEqual(list(decode_values(memoryview(blob))), [1, 256])
+
+    def test_mapa_por_asignacion(self):
+        mapa = solution_map(encode_solution(self.assignments))
+
+        self.assertEqual(mapa[2].franja_id, 11)
+        self.assertIsNone(mapa[2].aula_id)
+        self.assertEqual(len(mapa), 4)
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.planificacion.models import FranjaHoraria
+from apps.planificacion.scheduling import explain
+from apps.planificacion.scheduling.base import SchedulingAssignment, SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.explain import UnassignmentExplainer
+from apps.planificacion.scheduling.index import OccupancyIndex
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+
+def asignacion(id, docente, materia, semestre=1):
+    return SimpleNamespace(
+        id=id, docente_id=docente, materia_id=materia,
+        materia=SimpleNamespace(id=materia, carrera_id=1, semestre=semestre)
+    )
+
+
+class UnassignmentExplainerTest(SimpleTestCase):
+    """Motivos de las asignaciones no colocadas a partir de los bitsets finales"""
+
+    def setUp(self):
+        self.franjas = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+        self.aulas = [SimpleNamespace(id=10, capacidad=40), SimpleNamespace(id=11, capacidad=20)]
+        self.occupancy = OccupancyIndex(self.franjas)
+
+    def ocupar(self, asignacion_docente, franja, aula=None):
+        self.occupancy.reserve(SchedulingAssignment(
+            asignacion_docente=asignacion_docente, franja_horaria=self.franjas[franja],
+            aula=self.aulas[aula] if aula is not None else None, capacidad_estudiantes=20
+        ))
+
+    def codigos(self, asignacion_docente, demanda=30, **kwargs):
+        explainer = UnassignmentExplainer(
+            self.occupancy, self.franjas, self.aulas, capacity_estimator=lambda a: demanda, **kwargs
+        )
+        return [reason.codigo for reason in explainer.explain(asignacion_docente)]
+
+    def test_sin_aula_con_capacidad(self):
+        self.assertEqual(self.codigos(asignacion(1, 1, 10), demanda=50), [explain.SIN_AULA_CAPACIDAD])
+        # En modalidad virtual la capacidad no limita
+        self.assertEqual(self.codigos(asignacion(1, 1, 10), demanda=50, allow_virtual=True),
+                         [explain.SIN_RESTRICCION_ACTIVA])
+
+    def test_docente_sin_franjas(self):
+        self.ocupar(asignacion(2, 1, 11, semestre=2), 0)
+        self.occupancy.block_docente(1, [2])
+        explainer = UnassignmentExplainer(
+            self.occupancy, self.franjas, self.aulas, unavailable=lambda docente_id: [2]
+        )
+
+        [reason] = explainer.explain(asignacion(1, 1, 10))
+
+        self.assertEqual(reason.codigo, explain.DOCENTE_SIN_FRANJAS)
+        self.assertIn('1 con otras clases y 1 no disponibles', reason.detalle)
+
+    def test_cohorte_ocupada(self):
+        # Otra materia del mismo semestre ocupa una franja; la otra la ocupa el docente
+        self.ocupar(asignacion(2, 2, 11), 0)
+        self.ocupar(asignacion(3, 1, 12, semestre=2), 1)
+
+        self.assertEqual(self.codigos(asignacion(1, 1, 10)), [explain.COHORTE_OCUPADA])
+
+    def test_aulas_ocupadas(self):
+        self.ocupar(asignacion(2, 2, 11, semestre=2), 0, aula=0)
+        self.ocupar(asignacion(3, 3, 12, semestre=2), 1, aula=0)
+
+        self.assertEqual(self.codigos(asignacion(1, 1, 10)), [explain.AULAS_OCUPADAS])
+        # El aula pequeña está libre y alcanza para una demanda menor
+        self.assertEqual(self.codigos(asignacion(1, 1, 10), demanda=15), [explain.SIN_RESTRICCION_ACTIVA])
+
+    def test_rechazada_en_validacion(self):
+        explainer = UnassignmentExplainer(self.occupancy, self.franjas, self.aulas)
+
+        reasons = explainer.explain(asignacion(1, 1, 10), ['Aula en mantenimiento'])
+
+        self.assertEqual([reason.codigo for reason in reasons], [explain.RECHAZADA_EN_VALIDACION])
+        self.assertIn('Aula en mantenimiento', reasons[0].detalle)
+        self.assertEqual(reasons[0].to_dict()['codigo'], explain.RECHAZADA_EN_VALIDACION)
+
+
+class EngineUnassignedReasonsTest(TestCase):
+
+    def test_cada_asignacion_no_colocada_tiene_motivo(self):
+        escala = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                                dias=2, franjas_por_dia=2, density=0.75)
+        planificacion = generate_synthetic_institution(escala, seed=1)
+        # Con una sola franja activa la mayoría de las asignaciones queda sin colocar
+        FranjaHoraria.objects.exclude(pk=FranjaHoraria.objects.order_by('id')[0].pk).update(is_activa=False)
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.BALANCED_DISTRIBUTION, seed=1)
+
+        result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+
+        self.assertTrue(result.unassigned)
+        self.assertEqual(set(result.unassigned_reasons), {a.id for a in result.unassigned})
+        for reasons in result.unassigned_reasons.values():
+            self.assertTrue(reasons)
+            self.assertNotIn(explain.SIN_RESTRICCION_ACTIVA, [reason['codigo'] for reason in reasons])
@@ -0,0 +1,113 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.asignaciones.models import AsignacionDocente
+from apps.aulas.models import Aula, TipoAula
+from apps.planificacion.models import Carrera, FranjaHoraria, Materia, Periodo, PlanificacionAcademica
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.feasibility import FeasibilityAnalyzer
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+
+class FeasibilityAnalyzerTest(TestCase):
+    """Cotas de conteo previas a la ejecución del motor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        periodo = Periodo.objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        cls.planificacion = PlanificacionAcademica.objects.create(nombre='Plan', periodo=periodo, creado_por=admin)
+        carrera = Carrera.objects.create(codigo='ING', nombre='Ingeniería')
+        cls.docente = User.objects.create_user('docente', password='x', rol='docente')
+        # Tres materias del primer semestre (demanda estimada de 35) para un mismo docente
+        cls.asignaciones = [
+            AsignacionDocente.objects.create(
+                docente=cls.docente, planificacion=cls.planificacion, carga_horaria_semanal=4,
+                materia=Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=1, carrera=carrera)
+            )
+            for i in range(3)
+        ]
+        # Dos franjas de dos horas y una sola aula de 30
+        for inicio in (8, 10):
+            FranjaHoraria.objects.create(
+                nombre=f'Bloque {inicio}', dia_semana='lunes',
+                hora_inicio=datetime.time(inicio), hora_fin=datetime.time(inicio + 2)
+            )
+        tipo = TipoAula.objects.create(nombre='Magistral')
+        Aula.objects.create(codigo='A-101', nombre='Aula', tipo=tipo, capacidad=30, piso=1, edificio='A')
+
+    def estimador(self, asignacion):
+        return 35
+
+    def test_cotas_violadas(self):
+        with self.assertNumQueries(3):
+            report = FeasibilityAnalyzer(capacity_estimator=self.estimador).analyze(self.planificacion)
+
+        self.assertFalse(report.feasible)
+        self.assertEqual(
+            {issue.code: issue.blocking for issue in report.issues},
+            {
+                'capacidad_insuficiente': True,
+                'docente_sin_franjas': True,
+                'docente_sobrecarga': False,
+                'cohorte_sin_franjas': True,
+                'sin_aula_suficiente': True,
+            }
+        )
+        self.assertEqual(report.stats, {
+            'asignaciones': 3, 'franjas': 2, 'aulas': 1, 'pares_aula_franja': 2, 'horas_disponibles': 4.0
+        })
+        sobrecarga = next(issue for issue in report.issues if issue.code == 'docente_sobrecarga')
+        self.assertEqual(sobrecarga.details['horas'], 12)
+
+    def test_modalidad_virtual_no_bloquea_por_aulas(self):
+        report = FeasibilityAnalyzer(capacity_estimator=self.estimador, allow_virtual=True).analyze(self.planificacion)
+
+        self.assertEqual(
+            sorted(issue.code for issue in report.issues if not issue.blocking),
+            ['capacidad_insuficiente', 'docente_sobrecarga', 'sin_aula_suficiente']
+        )
+        # Las cotas de docente y cohorte siguen bloqueando
+        self.assertFalse(report.feasible)
+
+    def test_sobrecarga_horaria_no_bloquea(self):
+        # Una sola asignación cabe en una franja aunque sus horas superen las de la grilla
+        AsignacionDocente.objects.filter(pk__in=[a.pk for a in self.asignaciones[1:]]).update(is_activa=False)
+        self.asignaciones[0].carga_horaria_semanal = 6
+        self.asignaciones[0].save()
+
+        report = FeasibilityAnalyzer().analyze(self.planificacion)
+
+        self.assertTrue(report.feasible)
+        self.assertEqual([issue.code for issue in report.issues], ['docente_sobrecarga'])
+        self.assertEqual(report.blocking_issues, [])
+
+    def test_planificacion_factible(self):
+        AsignacionDocente.objects.filter(pk__in=[a.pk for a in self.asignaciones[1:]]).update(is_activa=False)
+        self.asignaciones[0].carga_horaria_semanal = 2
+        self.asignaciones[0].save()
+
+        report = FeasibilityAnalyzer().analyze(self.planificacion)
+
+        self.assertTrue(report.feasible)
+        self.assertEqual(report.issues, [])
+        self.assertEqual(report.summary(), "Planificación factible")
+
+    def test_motor_aborta_sin_generar(self):
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.DOCENTE_PRIORITY, seed=1)
+
+        with self.assertLogs('apps.planificacion.scheduling', 'INFO'):
+            result = engine.execute_scheduling(self.planificacion, {})
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.assignments, [])
+        self.assertEqual(len(result.unassigned), 3)
+        self.assertTrue(result.message.startswith("Planificación infactible"))
+        self.assertNotIn('generate', [phase['name'] for phase in result.phases])
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.history import record_run
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=3, semestres=2, docentes=3, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.5)
+
+
+def registrar(planificacion, strategy=SchedulingStrategy.DOCENTE_PRIORITY):
+    engine = SchedulingEngineFactory.create_engine(strategy, seed=1)
+    result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+    return record_run(engine, planificacion, result)
+
+
+class SchedulingHistoryAccessTest(APITestCase):
+    """El historial y la comparación respetan la visibilidad de la planificación"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.propia = generate_synthetic_institution(ESCALA, seed=1)
+        cls.ajena = generate_synthetic_institution(ESCALA, seed=2)
+        cls.usuario = cls.propia.creado_por
+        cls.runs = [registrar(cls.propia), registrar(cls.propia, SchedulingStrategy.BALANCED_DISTRIBUTION)]
+        cls.run_ajeno = registrar(cls.ajena)
+
+    def setUp(self):
+        self.client.force_authenticate(self.usuario)
+
+    def historial(self, planificacion):
+        return self.client.get(f'/api/planificacion/algoritmo/{planificacion.id}/ejecuciones/')
+
+    def comparar(self, base, otra):
+        return self.client.get(f'/api/planificacion/algoritmo/ejecuciones/{base.id}/comparar/{otra.id}/')
+
+    def test_historial_de_planificacion_ajena_en_borrador(self):
+        self.assertEqual(len(self.historial(self.propia).data['ejecuciones']), 2)
+        self.assertEqual(self.historial(self.ajena).status_code, 404)
+
+        self.ajena.estado = 'aprobada'
+        self.ajena.save()
+        self.assertEqual(self.historial(self.ajena).status_code, 200)
+
+    def test_comparar_misma_planificacion(self):
+        self.assertEqual(self.comparar(*self.runs).status_code, 200)
+
+    def test_comparar_ejecucion_no_visible(self):
+        self.assertEqual(self.comparar(self.runs[0], self.run_ajeno).status_code, 404)
+
+    def test_comparar_entre_planificaciones(self):
+        self.ajena.estado = 'vigente'
+        self.ajena.save()
+
+        response = self.comparar(self.runs[0], self.run_ajeno)
+
+        self.assertEqual(response.status_code, 400)
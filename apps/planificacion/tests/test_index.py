@@ -0,0 +1,145 @@
+import random
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from apps.planificacion.scheduling.base import SchedulingAssignment, StudentCohortConstraint
+from apps.planificacion.scheduling.index import CohortMatrix, OccupancyIndex
+
+
+def asignacion(id, docente, materia, carrera=1, semestre=1):
+    return SimpleNamespace(
+        id=id, docente_id=docente, materia_id=materia,
+        materia=SimpleNamespace(id=materia, carrera_id=carrera, semestre=semestre)
+    )
+
+
+def colocacion(asignacion_docente, franja, aula=None):
+    return SchedulingAssignment(
+        asignacion_docente=asignacion_docente, franja_horaria=franja, aula=aula, capacidad_estudiantes=20
+    )
+
+
+class NaiveOccupancy:
+    """Referencia: recorre las colocaciones reservadas en cada consulta"""
+
+    def __init__(self):
+        self.reservadas = []
+
+    def docente_free(self, docente_id, franja):
+        return not any(
+            a.asignacion_docente.docente_id == docente_id and a.franja_horaria.id == franja.id
+            for a in self.reservadas
+        )
+
+    def aula_free(self, aula_id, franja):
+        return not any(
+            a.aula is not None and a.aula.id == aula_id and a.franja_horaria.id == franja.id
+            for a in self.reservadas
+        )
+
+    def cohort_free(self, asignacion_docente, franja):
+        materia = asignacion_docente.materia
+        return not any(
+            a.franja_horaria.id == franja.id
+            and (a.asignacion_docente.materia.carrera_id, a.asignacion_docente.materia.semestre)
+            == (materia.carrera_id, materia.semestre)
+            and a.asignacion_docente.materia_id != asignacion_docente.materia_id
+            for a in self.reservadas
+        )
+
+    def is_free(self, asignacion_docente, aula, franja):
+        return (
+            self.docente_free(asignacion_docente.docente_id, franja)
+            and (aula is None or self.aula_free(aula.id, franja))
+            and self.cohort_free(asignacion_docente, franja)
+        )
+
+
+class CohortMatrixTest(SimpleTestCase):
+
+    def test_cohorte_por_carrera_y_semestre(self):
+        matriz = CohortMatrix([asignacion(1, 1, 10), asignacion(2, 2, 11), asignacion(3, 3, 12, semestre=2)])
+
+        self.assertEqual(matriz.cohort_of(asignacion(1, 1, 10)), matriz.cohort_of(asignacion(2, 2, 11)))
+        self.assertNotEqual(matriz.cohort_of(asignacion(1, 1, 10)), matriz.cohort_of(asignacion(3, 3, 12)))
+        # Las asignaciones no registradas se incorporan al consultarlas
+        self.assertEqual(matriz.cohort_of(asignacion(4, 4, 13, carrera=2)), 2)
+
+
+class OccupancyIndexTest(SimpleTestCase):
+    """El índice por bitsets coincide con la verificación ingenua"""
+
+    def test_coincide_con_verificacion_ingenua(self):
+        rng = random.Random(7)
+        franjas = [SimpleNamespace(id=100 + i) for i in range(12)]
+        aulas = [SimpleNamespace(id=200 + i) for i in range(4)] + [None]
+        asignaciones = [
+            asignacion(i, docente=rng.randrange(5), materia=rng.randrange(8),
+                       carrera=rng.randrange(2), semestre=rng.randrange(2))
+            for i in range(30)
+        ]
+        index = OccupancyIndex(franjas, asignaciones)
+        naive = NaiveOccupancy()
+
+        for _ in range(400):
+            if naive.reservadas and rng.random() < 0.3:
+                liberada = naive.reservadas.pop(rng.randrange(len(naive.reservadas)))
+                index.release(liberada)
+            else:
+                # Como en los motores, solo se reserva lo que está libre
+                nueva = colocacion(rng.choice(asignaciones), rng.choice(franjas), rng.choice(aulas))
+                libre = naive.is_free(nueva.asignacion_docente, nueva.aula, nueva.franja_horaria)
+                self.assertEqual(index.is_free(nueva.asignacion_docente, nueva.aula, nueva.franja_horaria), libre)
+                if libre:
+                    naive.reservadas.append(nueva)
+                    index.reserve(nueva)
+
+            consulta = rng.choice(asignaciones)
+            franja = rng.choice(franjas)
+            aula = rng.choice(aulas[:-1])
+            self.assertEqual(index.docente_free(consulta.docente_id, franja),
+                             naive.docente_free(consulta.docente_id, franja))
+            self.assertEqual(index.aula_free(aula.id, franja), naive.aula_free(aula.id, franja))
+            self.assertEqual(index.cohort_free(consulta, franja), naive.cohort_free(consulta, franja))
+
+    def test_secciones_de_la_misma_materia(self):
+        franja = SimpleNamespace(id=1)
+        seccion_a, seccion_b = asignacion(1, 1, 10), asignacion(2, 2, 10)
+        otra_materia = asignacion(3, 3, 11)
+        index = OccupancyIndex([franja])
+
+        primera = colocacion(seccion_a, franja)
+        index.reserve(primera)
+        index.reserve(colocacion(seccion_b, franja))
+
+        self.assertFalse(index.cohort_free(otra_materia, franja))
+        # Liberar una sección no libera la franja mientras quede la otra
+        index.release(primera)
+        self.assertFalse(index.cohort_free(otra_materia, franja))
+
+    def test_bloqueo_de_docente(self):
+        franjas = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+        index = OccupancyIndex(franjas)
+
+        # Las franjas no registradas en el índice se ignoran
+        index.block_docente(5, [2, 99])
+
+        self.assertTrue(index.docente_free(5, franjas[0]))
+        self.assertFalse(index.docente_free(5, franjas[1]))
+        self.assertFalse(index.is_free(asignacion(1, 5, 10), None, franjas[1]))
+
+
+class StudentCohortConstraintTest(SimpleTestCase):
+
+    def test_cruce_de_materias_de_la_cohorte(self):
+        franja = SimpleNamespace(id=1, __str__=lambda self: 'Bloque')
+        constraint = StudentCohortConstraint()
+        constraint.commit(colocacion(asignacion(1, 1, 10), franja))
+
+        self.assertFalse(constraint.validate(colocacion(asignacion(2, 2, 11), franja))[0])
+        self.assertTrue(constraint.validate(colocacion(asignacion(3, 3, 10), franja))[0])
+        self.assertTrue(constraint.validate(colocacion(asignacion(4, 4, 12, semestre=2), franja))[0])
+
+        constraint.reset()
+        self.assertTrue(constraint.validate(colocacion(asignacion(2, 2, 11), franja))[0])
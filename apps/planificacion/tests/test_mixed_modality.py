@@ -0,0 +1,79 @@
+import datetime
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.asignaciones.models import AsignacionDocente
+from apps.aulas.models import Aula, TipoAula
+from apps.planificacion.models import Carrera, FranjaHoraria, Materia, Periodo, PlanificacionAcademica
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+
+class MixedModalityEngineTest(TestCase):
+    """Con las aulas saturadas el excedente pasa a híbrida y luego a virtual"""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user('admin', password='x', is_staff=True, rol='administrador')
+        periodo = Periodo.objects.create(
+            nombre='2026-1', anio=2026, numero=1,
+            fecha_inicio=datetime.date(2026, 3, 1), fecha_fin=datetime.date(2026, 7, 31)
+        )
+        cls.planificacion = PlanificacionAcademica.objects.create(nombre='Plan', periodo=periodo, creado_por=admin)
+        # Cinco cohortes distintas con demanda estimada de 25 estudiantes
+        cohortes = [('ING', 3), ('ING', 4), ('ING', 5), ('ADM', 3), ('ADM', 4)]
+        carreras = {codigo: Carrera.objects.create(codigo=codigo, nombre=codigo) for codigo in ('ING', 'ADM')}
+        for i, (carrera, semestre) in enumerate(cohortes):
+            AsignacionDocente.objects.create(
+                docente=User.objects.create_user(f'docente{i}', password='x', rol='docente'),
+                materia=Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=semestre,
+                                               carrera=carreras[carrera]),
+                planificacion=cls.planificacion, carga_horaria_semanal=4
+            )
+        for inicio in (8, 10):
+            FranjaHoraria.objects.create(
+                nombre=f'Bloque {inicio}', dia_semana='lunes',
+                hora_inicio=datetime.time(inicio), hora_fin=datetime.time(inicio + 2)
+            )
+        tipo = TipoAula.objects.create(nombre='Magistral')
+        # Solo la primera aula alcanza; la segunda admite la mitad de la sección y la tercera no
+        cls.aulas = [
+            Aula.objects.create(codigo=f'A-{capacidad}', nombre='Aula', tipo=tipo, capacidad=capacidad,
+                                piso=1, edificio='A')
+            for capacidad in (40, 20, 10)
+        ]
+
+    def test_descarga_a_hibrida_y_virtual(self):
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.MIXED_MODALITY, seed=1)
+
+        result = engine.execute_scheduling(self.planificacion, {'abort_if_infeasible': False})
+
+        self.assertEqual(len(result.assignments), 5)
+        self.assertEqual(
+            Counter(a.modalidad for a in result.assignments),
+            {'presencial': 2, 'hibrida': 2, 'virtual': 1}
+        )
+        for assignment in result.assignments:
+            aula = assignment.aula
+            if assignment.modalidad == 'presencial':
+                self.assertEqual(aula, self.aulas[0])
+            elif assignment.modalidad == 'hibrida':
+                self.assertEqual(aula, self.aulas[1])
+                self.assertEqual(assignment.capacidad_estudiantes, aula.capacidad)
+            else:
+                self.assertIsNone(aula)
+        # Ningún aula se usa dos veces en la misma franja
+        ocupadas = [(a.aula.id, a.franja_horaria.id) for a in result.assignments if a.aula]
+        self.assertEqual(len(set(ocupadas)), len(ocupadas))
+
+    def test_sin_fraccion_minima_no_hay_hibrida(self):
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.MIXED_MODALITY, seed=1)
+        engine.hybrid_min_ratio = 1.0
+
+        result = engine.execute_scheduling(self.planificacion, {'abort_if_infeasible': False})
+
+        self.assertEqual(Counter(a.modalidad for a in result.assignments), {'presencial': 2, 'virtual': 3})
@@ -0,0 +1,111 @@
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.pareto import (
+    ParetoArchive, ParetoSolution, dominates, non_dominated_sort, select_from_front, select_survivors,
+)
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+
+
+def solucion(*objectives, violations=0):
+    return ParetoSolution(assignments=[], objectives=tuple(objectives) + (0.0,) * (5 - len(objectives)),
+                          violations=violations)
+
+
+def no_dominadas(solutions):
+    """Referencia por fuerza bruta"""
+    return {
+        (s.violations, s.objectives) for s in solutions
+        if not any(dominates(other, s) for other in solutions)
+    }
+
+
+class DominanceTest(SimpleTestCase):
+
+    def test_dominancia(self):
+        self.assertTrue(dominates(solucion(2, 1), solucion(1, 1)))
+        self.assertFalse(dominates(solucion(2, 0), solucion(1, 1)))
+        self.assertFalse(dominates(solucion(1, 1), solucion(1, 1)))
+        # Menos violaciones domina sin importar los objetivos
+        self.assertTrue(dominates(solucion(0, 0, violations=1), solucion(9, 9, violations=2)))
+
+    def test_frentes(self):
+        a, b, c, d = solucion(3, 1), solucion(1, 3), solucion(1, 1), solucion(0, 0)
+
+        fronts = non_dominated_sort([c, a, d, b])
+
+        self.assertEqual([set(map(id, front)) for front in fronts], [{id(a), id(b)}, {id(c)}, {id(d)}])
+        self.assertEqual([s.rank for s in (a, b, c, d)], [0, 0, 1, 2])
+
+    def test_supervivientes_elitistas(self):
+        extremos = [solucion(4, 0), solucion(0, 4)]
+        intermedios = [solucion(3, 1.5), solucion(2, 2), solucion(1.5, 3)]
+        dominada = solucion(0.5, 0.5)
+
+        survivors = select_survivors([dominada] + intermedios + extremos, 3)
+
+        self.assertEqual(len(survivors), 3)
+        self.assertNotIn(dominada, survivors)
+        # Los extremos del frente tienen distancia infinita y sobreviven
+        for extremo in extremos:
+            self.assertIn(extremo, survivors)
+
+
+class ParetoArchiveTest(SimpleTestCase):
+    """El archivo conserva solo soluciones no dominadas"""
+
+    def test_coincide_con_fuerza_bruta(self):
+        rng = random.Random(3)
+        archive = ParetoArchive(max_size=1000)
+        vistas = []
+
+        for _ in range(20):
+            candidates = [
+                solucion(*(rng.randint(0, 4) for _ in range(3)), violations=rng.choice((0, 0, 1)))
+                for _ in range(10)
+            ]
+            vistas.extend(candidates)
+            archive.update(candidates)
+
+            miembros = [(s.violations, s.objectives) for s in archive.members]
+            self.assertEqual(len(miembros), len(set(miembros)))
+            self.assertEqual(set(miembros), no_dominadas(vistas))
+
+    def test_tamano_acotado_conserva_extremos(self):
+        archive = ParetoArchive(max_size=3)
+        frente = [solucion(i, 10 - i) for i in range(11)]
+
+        archive.update(frente)
+
+        self.assertEqual(len(archive.members), 3)
+        objetivos = {s.objectives[:2] for s in archive.members}
+        self.assertIn((0, 10), objetivos)
+        self.assertIn((10, 0), objetivos)
+
+    def test_pesos_eligen_compromiso(self):
+        frente = [solucion(4, 0), solucion(2, 2), solucion(0, 4)]
+
+        self.assertIs(select_from_front(frente, {'cobertura': 3.0}), frente[0])
+        self.assertIs(select_from_front(frente, {'eficiencia_aulas': 3.0}), frente[2])
+        self.assertIsNone(select_from_front([]))
+
+
+class MultiObjectiveFrontTest(TestCase):
+
+    def test_frente_del_motor_no_dominado(self):
+        planificacion = generate_synthetic_institution(ESCALA, seed=2)
+        engine = SchedulingEngineFactory.create_engine(
+            SchedulingStrategy.MULTI_OBJECTIVE, seed=1, population_size=10, generations=5
+        )
+
+        result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+
+        self.assertTrue(result.pareto_front)
+        for solution in result.pareto_front:
+            self.assertFalse(any(dominates(other, solution) for other in result.pareto_front))
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.planificacion.models import Carrera, Materia
+from apps.planificacion.scheduling import prerequisites
+from apps.planificacion.scheduling.prerequisites import PrerequisiteClosure, get_prerequisite_closure
+
+
+class PrerequisiteClosureTest(SimpleTestCase):
+    """Cierre transitivo con bitsets"""
+
+    # 1 <- 2 <- 3 <- 5 y 1 <- 4 <- 5; 6 no tiene relaciones
+    EDGES = [(2, 1), (3, 2), (4, 1), (5, 3), (5, 4)]
+
+    def setUp(self):
+        self.closure = PrerequisiteClosure(1, [1, 2, 3, 4, 5, 6], self.EDGES)
+
+    def test_prerrequisitos_indirectos(self):
+        self.assertEqual(self.closure.prerequisites_of(5), {1, 2, 3, 4})
+        self.assertEqual(self.closure.prerequisites_of(3), {1, 2})
+        self.assertEqual(self.closure.prerequisites_of(1), set())
+        self.assertTrue(self.closure.requires(5, 1))
+        self.assertFalse(self.closure.requires(1, 5))
+        self.assertFalse(self.closure.requires(3, 4))
+
+    def test_profundidad_y_dependientes(self):
+        self.assertEqual([self.closure.depth_of(i) for i in range(1, 7)], [0, 1, 2, 1, 3, 0])
+        self.assertEqual([self.closure.dependents_count(i) for i in range(1, 7)], [4, 2, 1, 1, 0, 0])
+
+    def test_materia_desconocida(self):
+        self.assertEqual(self.closure.prerequisites_of(99), set())
+        self.assertFalse(self.closure.requires(99, 1))
+        self.assertEqual(self.closure.depth_of(99), 0)
+        self.assertEqual(self.closure.dependents_count(99), 0)
+
+    def test_ciclo_no_bloquea(self):
+        with self.assertLogs(prerequisites.logger, 'WARNING'):
+            closure = PrerequisiteClosure(1, [1, 2, 3], [(2, 1), (3, 2), (2, 3)])
+
+        self.assertEqual(closure.prerequisites_of(1), set())
+        self.assertIn(1, closure.prerequisites_of(3))
+
+
+class PrerequisiteClosureCacheTest(TestCase):
+    """El cierre cacheado se reconstruye solo cuando cambia el M2M"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera = Carrera.objects.create(codigo='ING', nombre='Ingeniería')
+        cls.materias = [
+            Materia.objects.create(codigo=f'MAT{i}', nombre=f'Materia {i}', semestre=i + 1, carrera=cls.carrera)
+            for i in range(3)
+        ]
+        cls.materias[1].prereq_materias.add(cls.materias[0])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_construccion_con_dos_consultas(self):
+        with self.assertNumQueries(2):
+            closure = get_prerequisite_closure(self.carrera.id)
+        with self.assertNumQueries(0):
+            self.assertIs(type(get_prerequisite_closure(self.carrera.id)), PrerequisiteClosure)
+
+        self.assertEqual(closure.prerequisites_of(self.materias[1].id), {self.materias[0].id})
+
+    def test_cambio_de_prerrequisitos_invalida(self):
+        primero, segundo, tercero = self.materias
+        get_prerequisite_closure(self.carrera.id)
+
+        tercero.prereq_materias.add(segundo)
+
+        closure = get_prerequisite_closure(self.carrera.id)
+        self.assertEqual(closure.prerequisites_of(tercero.id), {primero.id, segundo.id})
+
+        segundo.prereq_materias.clear()
+
+        closure = get_prerequisite_closure(self.carrera.id)
+        self.assertEqual(closure.prerequisites_of(tercero.id), {segundo.id})
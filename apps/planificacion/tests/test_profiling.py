@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.planificacion.scheduling.base import SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.profiling import PhaseProfiler
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+User = get_user_model()
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=3, semestres=2, docentes=3, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.5)
+
+
+class PhaseProfilerTest(TestCase):
+    """Métricas por fase: nombres anidados, consultas y memoria pico"""
+
+    def test_fases_anidadas_y_consultas(self):
+        profiler = PhaseProfiler()
+
+        with profiler.phase('generate'):
+            User.objects.count()
+            with profiler.phase('load_data'):
+                list(User.objects.all())
+                User.objects.exists()
+
+        load_data, generate = profiler.phases
+        self.assertEqual((load_data.name, load_data.queries), ('generate.load_data', 2))
+        # La fase padre incluye las consultas de sus hijas
+        self.assertEqual((generate.name, generate.queries), ('generate', 3))
+        self.assertIsNone(generate.peak_memory_kb)
+        self.assertGreaterEqual(generate.wall_s, load_data.wall_s)
+
+    def test_fase_con_error_se_registra(self):
+        profiler = PhaseProfiler()
+
+        with self.assertRaises(RuntimeError):
+            with profiler.phase('generate'):
+                raise RuntimeError
+
+        self.assertEqual([phase.name for phase in profiler.phases], ['generate'])
+        # La pila se libera: la siguiente fase no queda anidada
+        with profiler.phase('score'):
+            pass
+        self.assertEqual(profiler.phases[-1].name, 'score')
+
+    def test_memoria_pico_de_la_hija_se_propaga(self):
+        profiler = PhaseProfiler(track_memory=True)
+
+        with profiler.session():
+            with profiler.phase('generate'):
+                with profiler.phase('load_data'):
+                    datos = [bytearray(1024) for _ in range(256)]
+                del datos
+
+        load_data, generate = profiler.phases
+        self.assertGreater(load_data.peak_memory_kb, 200)
+        self.assertGreaterEqual(generate.peak_memory_kb, load_data.peak_memory_kb)
+
+    def test_modo_de_perfilado(self):
+        with self.assertRaises(ValueError):
+            PhaseProfiler(capture='perf')
+
+        profiler = PhaseProfiler(capture='cprofile')
+        with profiler.session():
+            sum(range(1000))
+        self.assertIn('function calls', profiler.report)
+
+    def test_fases_del_motor(self):
+        planificacion = generate_synthetic_institution(ESCALA, seed=1)
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.DOCENTE_PRIORITY, seed=1)
+
+        result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+
+        fases = {phase['name']: phase for phase in result.phases}
+        for nombre in ('feasibility', 'generate', 'generate.load_data', 'validate', 'score'):
+            self.assertIn(nombre, fases)
+        self.assertEqual(fases['feasibility']['queries'], 3)
+        self.assertGreater(fases['generate.load_data']['queries'], 0)
+        self.assertGreaterEqual(fases['generate']['queries'], fases['generate.load_data']['queries'])
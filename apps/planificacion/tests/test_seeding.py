@@ -0,0 +1,87 @@
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from apps.planificacion.models import SchedulingRun
+from apps.planificacion.scheduling.base import MAX_SEED, SchedulingStrategy
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+
+ESCALA = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=4, aulas=2,
+                        dias=2, franjas_por_dia=2, density=0.75)
+PARAMETROS = {'population_size': 10, 'generations': 5}
+
+
+def horario(result):
+    return [
+        (a.asignacion_docente.id, a.franja_horaria.id, a.aula.id if a.aula else None, a.modalidad)
+        for a in result.assignments
+    ]
+
+
+class SeedReproducibilityTest(TestCase):
+    """La misma semilla reproduce el mismo horario"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=4)
+
+    def ejecutar(self, engine):
+        return engine.execute_scheduling(self.planificacion, {'abort_if_infeasible': False})
+
+    def test_misma_semilla_mismo_resultado(self):
+        for strategy in (SchedulingStrategy.GENETIC_ALGORITHM, SchedulingStrategy.MULTI_OBJECTIVE):
+            with self.subTest(strategy=strategy):
+                primero = self.ejecutar(SchedulingEngineFactory.create_engine(strategy, seed=11, **PARAMETROS))
+                segundo = self.ejecutar(SchedulingEngineFactory.create_engine(strategy, seed=11, **PARAMETROS))
+
+                self.assertTrue(primero.assignments)
+                self.assertEqual(horario(primero), horario(segundo))
+                self.assertEqual(primero.score, segundo.score)
+                self.assertEqual(primero.seed, 11)
+
+    def test_reejecucion_reinicia_generador(self):
+        engine = SchedulingEngineFactory.create_engine(
+            SchedulingStrategy.GENETIC_ALGORITHM, seed=11, **PARAMETROS
+        )
+
+        self.assertEqual(horario(self.ejecutar(engine)), horario(self.ejecutar(engine)))
+
+    def test_semilla_aleatoria_se_registra(self):
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.GENETIC_ALGORITHM, **PARAMETROS)
+
+        result = self.ejecutar(engine)
+
+        self.assertIsInstance(result.seed, int)
+        repetido = self.ejecutar(
+            SchedulingEngineFactory.create_engine(SchedulingStrategy.GENETIC_ALGORITHM, seed=result.seed, **PARAMETROS)
+        )
+        self.assertEqual(horario(result), horario(repetido))
+
+
+class SeedValidationTest(APITestCase):
+    """Las semillas que no caben en SchedulingRun.seed se rechazan antes de ejecutar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.planificacion = generate_synthetic_institution(ESCALA, seed=4)
+        cls.url = f'/api/planificacion/algoritmo/{cls.planificacion.id}/ejecutar/'
+
+    def setUp(self):
+        self.client.force_authenticate(self.planificacion.creado_por)
+
+    def test_endpoint_rechaza_semilla_fuera_de_rango(self):
+        for seed in (-1, MAX_SEED + 1, 'abc'):
+            with self.subTest(seed=seed):
+                response = self.client.post(self.url, {'seed': seed}, format='json')
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(SchedulingRun.objects.exists())
+
+        response = self.client.post(self.url, {'seed': MAX_SEED}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(SchedulingRun.objects.get().seed, MAX_SEED)
+
+    def test_comando_rechaza_semilla_fuera_de_rango(self):
+        with self.assertRaisesMessage(CommandError, 'La semilla debe estar entre 0'):
+            call_command('generate_schedule', planificacion=self.planificacion.id, seed=-1)
+        self.assertFalse(SchedulingRun.objects.exists())
@@ -0,0 +1,127 @@
+import datetime
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.planificacion.scheduling.base import SchedulingAssignment, SchedulingStrategy, TravelTimeConstraint
+from apps.planificacion.scheduling.benchmark import SyntheticScale, generate_synthetic_institution
+from apps.planificacion.scheduling.index import OccupancyIndex
+from apps.planificacion.scheduling.strategies import SchedulingEngineFactory
+from apps.planificacion.scheduling.travel import TravelModel, TravelTimeIndex
+
+
+def franja(id, inicio, fin, dia='lunes'):
+    return SimpleNamespace(id=id, dia_semana=dia, hora_inicio=datetime.time(*inicio), hora_fin=datetime.time(*fin))
+
+
+def aula(id, edificio, piso=1):
+    return SimpleNamespace(id=id, edificio=edificio, piso=piso)
+
+
+def colocacion(docente_id, franja, aula):
+    return SchedulingAssignment(
+        asignacion_docente=SimpleNamespace(id=docente_id, docente_id=docente_id,
+                                           materia=SimpleNamespace(carrera_id=1, semestre=docente_id),
+                                           materia_id=docente_id),
+        franja_horaria=franja, aula=aula, capacidad_estudiantes=20
+    )
+
+
+@override_settings(
+    SCHEDULING_BUILDING_DISTANCES={'A': {'B': 12}},
+    SCHEDULING_DEFAULT_BUILDING_MINUTES=20,
+    SCHEDULING_MINUTES_PER_FLOOR=2,
+    SCHEDULING_MAX_BREAK_MINUTES=15,
+)
+class TravelModelTest(SimpleTestCase):
+    """Retraso de los docentes entre clases consecutivas"""
+
+    def setUp(self):
+        # 8:00-9:50 y 10:00-11:50 son consecutivas (10 minutos); 13:00 queda fuera del receso máximo
+        self.franjas = [
+            franja(1, (8, 0), (9, 50)),
+            franja(2, (10, 0), (11, 50)),
+            franja(3, (13, 0), (14, 50)),
+            franja(4, (10, 0), (11, 50), dia='martes'),
+        ]
+        self.aulas = [aula(10, 'A'), aula(11, 'B'), aula(12, 'C'), aula(13, 'A', piso=4)]
+        self.model = TravelModel(self.franjas, self.aulas)
+
+    def test_adyacencia_de_franjas(self):
+        self.assertEqual(self.model.adjacent[1], ((2, 10),))
+        self.assertEqual(self.model.adjacent[2], ((1, 10),))
+        self.assertEqual(self.model.adjacent[3], ())
+        self.assertEqual(self.model.adjacent[4], ())
+
+    def test_minutos_entre_aulas(self):
+        a, b, c, a_piso4 = self.aulas
+        self.assertEqual(self.model.travel_minutes(a, b), 12)
+        self.assertEqual(self.model.travel_minutes(b, a), 12)
+        self.assertEqual(self.model.travel_minutes(a, c), 20)
+        self.assertEqual(self.model.travel_minutes(a, a_piso4), 6)
+        # Edificio desconocido: distancia por defecto
+        self.assertEqual(self.model.travel_minutes(a, aula(14, 'Z', piso=2)), 22)
+
+    def test_retraso_en_ambas_direcciones(self):
+        a, b, c, _ = self.aulas
+        index = TravelTimeIndex(self.model)
+        index.reserve(colocacion(1, self.franjas[1], a))
+
+        self.assertEqual(index.lateness(1, self.franjas[0], c), 10)
+        self.assertEqual(index.lateness(1, self.franjas[0], b), 2)
+        self.assertEqual(index.lateness(1, self.franjas[0], a), 0)
+        # Otro docente, franja no consecutiva o sección virtual: sin retraso
+        self.assertEqual(index.lateness(2, self.franjas[0], c), 0)
+        self.assertEqual(index.lateness(1, self.franjas[2], c), 0)
+        self.assertEqual(index.lateness(1, self.franjas[0], None), 0)
+
+    def test_retraso_total_del_horario(self):
+        a, _, c, _ = self.aulas
+        horario = [
+            colocacion(1, self.franjas[0], a),
+            colocacion(1, self.franjas[1], c),
+            colocacion(2, self.franjas[0], c),
+            colocacion(2, self.franjas[1], c),
+        ]
+
+        self.assertEqual(self.model.total_lateness(horario), 10)
+
+    def test_indice_de_ocupacion_mantiene_ubicaciones(self):
+        a, _, c, _ = self.aulas
+        occupancy = OccupancyIndex(self.franjas)
+        occupancy.travel = TravelTimeIndex(self.model)
+        primera = colocacion(1, self.franjas[1], a)
+
+        occupancy.reserve(primera)
+        self.assertEqual(occupancy.travel.lateness(1, self.franjas[0], c), 10)
+
+        occupancy.release(primera)
+        self.assertEqual(occupancy.travel.lateness(1, self.franjas[0], c), 0)
+
+
+class TravelTimeConstraintTest(TestCase):
+    """La restricción usa el modelo de desplazamiento del motor"""
+
+    def test_indice_del_modelo_del_motor(self):
+        escala = SyntheticScale(carreras=1, materias_por_carrera=4, semestres=2, docentes=2, aulas=3,
+                                dias=1, franjas_por_dia=3, density=0.75)
+        planificacion = generate_synthetic_institution(escala, seed=3)
+        engine = SchedulingEngineFactory.create_engine(SchedulingStrategy.DOCENTE_PRIORITY, seed=1)
+        [constraint] = [c for c in engine.constraints if isinstance(c, TravelTimeConstraint)]
+
+        result = engine.execute_scheduling(planificacion, {'abort_if_infeasible': False})
+
+        self.assertIs(constraint.index.model, engine.travel_model)
+        # reset solo descarta reservas: tras validar quedan las asignaciones aceptadas
+        colocadas = {(a.asignacion_docente.docente_id, a.franja_horaria.id) for a in result.assignments if a.aula}
+        reservadas = {
+            (docente_id, franja_id)
+            for docente_id, ubicaciones in constraint.index.placements.items()
+            for franja_id in ubicaciones
+        }
+        self.assertTrue(colocadas)
+        self.assertEqual(reservadas, colocadas)
+
+        constraint.reset()
+        self.assertIs(constraint.index.model, engine.travel_model)
+        self.assertEqual(constraint.index.placements, {})
@@ -5,6 +5,7 @@ from . import views
 # Router para ViewSets
 router = DefaultRouter()
 router.register(r'planificaciones', views.PlanificacionAcademicaViewSet, basename='planificaciones')
+router.register(r'disponibilidades', views.DisponibilidadDocenteViewSet, basename='disponibilidades')
 
 urlpatterns = [
     # ViewSet routes (incluye CRUD + acciones personalizadas)
@@ -18,11 +19,16 @@ urlpatterns = [
 
     # Dashboard
     path('dashboard/resumen/', views.dashboard_resumen, name='dashboard-resumen'),
+    path('cache/metricas/', views.metricas_cache, name='cache-metricas'),
 
     # Algoritmos de planificación
     path('algoritmo/estrategias/', views.estrategias_disponibles, name='algoritmo-estrategias'),
     path('algoritmo/<int:planificacion_id>/ejecutar/', views.ejecutar_algoritmo, name='algoritmo-ejecutar'),
+    path('algoritmo/<int:planificacion_id>/distribuido/', views.ejecutar_distribuido, name='algoritmo-distribuido'),
     path('algoritmo/<int:planificacion_id>/estado/', views.estado_algoritmo, name='algoritmo-estado'),
+    path('algoritmo/<int:planificacion_id>/cancelar/', views.cancelar_algoritmo, name='algoritmo-cancelar'),
+    path('algoritmo/<int:planificacion_id>/ejecuciones/', views.historial_ejecuciones, name='algoritmo-ejecuciones'),
+    path('algoritmo/ejecuciones/<int:run_id>/comparar/<int:otro_id>/', views.comparar_ejecuciones, name='algoritmo-comparar'),
 ]
 
 # Las URLs generadas automáticamente por el ViewSet serán:
@@ -37,4 +43,6 @@ urlpatterns = [
 # POST   /planificaciones/{id}/cambiar_estado/     -> Cambiar estado
 # GET    /planificaciones/{id}/estadisticas/       -> Obtener estadísticas
 # GET    /planificaciones/{id}/validar/            -> Validar planificación
-# POST   /planificaciones/{id}/duplicar/           -> Duplicar planificación
\ No newline at end of file
+# POST   /planificaciones/{id}/duplicar/           -> Duplicar planificación
+#
+# POST   /disponibilidades/importar/               -> Importación masiva de disponibilidad docente
\ No newline at end of file
@@ -10,7 +10,7 @@ from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 
-from .models import PlanificacionAcademica, Periodo, Carrera, Materia, FranjaHoraria
+from .models import PlanificacionAcademica, Periodo, Carrera, Materia, FranjaHoraria, SchedulingRun, DisponibilidadDocente
 from .serializers import (
     PlanificacionAcademicaListSerializer,
     PlanificacionAcademicaDetailSerializer,
@@ -20,11 +20,29 @@ from .serializers import (
     CarreraSerializer,
     MateriaSerializer,
     FranjaHorariaSerializer,
+    SchedulingRunSerializer,
+    DisponibilidadDocenteSerializer,
+    annotate_list_totals,
+    prefetch_detail,
 )
+from .response_cache import VersionedResponseMixin, cache_metrics
 from apps.asignaciones.models import AsignacionDocente, HorarioClase, ConflictoHorario
+from apps.asignaciones.conflicts import detect_horario_clashes
 
 User = get_user_model()
 
+# Acciones de detalle servidas desde la caché de respuestas
+CACHED_ACTIONS = ('retrieve', 'estadisticas', 'validar')
+
+
+def planificaciones_visibles(user, queryset=None):
+    """Planificaciones que el usuario puede consultar: las suyas y las aprobadas o vigentes"""
+    if queryset is None:
+        queryset = PlanificacionAcademica.objects.all()
+    if user.is_staff:
+        return queryset
+    return queryset.filter(Q(creado_por=user) | Q(estado__in=['aprobada', 'vigente']))
+
 
 class PlanificacionAcademicaFilter(django_filters.FilterSet):
     """Filtros para planificaciones académicas"""
@@ -41,7 +59,7 @@ class PlanificacionAcademicaFilter(django_filters.FilterSet):
         fields = ['estado', 'periodo', 'carrera', 'creado_por', 'fecha_inicio', 'fecha_fin', 'nombre']
 
 
-class PlanificacionAcademicaViewSet(ModelViewSet):
+class PlanificacionAcademicaViewSet(VersionedResponseMixin, ModelViewSet):
     """
     ViewSet completo para gestionar planificaciones académicas
     """
@@ -70,14 +88,26 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
         queryset = super().get_queryset()
 
         # Si no es admin, solo ver sus planificaciones o las aprobadas
-        if not self.request.user.is_staff:
-            queryset = queryset.filter(
-                Q(creado_por=self.request.user) |
-                Q(estado__in=['aprobada', 'vigente'])
-            )
+        queryset = planificaciones_visibles(self.request.user, queryset)
+
+        if self.action == 'list':
+            # El listado no expone carreras: se omite su prefetch
+            queryset = annotate_list_totals(queryset.prefetch_related(None))
+        elif self.action in CACHED_ACTIONS:
+            # Solo se necesita la versión; los datos se cargan si la caché falla
+            queryset = queryset.prefetch_related(None)
 
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        planificacion = self.get_object()
+
+        def construir():
+            instancia = prefetch_detail(PlanificacionAcademica.objects.filter(pk=planificacion.pk)).get()
+            return self.get_serializer(instancia).data
+
+        return self.versioned_response('detalle', planificacion, construir)
+
     def perform_create(self, serializer):
         """Asigna el usuario actual como creador"""
         serializer.save(creado_por=self.request.user)
@@ -148,7 +178,10 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
         Obtiene estadísticas detalladas de la planificación
         """
         planificacion = self.get_object()
+        return self.versioned_response('estadisticas', planificacion, lambda: self._estadisticas(planificacion))
 
+    def _estadisticas(self, planificacion):
+        """Datos de la acción estadisticas, sin caché"""
         # Estadísticas básicas
         total_asignaciones = AsignacionDocente.objects.filter(
             planificacion=planificacion, is_activa=True
@@ -161,7 +194,7 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
 
         total_conflictos = ConflictoHorario.objects.filter(
             planificacion=planificacion,
-            estado='pendiente'
+            resuelto=False
         ).count()
 
         # Estadísticas por docente
@@ -187,7 +220,7 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
             total_horarios=Count('id')
         )
 
-        return Response({
+        return {
             'resumen': {
                 'total_asignaciones': total_asignaciones,
                 'total_horarios': total_horarios,
@@ -196,7 +229,7 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
             },
             'docentes': list(docentes_stats),
             'aulas': list(aulas_stats),
-        })
+        }
 
     @action(detail=True, methods=['get'])
     def validar(self, request, pk=None):
@@ -204,66 +237,41 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
         Valida la planificación detectando conflictos
         """
         planificacion = self.get_object()
+        return self.versioned_response('validar', planificacion, lambda: self._validar(planificacion))
 
+    def _validar(self, planificacion):
+        """Datos de la acción validar, sin caché"""
         # Ejecutar validaciones
         conflictos = []
 
-        # 1. Conflictos de horario por docente
+        # 1 y 2. Conflictos de docente y de aula, incluidos los solapamientos parciales
+        for conflicto in detect_horario_clashes(planificacion):
+            conflictos.append({
+                'tipo': conflicto['tipo'],
+                'descripcion': conflicto['descripcion'],
+                'severidad': 'alta'
+            })
+
         horarios = HorarioClase.objects.filter(
             asignacion_docente__planificacion=planificacion,
             is_activa=True
-        ).select_related('asignacion_docente__docente', 'franja_horaria')
-
-        docente_horarios = {}
-        for horario in horarios:
-            docente_id = horario.asignacion_docente.docente.id
-            franja_key = (horario.franja_horaria.dia_semana, horario.franja_horaria.hora_inicio)
-
-            if docente_id not in docente_horarios:
-                docente_horarios[docente_id] = set()
-
-            if franja_key in docente_horarios[docente_id]:
-                conflictos.append({
-                    'tipo': 'conflicto_docente',
-                    'descripcion': f'Docente {horario.asignacion_docente.docente.get_full_name()} tiene clases simultáneas',
-                    'severidad': 'alta'
-                })
-
-            docente_horarios[docente_id].add(franja_key)
-
-        # 2. Conflictos de aula
-        aula_horarios = {}
-        for horario in horarios:
-            aula_id = horario.aula.id
-            franja_key = (horario.franja_horaria.dia_semana, horario.franja_horaria.hora_inicio)
-
-            if aula_id not in aula_horarios:
-                aula_horarios[aula_id] = set()
-
-            if franja_key in aula_horarios[aula_id]:
-                conflictos.append({
-                    'tipo': 'conflicto_aula',
-                    'descripcion': f'Aula {horario.aula.codigo} tiene clases simultáneas',
-                    'severidad': 'alta'
-                })
-
-            aula_horarios[aula_id].add(franja_key)
+        ).select_related('aula')
 
         # 3. Validar capacidad
         for horario in horarios:
-            if horario.capacidad_estudiantes and horario.capacidad_estudiantes > horario.aula.capacidad:
+            if horario.aula and horario.capacidad_estudiantes and horario.capacidad_estudiantes > horario.aula.capacidad:
                 conflictos.append({
                     'tipo': 'capacidad_excedida',
                     'descripcion': f'Capacidad de estudiantes ({horario.capacidad_estudiantes}) excede capacidad del aula {horario.aula.codigo} ({horario.aula.capacidad})',
                     'severidad': 'media'
                 })
 
-        return Response({
+        return {
             'valida': len(conflictos) == 0,
             'total_conflictos': len(conflictos),
             'conflictos': conflictos,
             'mensaje': 'Planificación válida' if len(conflictos) == 0 else f'Se encontraron {len(conflictos)} conflictos'
-        })
+        }
 
     @action(detail=True, methods=['post'])
     def duplicar(self, request, pk=None):
@@ -295,10 +303,56 @@ class PlanificacionAcademicaViewSet(ModelViewSet):
                 is_activa=True
             )
 
-        serializer = PlanificacionAcademicaDetailSerializer(nueva_planificacion)
+        serializer = PlanificacionAcademicaDetailSerializer(
+            prefetch_detail(PlanificacionAcademica.objects.filter(pk=nueva_planificacion.pk)).get()
+        )
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class DisponibilidadDocenteViewSet(ModelViewSet):
+    """
+    Franjas no disponibles y preferidas de los docentes por periodo
+    """
+    queryset = DisponibilidadDocente.objects.select_related(
+        'docente', 'periodo', 'franja_horaria'
+    ).order_by('periodo', 'docente', 'franja_horaria__dia_semana', 'franja_horaria__hora_inicio')
+    serializer_class = DisponibilidadDocenteSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['periodo', 'docente', 'tipo', 'franja_horaria__dia_semana']
+
+    def get_queryset(self):
+        """Los docentes solo ven y editan su propia disponibilidad"""
+        queryset = super().get_queryset()
+        if not self.request.user.is_staff and getattr(self.request.user, 'rol', None) == 'docente':
+            queryset = queryset.filter(docente=self.request.user)
+        return queryset
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def importar(self, request):
+        """
+        Importación masiva para un periodo.
+
+        Body: {"periodo": id, "reemplazar": false, "registros": [
+            {"docente": id, "franja_horaria": id, "tipo": "no_disponible" | "preferida", "peso": 1.0}, ...
+        ]}
+        """
+        from .scheduling.availability import import_disponibilidades
+
+        periodo = get_object_or_404(Periodo, id=request.data.get('periodo'))
+        registros = request.data.get('registros')
+        if not isinstance(registros, list) or not all(isinstance(r, dict) for r in registros):
+            return Response(
+                {'error': 'registros debe ser una lista de objetos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resultado = import_disponibilidades(periodo, registros, reemplazar=bool(request.data.get('reemplazar', False)))
+        if resultado['errores']:
+            return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado, status=status.HTTP_201_CREATED)
+
+
 # Vistas auxiliares para recursos relacionados
 
 class PeriodoListView(generics.ListAPIView):
@@ -364,7 +418,7 @@ def dashboard_resumen(request):
         }
 
     # Planificaciones recientes
-    planificaciones_recientes = planificaciones.order_by('-fecha_creacion')[:5]
+    planificaciones_recientes = annotate_list_totals(planificaciones).order_by('-fecha_creacion')[:5]
     planificaciones_recientes_data = PlanificacionAcademicaListSerializer(
         planificaciones_recientes, many=True
     ).data
@@ -383,6 +437,38 @@ def dashboard_resumen(request):
 
 # Endpoints para ejecución del algoritmo de planificación
 
+# Límites de los parámetros del algoritmo genético aceptados por la API
+GA_PARAM_LIMITS = {
+    'population_size': (2, 500, 50),
+    'generations': (1, 1000, 100),
+}
+
+
+def _parametros_geneticos(data, defaults=False):
+    """
+    Valida population_size y generations de la petición.
+
+    Retorna (parámetros, error); sin ``defaults`` solo incluye los enviados.
+    """
+    parametros = {}
+    for key, (minimo, maximo, defecto) in GA_PARAM_LIMITS.items():
+        if key not in data:
+            if defaults:
+                parametros[key] = defecto
+            continue
+        valor = data[key]
+        if isinstance(valor, bool):
+            valor = None
+        try:
+            valor = int(valor)
+        except (TypeError, ValueError):
+            valor = None
+        if valor is None or not minimo <= valor <= maximo:
+            return {}, f'{key} inválido: {data[key]} (entre {minimo} y {maximo})'
+        parametros[key] = valor
+    return parametros, None
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ejecutar_algoritmo(request, planificacion_id):
@@ -411,16 +497,56 @@ def ejecutar_algoritmo(request, planificacion_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    # Una sola ejecución por planificación: comparten el token de cancelación
+    from .scheduling.cancellation import is_running
+    if is_running(planificacion_id) is not None:
+        return Response(
+            {'error': 'Ya hay una ejecución en curso para esta planificación'},
+            status=status.HTTP_409_CONFLICT
+        )
+
     # Parámetros del algoritmo
     strategy = request.data.get('strategy', 'docente_priority')
     save_results = request.data.get('save', False)
     dry_run = request.data.get('dry_run', True)
 
+    # Semilla opcional para reproducir una ejecución
+    from .scheduling.base import MAX_SEED, parse_seed
+    seed = request.data.get('seed')
+    try:
+        engine_params = {'seed': parse_seed(seed) if seed is not None else None}
+    except (TypeError, ValueError):
+        return Response(
+            {'error': f'Semilla inválida: {seed} (entre 0 y {MAX_SEED})'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Captura opcional de perfil (cProfile / pyinstrument)
+    from .scheduling.profiling import PROFILE_MODES
+    profile_mode = request.data.get('profile')
+    if profile_mode is not None and profile_mode not in PROFILE_MODES:
+        return Response(
+            {'error': f'Modo de perfilado inválido: {profile_mode}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     # Parámetros específicos para algoritmo genético
-    engine_params = {}
-    if strategy == 'genetic_algorithm':
-        engine_params['population_size'] = request.data.get('population_size', 50)
-        engine_params['generations'] = request.data.get('generations', 100)
+    if strategy in ('genetic_algorithm', 'multi_objective'):
+        parametros, error = _parametros_geneticos(request.data, defaults=True)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        engine_params.update(parametros)
+
+    # Pesos para elegir el compromiso del frente de Pareto
+    if strategy == 'multi_objective' and request.data.get('weights'):
+        from .scheduling.pareto import OBJECTIVES
+        weights = request.data['weights']
+        if not isinstance(weights, dict) or any(k not in OBJECTIVES for k in weights):
+            return Response(
+                {'error': f'Pesos inválidos; objetivos disponibles: {list(OBJECTIVES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        engine_params['weights'] = weights
 
     try:
         # Importar y ejecutar algoritmo
@@ -438,22 +564,36 @@ def ejecutar_algoritmo(request, planificacion_id):
         strategy_enum = SchedulingStrategy(strategy)
         engine = SchedulingEngineFactory.create_engine(strategy_enum, **engine_params)
 
-        # Ejecutar planificación
-        result = engine.execute_scheduling(planificacion)
+        # Ejecutar planificación (incluye el análisis de factibilidad previo)
+        result = engine.execute_scheduling(planificacion, {
+            'abort_if_infeasible': not request.data.get('force', False),
+            'profile': profile_mode,
+            'track_memory': request.data.get('track_memory', False),
+        })
 
         # Preparar respuesta
         response_data = {
             'success': result.success,
+            'cancelled': result.cancelled,
             'strategy_used': result.strategy_used.value,
+            'seed': result.seed,
             'execution_time': result.execution_time,
             'score': result.score,
             'message': result.message,
             'total_assignments': len(result.assignments),
             'total_conflicts': len(result.conflicts),
             'total_unassigned': len(result.unassigned),
-            'dry_run': dry_run
+            'dry_run': dry_run,
+            'feasibility': result.feasibility.to_dict() if result.feasibility else None
         }
 
+        # Frente de Pareto: los objetivos siempre, las soluciones solo con include_details
+        if result.pareto_front:
+            response_data['pareto_front'] = [
+                solution.to_dict(include_solution=request.data.get('include_details', False))
+                for solution in result.pareto_front
+            ]
+
         # Agregar detalles si se solicitan
         if request.data.get('include_details', False):
             from .serializers import HorarioClaseSerializer, ConflictoHorarioSerializer, AsignacionDocenteSerializer
@@ -464,7 +604,8 @@ def ejecutar_algoritmo(request, planificacion_id):
                 assignments_data.append({
                     'docente': assignment.asignacion_docente.docente.get_full_name(),
                     'materia': assignment.asignacion_docente.materia.nombre,
-                    'aula': assignment.aula.codigo,
+                    'aula': assignment.aula.codigo if assignment.aula else None,
+                    'modalidad': assignment.modalidad,
                     'franja': f"{assignment.franja_horaria.get_dia_semana_display()} {assignment.franja_horaria.hora_inicio}-{assignment.franja_horaria.hora_fin}",
                     'score': assignment.score
                 })
@@ -484,9 +625,11 @@ def ejecutar_algoritmo(request, planificacion_id):
             unassigned_data = []
             for unassigned in result.unassigned:
                 unassigned_data.append({
+                    'id': unassigned.id,
                     'docente': unassigned.docente.get_full_name(),
                     'materia': unassigned.materia.nombre,
-                    'horas_semanales': unassigned.carga_horaria_semanal
+                    'horas_semanales': unassigned.carga_horaria_semanal,
+                    'motivos': result.unassigned_reasons.get(unassigned.id, [])
                 })
             response_data['unassigned'] = unassigned_data
 
@@ -502,6 +645,21 @@ def ejecutar_algoritmo(request, planificacion_id):
                     planificacion.save()
                     response_data['estado_actualizado'] = 'revision'
 
+        # Registrar la ejecución en el historial (incluye la fase de guardado)
+        from .scheduling.history import record_run
+        run = record_run(engine, planificacion, result, parameters={
+            **engine_params,
+            'force': bool(request.data.get('force', False)),
+            'save': bool(save_results and not dry_run),
+        }, usuario=request.user)
+        response_data['run_id'] = run.id
+
+        # Desglose por fase al final para incluir el guardado
+        if request.data.get('include_details', False):
+            response_data['phases'] = result.phases
+            if result.profile_report:
+                response_data['profile_report'] = result.profile_report
+
         return Response(response_data, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -563,16 +721,215 @@ def estado_algoritmo(request, planificacion_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    # Por ahora, el algoritmo es síncrono, pero esta estructura permite
-    # futuras implementaciones asíncronas con Celery
+    # El motor registra las ejecuciones en curso (ver scheduling.cancellation)
+    from .scheduling.cancellation import is_running, is_cancel_requested
+
+    inicio = is_running(planificacion_id)
+    if inicio is None:
+        estado = 'completado'
+    elif is_cancel_requested(planificacion_id):
+        estado = 'cancelando'
+    else:
+        estado = 'en_ejecucion'
 
     return Response({
         'planificacion_id': planificacion_id,
-        'estado': 'completado',  # ready, running, completed, failed
+        'estado': estado,
+        'en_ejecucion_desde': inicio,
         'puede_ejecutar': planificacion.estado in ['borrador', 'revision'],
-        'ultima_ejecucion': None,  # Timestamp de última ejecución
+        'ultima_ejecucion': planificacion.ejecuciones.values_list('fecha_ejecucion', flat=True).first(),
         'asignaciones_actuales': HorarioClase.objects.filter(
             asignacion_docente__planificacion=planificacion,
             is_activa=True
         ).count()
-    })
\ No newline at end of file
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ejecutar_distribuido(request, planificacion_id):
+    """
+    Reparte búsquedas independientes (estrategias x semillas) entre workers de Celery
+    y conserva la mejor solución. Parámetros:
+    - strategies: lista de estrategias (por defecto todas)
+    - seeds: lista de semillas o cantidad de semillas aleatorias (por defecto 1)
+    - population_size / generations: parámetros del algoritmo genético
+    - save: guardar la mejor solución como horarios
+    """
+    import random
+    from .scheduling.base import MAX_SEED, SchedulingStrategy, parse_seed
+    from .scheduling.cancellation import is_running
+    from .scheduling.distributed import MAX_PARTITIONS, MAX_SEEDS
+
+    planificacion = get_object_or_404(PlanificacionAcademica, id=planificacion_id)
+
+    if planificacion.creado_por != request.user and not request.user.is_staff:
+        return Response(
+            {'error': 'No tienes permisos para ejecutar algoritmos en esta planificación'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    if planificacion.estado not in ['borrador', 'revision']:
+        return Response(
+            {'error': f'No se puede ejecutar el algoritmo en planificaciones con estado: {planificacion.get_estado_display()}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if is_running(planificacion_id) is not None:
+        return Response(
+            {'error': 'Ya hay una ejecución en curso para esta planificación'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    valid_strategies = [s.value for s in SchedulingStrategy]
+    strategies = request.data.get('strategies') or valid_strategies
+    if not isinstance(strategies, list):
+        return Response(
+            {'error': 'strategies debe ser una lista'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    invalid = [s for s in strategies if s not in valid_strategies]
+    if invalid:
+        return Response(
+            {'error': f'Estrategias inválidas: {invalid}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    seeds = request.data.get('seeds', 1)
+    try:
+        if isinstance(seeds, list):
+            seeds = [parse_seed(seed) for seed in seeds]
+        else:
+            cantidad = int(seeds)
+            if not 1 <= cantidad <= MAX_SEEDS:
+                raise ValueError(seeds)
+            generator = random.SystemRandom()
+            seeds = [generator.randrange(2 ** 32) for _ in range(cantidad)]
+    except (TypeError, ValueError):
+        return Response(
+            {'error': f'Semillas inválidas: {seeds} (entre 1 y {MAX_SEEDS} semillas, cada una entre 0 y {MAX_SEED})'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not 1 <= len(seeds) <= MAX_SEEDS:
+        return Response(
+            {'error': f'Se permiten entre 1 y {MAX_SEEDS} semillas'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(strategies) * len(seeds) > MAX_PARTITIONS:
+        return Response(
+            {'error': f'Demasiadas particiones: {len(strategies) * len(seeds)} (máximo {MAX_PARTITIONS})'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    engine_params, error = _parametros_geneticos(request.data)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        from .scheduling.distributed import dispatch_distributed_scheduling
+        async_result = dispatch_distributed_scheduling(
+            planificacion, strategies, seeds, engine_params,
+            save=bool(request.data.get('save', False))
+        )
+    except Exception as e:
+        return Response(
+            {'error': f'Error despachando la ejecución distribuida: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    response_data = {
+        'planificacion_id': planificacion_id,
+        'task_id': async_result.id,
+        'particiones': len(strategies) * len(seeds),
+    }
+
+    # En modo eager (o si el chord ya terminó) se devuelve el resultado directamente
+    if async_result.ready():
+        response_data['resultado'] = async_result.get()
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    return Response(response_data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def cancelar_algoritmo(request, planificacion_id):
+    """
+    Solicita detener la ejecución en curso del algoritmo para una planificación.
+    El motor se detiene en la siguiente colocación o generación y retorna
+    la mejor solución encontrada hasta ese momento.
+    """
+    from .scheduling.cancellation import request_cancellation
+
+    planificacion = get_object_or_404(PlanificacionAcademica, id=planificacion_id)
+
+    if planificacion.creado_por != request.user and not request.user.is_staff:
+        return Response(
+            {'error': 'No tienes permisos para cancelar algoritmos en esta planificación'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    if not request_cancellation(planificacion_id):
+        return Response(
+            {'error': 'No hay una ejecución en curso para esta planificación'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    return Response(
+        {'planificacion_id': planificacion_id, 'estado': 'cancelando'},
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def historial_ejecuciones(request, planificacion_id):
+    """
+    Lista las ejecuciones registradas del motor para una planificación
+    Filtros opcionales: ?strategy=<estrategia>&fingerprint=<huella>
+    """
+    planificacion = get_object_or_404(planificaciones_visibles(request.user), id=planificacion_id)
+
+    ejecuciones = planificacion.ejecuciones.select_related('ejecutado_por').defer('solution')
+    strategy = request.query_params.get('strategy')
+    if strategy:
+        ejecuciones = ejecuciones.filter(strategy=strategy)
+    fingerprint = request.query_params.get('fingerprint')
+    if fingerprint:
+        ejecuciones = ejecuciones.filter(input_fingerprint=fingerprint)
+
+    return Response({
+        'planificacion_id': planificacion_id,
+        'ejecuciones': SchedulingRunSerializer(ejecuciones, many=True).data
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def comparar_ejecuciones(request, run_id, otro_id):
+    """
+    Compara dos ejecuciones guardadas sin volver a ejecutar el motor
+    """
+    from .scheduling.history import compare_runs
+
+    ejecuciones = SchedulingRun.objects.filter(planificacion__in=planificaciones_visibles(request.user))
+    base = get_object_or_404(ejecuciones, id=run_id)
+    otra = get_object_or_404(ejecuciones, id=otro_id)
+
+    if base.planificacion_id != otra.planificacion_id:
+        return Response(
+            {'error': 'Solo se pueden comparar ejecuciones de la misma planificación'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response(compare_runs(base, otra))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metricas_cache(request):
+    """
+    Aciertos y fallos de la caché de respuestas por endpoint
+    """
+    return Response({'endpoints': cache_metrics()})
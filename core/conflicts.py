@@ -0,0 +1,34 @@
+# core/conflicts.py
+from apps.asignaciones.overlaps import (
+    find_overlaps, format_minutes, legacy_asignacion_intervals, legacy_reserva_intervals,
+)
+from .models import Asignacion
+
+ORIGEN = {'core_asignacion': 'asignación', 'core_reserva': 'reserva'}
+
+
+def detectar_conflictos(asignaciones, reservas=None):
+    """
+    Rellena conflictos_detectados de las asignaciones con sus solapamientos de
+    docente y aula; las reservas se proyectan al día de la semana.
+    Retorna la cantidad de asignaciones con conflictos.
+    """
+    intervals = list(legacy_asignacion_intervals(asignaciones))
+    if reservas is not None:
+        intervals.extend(legacy_reserva_intervals(reservas, weekly=True))
+
+    mensajes = {}
+    for a, b in find_overlaps(intervals):
+        for propio, otro in ((a, b), (b, a)):
+            if propio.source == 'core_asignacion':
+                recurso = 'Docente' if propio.resource[0] == 'legacy_docente' else 'Aula'
+                mensajes.setdefault(propio.ref, []).append(
+                    f"{recurso} {propio.label}: {ORIGEN[otro.source]} {otro.ref} "
+                    f"{format_minutes(otro.start)}-{format_minutes(otro.end)}"
+                )
+
+    filas = list(Asignacion.objects.filter(pk__in=asignaciones.values('pk')))
+    for fila in filas:
+        fila.conflictos_detectados = '; '.join(mensajes.get(fila.pk, []))
+    Asignacion.objects.bulk_update(filas, ['conflictos_detectados'])
+    return len(mensajes)
@@ -0,0 +1,13 @@
+import os
+from celery import Celery
+
+# Misma configuración que usa manage.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horarios_backend.settings')
+
+app = Celery('horarios_backend')
+
+# Usar configuración de Django para Celery
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Autodiscover tasks en todas las apps
+app.autodiscover_tasks()